@@ -1,23 +1,23 @@
-"""PyQt application entrypoint for Vizualizer."""
+"""Vizualizer entrypoint: the PyQt application, or ``simulate`` for headless runs."""
 
 import os
 import sys
 from pathlib import Path
 
-from PyQt5.QtCore import QCoreApplication
-from PyQt5.QtGui import QSurfaceFormat
-from PyQt5.QtWidgets import QApplication
-
 ROOT = Path(__file__).resolve().parent
 SRC_PATH = ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from ui.main_window import MainWindow
-
 
-def main() -> int:
+def run_ui() -> int:
     """Launch the PyQt UI."""
+    from PyQt5.QtCore import QCoreApplication
+    from PyQt5.QtGui import QSurfaceFormat
+    from PyQt5.QtWidgets import QApplication
+
+    from ui.main_window import MainWindow
+
     plugin_path = SRC_PATH.parent / ".venv" / "Lib" / "site-packages" / "PyQt5" / "Qt5" / "plugins"
     if plugin_path.exists():
         os.environ.setdefault("QT_PLUGIN_PATH", str(plugin_path))
@@ -36,5 +36,17 @@ def main() -> int:
     return app.exec_()
 
 
+def main() -> int:
+    """Dispatch ``main.py simulate ...`` to the headless runner, else start the UI.
+
+    The headless path never imports PyQt5 or OpenGL.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        from simulation.batch import main as simulate
+
+        return simulate(sys.argv[2:])
+    return run_ui()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
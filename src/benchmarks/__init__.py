@@ -0,0 +1,4 @@
+"""Performance benchmarks for the simulator engine.
+
+Run from the ``src`` directory, e.g. ``python -m benchmarks.arcs``.
+"""
@@ -0,0 +1,71 @@
+"""Benchmark vectorized G2/G3 segmentation on random helical arcs."""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from gcode.arcs import DEFAULT_CHORD_TOLERANCE, segment_arcs
+from gcode.interpreter import interpret
+from gcode.tokenizer import tokenize
+
+
+def _random_arcs(count: int, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(1.0, 50.0, count)
+    start_angle = rng.uniform(0.0, 2.0 * np.pi, count)
+    end_angle = start_angle + rng.uniform(0.1, 2.0 * np.pi, count)
+    center = rng.uniform(-100.0, 100.0, (count, 3))
+    start = center + np.column_stack(
+        [radius * np.cos(start_angle), radius * np.sin(start_angle), np.zeros(count)]
+    )
+    end = center + np.column_stack(
+        [radius * np.cos(end_angle), radius * np.sin(end_angle), rng.uniform(-2, 0, count)]
+    )
+    return {
+        "start": start,
+        "end": end,
+        "plane": np.zeros(count, dtype=np.intp),
+        "clockwise": np.zeros(count, dtype=bool),
+        "offsets": center - start,
+    }
+
+
+def _arc_program(arcs: dict[str, np.ndarray]) -> str:
+    lines = ["G17 G90 F800"]
+    for start, end, offset in zip(arcs["start"], arcs["end"], arcs["offsets"]):
+        lines.append(f"G1 X{start[0]:.4f} Y{start[1]:.4f} Z{start[2]:.4f}")
+        lines.append(
+            f"G3 X{end[0]:.4f} Y{end[1]:.4f} Z{end[2]:.4f} I{offset[0]:.4f} J{offset[1]:.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_CHORD_TOLERANCE)
+    args = parser.parse_args()
+
+    arcs = _random_arcs(args.count)
+    began = time.perf_counter()
+    counts, points = segment_arcs(tolerance=args.tolerance, **arcs)
+    elapsed = time.perf_counter() - began
+    print(
+        f"segment_arcs: {args.count} arcs -> {len(points)} chords "
+        f"in {elapsed * 1000:.1f} ms ({args.count / elapsed:,.0f} arcs/s)"
+    )
+
+    words = tokenize(_arc_program(arcs))
+    began = time.perf_counter()
+    toolpath = interpret(words, chord_tolerance=args.tolerance).toolpath
+    elapsed = time.perf_counter() - began
+    print(
+        f"interpret: {args.count} arc blocks -> {len(toolpath)} segments "
+        f"in {elapsed * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark compiling a large program against mapping it from the cache."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from gcode.reader import GCodeFile
+from simulation.cache import ProgramCache, cache_key, source_digest
+from simulation.cycle_time import MachineLimits
+from simulation.pipeline import compile_gcode
+
+_BLOCK = b"G01 X%.3f Y%.3f Z%.3f\n"
+
+
+def _write_program(path: Path, segments: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    with open(path, "wb") as handle:
+        handle.write(b"G21 G90 G17 F1500\n")
+        for first in range(0, segments, 100_000):
+            coords = np.cumsum(rng.uniform(-1.0, 1.0, (min(100_000, segments - first), 3)), axis=0)
+            handle.write(b"".join(_BLOCK % tuple(point) for point in coords))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    limits = MachineLimits()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "program.nc"
+        _write_program(path, args.segments)
+        cache = ProgramCache.beside(path)
+        with GCodeFile.open(path) as source:
+            began = time.perf_counter()
+            compiled = compile_gcode(source.iter_chunks(), source.size, limits)
+            elapsed = time.perf_counter() - began
+            print(f"compile: {len(compiled.toolpath):,} segments in {elapsed:.2f} s")
+
+            began = time.perf_counter()
+            key = cache_key(source_digest(source), limits)
+            hashed = time.perf_counter() - began
+            began = time.perf_counter()
+            cache.store(key, compiled)
+            print(f"hash: {hashed * 1000:.0f} ms, store: {time.perf_counter() - began:.2f} s")
+
+        began = time.perf_counter()
+        cached = cache.load(key)
+        elapsed = time.perf_counter() - began
+        size = cache.entry_bytes(cache.directory / key)
+        print(
+            f"load: {elapsed * 1000:.1f} ms mapping {size / 2**20:.0f} MB, "
+            f"total time {cached.toolpath.total_time:.0f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark forward and inverse kinematics of five-axis chains."""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from core.state import ROTARY_HEAD, KinematicConfig, RotaryAxis
+from kinematics.chain import KinematicChain
+
+MACHINES = {
+    "AC trunnion": KinematicConfig(
+        (
+            RotaryAxis("A", direction=(1.0, 0.0, 0.0), pivot=(0.0, 0.0, -80.0), minimum=-120.0),
+            RotaryAxis("C", pivot=(0.0, 0.0, -80.0)),
+        )
+    ),
+    "BC head": KinematicConfig(
+        (
+            RotaryAxis("C", ROTARY_HEAD, pivot=(0.0, 0.0, 0.0)),
+            RotaryAxis("B", ROTARY_HEAD, direction=(0.0, 1.0, 0.0), pivot=(0.0, 0.0, -150.0)),
+        )
+    ),
+    "B head, C table": KinematicConfig(
+        (
+            RotaryAxis("C", pivot=(25.0, 0.0, 0.0)),
+            RotaryAxis("B", ROTARY_HEAD, direction=(0.0, 1.0, 1.0), pivot=(0.0, 0.0, -120.0)),
+        )
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--poses", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    linear = rng.uniform(-300.0, 300.0, (args.poses, 3))
+    angles = rng.uniform(-90.0, 30.0, (args.poses, 2))
+    joints = np.hstack([linear, angles])
+    for name, config in MACHINES.items():
+        chain = KinematicChain(config)
+        began = time.perf_counter()
+        transforms = chain.forward(joints, tool_length_offset=50.0)
+        forward = time.perf_counter() - began
+
+        began = time.perf_counter()
+        solved = chain.inverse(
+            transforms[:, :3, 3], transforms[:, :3, 2], tool_length_offset=50.0, seed=angles
+        )
+        inverse = time.perf_counter() - began
+        error = np.abs(chain.tcp_positions(solved, 50.0) - transforms[:, :3, 3]).max()
+        print(
+            f"{name}: forward {args.poses / forward / 1e6:.2f} M poses/s, "
+            f"inverse {args.poses / inverse / 1e6:.2f} M poses/s, round trip {error:.1e} mm"
+        )
+
+
+if __name__ == "__main__":
+    main()
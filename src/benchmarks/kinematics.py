@@ -0,0 +1,50 @@
+"""Benchmark batched against per-state three-axis forward kinematics."""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from core.state import KinematicConfig, MachineState, machine_states
+from kinematics.three_axis import forward_kinematics, forward_kinematics_batch, tcp_positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=1_000_000)
+    parser.add_argument(
+        "--scalar-sample", type=int, default=50_000, help="States timed on the scalar path."
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    xs, ys, zs = rng.uniform(-500.0, 500.0, (3, args.states))
+    states = machine_states(xs, ys, zs, 25.0)
+    config = KinematicConfig()
+
+    sample = min(args.scalar_sample, args.states)
+    began = time.perf_counter()
+    scalar = np.array(
+        [
+            forward_kinematics(MachineState(xs[i], ys[i], zs[i], 25.0), config).T_mcs_from_tcp
+            for i in range(sample)
+        ]
+    )
+    per_state = (time.perf_counter() - began) / sample
+    print(f"scalar: {per_state * 1e6:.2f} us per state, ~{per_state * args.states:.1f} s total")
+
+    for name, function in (("transforms", forward_kinematics_batch), ("tcp", tcp_positions)):
+        began = time.perf_counter()
+        result = function(states, config)
+        elapsed = time.perf_counter() - began
+        expected = scalar if name == "transforms" else scalar[:, :3, 3]
+        identical = np.array_equal(result[:sample], expected)
+        print(
+            f"{name}: {args.states:,} states in {elapsed * 1000:.1f} ms, "
+            f"{per_state * args.states / elapsed:,.0f}x faster, identical={identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
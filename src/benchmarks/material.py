@@ -0,0 +1,61 @@
+"""Benchmark heightfield material removal on a layered raster pocket."""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, Toolpath
+from material.heightfield import Heightfield
+from material.tools import TOOL_TYPES, CutterProfile
+
+
+def _raster_pocket(count: int, size: float, layers: int, stepover: float) -> Toolpath:
+    rows = int(size / stepover)
+    per_row = max(count // (layers * rows), 1)
+    passes = []
+    for layer in range(layers):
+        for row in range(rows):
+            x = np.linspace(-size / 2.0, size / 2.0, per_row + 1)
+            if row % 2:
+                x = x[::-1]
+            y = np.full_like(x, -size / 2.0 + (row + 0.5) * stepover)
+            passes.append(np.column_stack([x, y, np.full_like(x, -(layer + 1.0))]))
+    points = np.vstack(passes)[: count + 1]
+    moves = len(points) - 1
+    return Toolpath.from_moves(
+        points[0],
+        points[1:],
+        np.full(moves, 1000.0),
+        np.full(moves, MOTION_LINEAR, dtype=np.uint8),
+        np.arange(moves, dtype=np.uint32),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--cells", type=int, default=2000, help="Grid cells per side.")
+    parser.add_argument("--size", type=float, default=200.0, help="Stock side in mm.")
+    parser.add_argument("--diameter", type=float, default=6.0)
+    args = parser.parse_args()
+
+    toolpath = _raster_pocket(args.segments, args.size, layers=10, stepover=args.diameter / 2)
+    resolution = args.size / args.cells
+    for kind in TOOL_TYPES:
+        stock = Heightfield.from_stock(args.size, args.size, 50.0, resolution=resolution)
+        cutter = CutterProfile(kind, args.diameter)
+        began = time.perf_counter()
+        stock.cut_toolpath(toolpath, cutter)
+        elapsed = time.perf_counter() - began
+        rows, cols = stock.shape
+        print(
+            f"{kind}: {len(toolpath)} segments on {rows}x{cols} cells "
+            f"in {elapsed:.2f} s ({len(toolpath) / elapsed:,.0f} segments/s), "
+            f"removed {stock.removed_volume / 1000.0:.1f} cm³"
+        )
+
+
+if __name__ == "__main__":
+    main()
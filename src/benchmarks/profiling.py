@@ -0,0 +1,97 @@
+"""Benchmark the cost of profiling spans, disabled and enabled.
+
+Compilation and a simulated playback run alternately with profiling off and
+on, and the best of ``--repeats`` runs is compared. The overhead implied by
+the per-span cost is printed as well, since the measured difference of a few
+microseconds per frame is below the run-to-run noise.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from diagnostics import profiling
+from diagnostics.profiling import SPAN_STEP, span
+from gcode.reader import GCodeFile
+from simulation.engine import SimulationEngine
+from simulation.machine import DEFAULT_WORKPIECE
+from simulation.pipeline import compile_gcode
+
+_BLOCK = b"G01 X%.3f Y%.3f Z%.3f\n"
+_CHUNK = 1 << 20
+
+
+def _program(segments: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    xy = np.cumsum(rng.uniform(-0.5, 0.5, (segments, 2)), axis=0).clip(-45.0, 45.0)
+    z = rng.uniform(-3.0, 1.0, segments)
+    blocks = b"".join(_BLOCK % (x, y, depth) for (x, y), depth in zip(xy, z))
+    return b"G21 G90 G17 F1500\nG0 X0 Y0 Z5\n" + blocks
+
+
+def _per_span_ns(iterations: int) -> float:
+    began = time.perf_counter_ns()
+    for _ in range(iterations):
+        with span(SPAN_STEP):
+            pass
+    return (time.perf_counter_ns() - began) / iterations
+
+
+def _timed(run: Callable[[], None]) -> float:
+    began = time.perf_counter()
+    run()
+    return time.perf_counter() - began
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=200_000)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--speed", type=float, default=100.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    profiling.disable()
+    disabled = _per_span_ns(1_000_000)
+    profiling.enable()
+    enabled = _per_span_ns(1_000_000)
+    profiling.disable()
+    print(f"span: {disabled:.0f} ns disabled, {enabled:.0f} ns enabled")
+
+    data = _program(args.segments)
+    chunks = [data[start : start + _CHUNK] for start in range(0, len(data), _CHUNK)]
+    compiled = compile_gcode(chunks, len(data))
+
+    def compile_program() -> None:
+        compile_gcode(chunks, len(data))
+
+    def simulate() -> None:
+        engine = SimulationEngine()
+        engine.create_workpiece({**DEFAULT_WORKPIECE, "resolution": 0.25})
+        engine.set_program(GCodeFile.from_text(""), compiled)
+        engine.start(speed=args.speed)
+        for _ in range(args.frames):
+            engine.step(1.0 / 60.0)
+
+    for name, run in (("compile", compile_program), ("simulate", simulate)):
+        off, on, spans = float("inf"), float("inf"), 0
+        for _ in range(args.repeats):
+            off = min(off, _timed(run))
+            profiling.enable()
+            on = min(on, _timed(run))
+            spans = profiling.disable().span_count()
+        # Wall-clock differences this small are mostly noise, so also report
+        # the overhead implied by the measured cost of one span.
+        estimated = spans * (enabled - disabled) * 1e-9 / off * 100
+        print(
+            f"{name}: {off * 1000:.1f} ms disabled, {on * 1000:.1f} ms enabled "
+            f"({(on - off) / off * 100:+.2f}% measured, {estimated:.3f}% from span cost), "
+            f"{spans:,} spans per run"
+        )
+
+
+if __name__ == "__main__":
+    main()
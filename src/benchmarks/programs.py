@@ -0,0 +1,155 @@
+"""Deterministic synthetic G-code programs for the benchmark suite.
+
+Every generator writes exactly the requested number of lines, computes the
+blocks of a batch in closed form with NumPy and depends only on the line
+count and the seed, so the same arguments always produce the same bytes.
+The paths stay inside the default 200 x 100 x 50 mm workpiece with its zero
+point at the top center.
+
+Example:
+    write_program(Path("raster.nc"), "raster", 1_000_000)
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+import numpy as np
+
+BATCH_LINES = 100_000
+
+_HALF_WIDTH = 90.0
+_HALF_HEIGHT = 45.0
+_HEADER = b"%\nG21 G90 G17 G94\nG0 Z5.000\nG0 X-90.000 Y-45.000\n"
+_HEADER_LINES = _HEADER.count(b"\n")
+
+_RASTER_STEP = 0.5
+_RASTER_STEPOVER = 1.0
+_RASTER_BLOCK = b"G1 X%.3f Y%.3f Z%.3f F2400\n"
+
+_LOOP_POINTS = 24
+_LOOP_RADIUS = 3.0
+_LOOP_ADVANCE = 0.8
+_SLOT_SPACING = 5.0
+_ADAPTIVE_BLOCK = b"G1 X%.3f Y%.3f Z%.3f F%.0f\n"
+
+_ARC_RADIUS = 2.0
+_ARC_STEPOVER = 1.5
+_ARC_BLOCK = b"G%d X%.3f Y%.3f Z%.3f I%.3f J%.3f F1200\n"
+
+
+def _surface(x: np.ndarray, y: np.ndarray, phase: float) -> np.ndarray:
+    """Smooth freeform surface between about -3 and -1 mm."""
+
+    return -2.0 + 0.6 * np.sin(x / 17.0 + phase) + 0.4 * np.cos(y / 11.0 - phase)
+
+
+def _raster(index: np.ndarray, phase: float) -> bytes:
+    # Zigzag rows along X, one layer of rows after the other, each layer
+    # 0.2 mm deeper than the previous one.
+    per_row = int(2.0 * _HALF_WIDTH / _RASTER_STEP) + 1
+    rows = int(2.0 * _HALF_HEIGHT / _RASTER_STEPOVER) + 1
+    row, column = np.divmod(index, per_row)
+    layer, row = np.divmod(row, rows)
+    column = np.where(row % 2 == 1, per_row - 1 - column, column)
+    x = -_HALF_WIDTH + column * _RASTER_STEP
+    y = -_HALF_HEIGHT + row * _RASTER_STEPOVER
+    z = _surface(x, y, phase) - 0.2 * (layer % 20)
+    return b"".join(_RASTER_BLOCK % block for block in zip(x.tolist(), y.tolist(), z.tolist()))
+
+
+def _adaptive(index: np.ndarray, phase: float) -> bytes:
+    # Trochoidal loops advancing along slots in Y, with the feed raised on
+    # the half of each loop that does not engage the material.
+    loop, point = np.divmod(index, _LOOP_POINTS)
+    loops_per_slot = int(2.0 * (_HALF_WIDTH - _LOOP_RADIUS) / _LOOP_ADVANCE)
+    slots = int(2.0 * (_HALF_HEIGHT - _LOOP_RADIUS) / _SLOT_SPACING) + 1
+    slot, step = np.divmod(loop, loops_per_slot)
+    layer, slot = np.divmod(slot, slots)
+    angle = 2.0 * np.pi * point / _LOOP_POINTS + phase
+    center = -_HALF_WIDTH + _LOOP_RADIUS + step * _LOOP_ADVANCE
+    x = center + _LOOP_ADVANCE * point / _LOOP_POINTS + _LOOP_RADIUS * np.cos(angle)
+    y = -_HALF_HEIGHT + _LOOP_RADIUS + slot * _SLOT_SPACING + _LOOP_RADIUS * np.sin(angle)
+    z = -1.0 - 0.5 * (layer % 16)
+    feed = np.where(np.cos(angle) > 0.0, 1800.0, 4500.0)
+    return b"".join(
+        _ADAPTIVE_BLOCK % block
+        for block in zip(x.tolist(), y.tolist(), z.tolist(), feed.tolist())
+    )
+
+
+def _arc_finish(index: np.ndarray, phase: float) -> bytes:
+    # Rows of helical half circles along X that alternate between G2 and G3.
+    # A half circle in Y steps over to the next row, which runs backwards;
+    # the rows sweep up and down the workpiece in a triangle wave.
+    per_row = int(2.0 * _HALF_WIDTH / (2.0 * _ARC_RADIUS))
+    rows = int(2.0 * _HALF_HEIGHT / _ARC_STEPOVER)
+    row, arc = np.divmod(index, per_row + 1)
+    level = rows - np.abs(rows - row % (2 * rows))
+    following = rows - np.abs(rows - (row + 1) % (2 * rows))
+    forward = row % 2 == 0
+    direction = np.where(forward, 1.0, -1.0)
+    stepover = arc == per_row
+    done = np.minimum(arc + 1, per_row)
+    x = np.where(forward, -_HALF_WIDTH, _HALF_WIDTH) + direction * done * 2.0 * _ARC_RADIUS
+    y = -_HALF_HEIGHT + np.where(stepover, following, level) * _ARC_STEPOVER
+    z = _surface(x, y, phase)
+    offset_i = np.where(stepover, 0.0, direction * _ARC_RADIUS)
+    offset_j = np.where(stepover, (following - level) * _ARC_STEPOVER / 2.0, 0.0)
+    code = np.where((arc + row) % 2 == 0, 2, 3)
+    return b"".join(
+        _ARC_BLOCK % block
+        for block in zip(
+            code.tolist(),
+            x.tolist(),
+            y.tolist(),
+            z.tolist(),
+            offset_i.tolist(),
+            offset_j.tolist(),
+        )
+    )
+
+
+PROGRAMS: Dict[str, Callable[[np.ndarray, float], bytes]] = {
+    "raster": _raster,
+    "adaptive": _adaptive,
+    "arcs": _arc_finish,
+}
+
+
+def generate(kind: str, lines: int, seed: int = 0) -> Iterator[bytes]:
+    """Yield a synthetic program of exactly ``lines`` lines in byte chunks.
+
+    Args:
+        kind: One of ``PROGRAMS``: ``raster`` surfacing, ``adaptive``
+            pocketing or ``arcs`` finishing.
+        lines: Total line count including the header and the final ``M30``.
+        seed: Selects the phase of the machined surface.
+
+    Raises:
+        ValueError: If the kind is unknown or ``lines`` is too small to
+            hold the header.
+    """
+
+    batch = PROGRAMS.get(kind)
+    if batch is None:
+        raise ValueError(f"Unknown program kind '{kind}'.")
+    body = lines - _HEADER_LINES - 1
+    if body < 1:
+        raise ValueError(f"A program needs at least {_HEADER_LINES + 2} lines.")
+    phase = float(np.random.default_rng(seed).uniform(0.0, 2.0 * np.pi))
+    yield _HEADER
+    for start in range(0, body, BATCH_LINES):
+        yield batch(np.arange(start, min(start + BATCH_LINES, body)), phase)
+    yield b"M30\n"
+
+
+def write_program(path: Path, kind: str, lines: int, seed: int = 0) -> int:
+    """Write ``generate(kind, lines, seed)`` to ``path`` and return its size in bytes."""
+
+    size = 0
+    with open(path, "wb") as handle:
+        for chunk in generate(kind, lines, seed):
+            handle.write(chunk)
+            size += len(chunk)
+    return size
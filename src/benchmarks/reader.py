@@ -0,0 +1,63 @@
+"""Benchmark opening and indexing a large G-code file."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from gcode.reader import GCodeFile
+
+_BLOCK = b"N%07d G01 X%9.4f Y%9.4f Z%8.4f F1200\n"
+
+
+def _write_program(path: Path, megabytes: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    target = megabytes * 1024 * 1024
+    written = 0
+    number = 0
+    with open(path, "wb") as handle:
+        while written < target:
+            coords = rng.uniform(-100.0, 100.0, (10_000, 3))
+            block = b"".join(
+                _BLOCK % (number + index, x, y, z) for index, (x, y, z) in enumerate(coords)
+            )
+            handle.write(block)
+            written += len(block)
+            number += len(coords)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, default=1024)
+    parser.add_argument("--path", type=Path, help="Existing program to open instead.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path
+        if path is None:
+            path = Path(directory) / "program.nc"
+            _write_program(path, args.megabytes)
+
+        began = time.perf_counter()
+        source = GCodeFile.open(path)
+        elapsed = time.perf_counter() - began
+        print(
+            f"open: {source.size / 2**20:,.0f} MB, {len(source):,} lines "
+            f"in {elapsed * 1000:.1f} ms (index {source.nbytes / 2**20:,.1f} MB)"
+        )
+
+        rng = np.random.default_rng(1)
+        lines = rng.integers(0, max(len(source), 1), 100_000)
+        began = time.perf_counter()
+        for line in lines:
+            source.line(int(line))
+        elapsed = time.perf_counter() - began
+        print(f"line(): {elapsed / len(lines) * 1e6:.2f} us per random line")
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
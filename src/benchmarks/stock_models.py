@@ -0,0 +1,109 @@
+"""Compare heightfield and tri-dexel stock models on a rectangular pocket.
+
+The pocket has walls off the cell grid, so the report shows how far each
+model places the walls from their true position, how close the removed
+volume is to the analytic value, and what that costs in memory and time.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, Toolpath
+from material.heightfield import Heightfield
+from material.stock import StockModel
+from material.tools import TOOL_FLAT, CutterProfile
+from material.tridexel import AXIS_X, AXIS_Y, TriDexel
+
+POCKET_HALF_WIDTH = 40.3
+POCKET_HALF_HEIGHT = 30.2
+LAYER_DEPTH = 2.0
+
+
+def _pocket(diameter: float, depth: float) -> Toolpath:
+    """Layered zigzag plus a finishing contour around the pocket rectangle.
+
+    The cleared area is ``|x| <= POCKET_HALF_WIDTH + r`` by
+    ``|y| <= POCKET_HALF_HEIGHT + r`` with corners rounded by the tool radius.
+    """
+
+    count = int(2 * POCKET_HALF_HEIGHT / (diameter * 0.4)) + 1
+    rows = np.linspace(-POCKET_HALF_HEIGHT, POCKET_HALF_HEIGHT, count)
+    x, y = POCKET_HALF_WIDTH, POCKET_HALF_HEIGHT
+    contour = np.array([[-x, -y], [x, -y], [x, y], [-x, y], [-x, -y]])
+    passes = []
+    for z in np.arange(-LAYER_DEPTH, -depth - 1e-9, -LAYER_DEPTH):
+        for index, row in enumerate(rows):
+            xs = np.linspace(-x, x, 41)
+            if index % 2:
+                xs = xs[::-1]
+            passes.append(np.column_stack([xs, np.full_like(xs, row), np.full_like(xs, z)]))
+        passes.append(np.column_stack([contour, np.full(len(contour), z)]))
+    points = np.vstack(passes)
+    moves = len(points) - 1
+    return Toolpath.from_moves(
+        points[0],
+        points[1:],
+        np.full(moves, 1000.0),
+        np.full(moves, MOTION_LINEAR, dtype=np.uint8),
+        np.arange(moves, dtype=np.uint32),
+    )
+
+
+def _heightfield_wall_error(stock: Heightfield, walls: np.ndarray, level: float) -> float:
+    xs, ys = stock.cell_centers()
+    half = stock.cell / 2.0
+    errors = []
+    for axis, centers, across in ((0, xs, ys), (1, ys, xs)):
+        for offset in np.flatnonzero(np.abs(across) < walls[1 - axis] / 2.0):
+            heights = stock.heights[offset] if axis == 0 else stock.heights[:, offset]
+            cut = np.flatnonzero(heights < level)
+            measured = (centers[cut[0]] - half, centers[cut[-1]] + half)
+            errors.append(np.abs(np.abs(measured) - walls[axis]).max())
+    return float(max(errors))
+
+
+def _tridexel_wall_error(stock: TriDexel, walls: np.ndarray, level: float) -> float:
+    errors = []
+    for axis in (AXIS_X, AXIS_Y):
+        enter, leave = stock.intervals(axis)
+        zs, offsets = stock.ray_centers(axis)
+        row = int(np.argmin(np.abs(zs - level)))
+        for column in np.flatnonzero(np.abs(offsets) < walls[1 - axis] / 2.0):
+            measured = (leave[row, column, 0], enter[row, column, 1])
+            errors.append(np.abs(np.abs(measured) - walls[axis]).max())
+    return float(max(errors))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resolution", type=float, nargs="+", default=[1.0, 0.5, 0.25])
+    parser.add_argument("--diameter", type=float, default=10.0)
+    parser.add_argument("--depth", type=float, default=6.0)
+    args = parser.parse_args()
+
+    radius = args.diameter / 2.0
+    toolpath = _pocket(args.diameter, args.depth)
+    walls = np.array([POCKET_HALF_WIDTH + radius, POCKET_HALF_HEIGHT + radius])
+    volume = (4.0 * walls[0] * walls[1] - (4.0 - np.pi) * radius**2) * args.depth
+    cutter = CutterProfile(TOOL_FLAT, args.diameter)
+    level = -args.depth / 2.0
+    print(f"{len(toolpath)} segments, pocket volume {volume / 1000.0:.2f} cm³")
+    for resolution in args.resolution:
+        models = ((Heightfield, _heightfield_wall_error), (TriDexel, _tridexel_wall_error))
+        for model, wall_error in models:
+            stock: StockModel = model.from_stock(200.0, 150.0, 30.0, resolution=resolution)
+            began = time.perf_counter()
+            stock.cut_toolpath(toolpath, cutter)
+            elapsed = time.perf_counter() - began
+            print(
+                f"{model.__name__:>11} @ {resolution:.2f} mm: {stock.nbytes / 2**20:7.2f} MiB, "
+                f"cut {elapsed:6.2f} s, wall error {wall_error(stock, walls, level):.4f} mm, "
+                f"volume error {abs(stock.removed_volume - volume) / volume:.3%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
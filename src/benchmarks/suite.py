@@ -0,0 +1,367 @@
+"""Time every engine stage on synthetic programs and compare against a baseline.
+
+Each case writes a generated program (see ``benchmarks.programs``) and runs
+it through load, parse, interpret, cycle-time planning, preview, forward
+kinematics, material removal, stock meshing and, with ``--render``, an
+offscreen viewport render. Stage times are the best of ``--repeats`` runs
+in seconds; ``render`` is the time of one frame.
+
+Results are written as JSON with ``--output``. ``--compare BASELINE`` flags
+every stage that got slower than the baseline by more than ``--threshold``
+and exits with status 1 if any did; ``--input`` compares saved results
+without running the suite again.
+
+Example:
+    python -m benchmarks.suite --lines 10000 1000000 --output baseline.json
+    python -m benchmarks.suite --lines 10000 1000000 --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from core.state import KinematicConfig, machine_states
+from core.toolpath_lod import ToolpathLod
+from gcode.interpreter import interpret
+from gcode.reader import GCodeFile
+from gcode.tokenizer import WORD_DTYPE, GCodeTokenizer
+from kinematics.three_axis import forward_kinematics_batch
+from material.stock import StockModel
+from material.tools import CutterProfile
+from material.workpiece import create_stock
+from render.stock_mesh import StockMesher
+from simulation.cycle_time import estimate_cycle_time
+from simulation.machine import DEFAULT_TOOL, DEFAULT_WORKPIECE
+
+from .programs import PROGRAMS, write_program
+
+RESULTS_VERSION = 1
+DEFAULT_LINES = (10_000, 100_000)
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_CUT_LIMIT = 200_000
+# Stages faster than this in the baseline are not compared; their run-to-run
+# noise is larger than any threshold worth setting.
+MIN_COMPARED_SECONDS = 0.005
+
+STAGES = (
+    "load",
+    "parse",
+    "interpret",
+    "cycle_time",
+    "preview",
+    "kinematics",
+    "removal",
+    "mesh",
+    "render",
+)
+
+_T = TypeVar("_T")
+
+
+class Regression(NamedTuple):
+    """A stage that got slower than its baseline by more than the threshold."""
+
+    case: str
+    stage: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def case_name(kind: str, lines: int) -> str:
+    return f"{kind}/{lines}"
+
+
+def _timed(stages: Dict[str, float], name: str, run: Callable[[], _T]) -> _T:
+    began = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - began
+    stages[name] = min(stages.get(name, math.inf), elapsed)
+    return result
+
+
+def _load(path: Path) -> List[bytes]:
+    with GCodeFile.open(path) as source:
+        return [bytes(chunk) for chunk in source.iter_chunks()]
+
+
+def _parse(chunks: Sequence[bytes]) -> np.ndarray:
+    tokenizer = GCodeTokenizer()
+    tables = [np.array(tokenizer.feed(chunk), dtype=WORD_DTYPE) for chunk in chunks]
+    tables.append(np.array(tokenizer.close(), dtype=WORD_DTYPE))
+    return np.concatenate(tables)
+
+
+def _render_frame_seconds(
+    preview: ToolpathLod, executed: int, stock: StockModel, frames: int
+) -> Tuple[float, str]:
+    """Mean time of one offscreen viewport frame, or NaN and the reason it was skipped."""
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+
+        from ui.widgets.gl_widget import GLWidget
+    except ImportError as exc:
+        return math.nan, str(exc)
+
+    app = QApplication.instance() or QApplication([])
+    widget = GLWidget()
+    widget.resize(1280, 720)
+    widget.set_toolpath(preview)
+    widget.set_stock(stock)
+    widget.set_executed_segments(executed)
+    try:
+        # The first frames upload the toolpath and mesh the stock within the
+        # per-frame budget; only frames after that are timed.
+        for _ in range(10_000):
+            widget.grabFramebuffer()
+            if not len(widget.frame_times):
+                return math.nan, "no OpenGL context available"
+            if not widget.pending_stock_tiles():
+                break
+        began = time.perf_counter()
+        for _ in range(frames):
+            widget.grabFramebuffer()
+        return (time.perf_counter() - began) / frames, ""
+    finally:
+        widget.deleteLater()
+        app.processEvents()
+
+
+def run_case(
+    path: Path,
+    repeats: int = 1,
+    cut_limit: Optional[int] = DEFAULT_CUT_LIMIT,
+    render_frames: int = 0,
+) -> Dict[str, Any]:
+    """Time every stage on one program file.
+
+    Args:
+        path: Program to run.
+        repeats: Runs per stage; the fastest is reported.
+        cut_limit: Segments cut by the removal stage, None for all.
+        render_frames: Frames timed by the render stage, 0 to skip it.
+
+    Returns:
+        JSON-serializable case with ``segments``, ``stages`` in seconds and
+        ``skipped`` stages mapped to the reason.
+    """
+
+    stages: Dict[str, float] = {}
+    skipped: Dict[str, str] = {}
+    config = KinematicConfig()
+    tool_length = float(DEFAULT_TOOL["length"])
+    cutter = CutterProfile.from_tool_parameters(DEFAULT_TOOL)
+    for _ in range(repeats):
+        chunks = _timed(stages, "load", lambda: _load(path))
+        words = _timed(stages, "parse", lambda: _parse(chunks))
+        del chunks
+        program = _timed(stages, "interpret", lambda: interpret(words))
+        del words
+        toolpath = program.toolpath
+        _timed(stages, "cycle_time", lambda: estimate_cycle_time(toolpath))
+        preview = _timed(stages, "preview", lambda: ToolpathLod.build(toolpath))
+        points = toolpath.points
+        states = machine_states(points[:, 0], points[:, 1], points[:, 2], tool_length)
+        _timed(stages, "kinematics", lambda: forward_kinematics_batch(states, config))
+        del states
+        stock = create_stock(DEFAULT_WORKPIECE)
+        stop = len(toolpath) if cut_limit is None else min(cut_limit, len(toolpath))
+        _timed(stages, "removal", lambda: stock.cut_toolpath(toolpath, cutter, stop=stop))
+        rendered = copy.deepcopy(stock) if render_frames else None
+        _timed(stages, "mesh", lambda: StockMesher(stock).update(math.inf))
+        if rendered is not None and "render" not in skipped:
+            seconds, reason = _render_frame_seconds(
+                preview, len(toolpath) // 2, rendered, render_frames
+            )
+            if reason:
+                skipped["render"] = reason
+            else:
+                stages["render"] = min(stages.get("render", math.inf), seconds)
+    return {
+        "bytes": path.stat().st_size,
+        "segments": len(toolpath),
+        "cut_segments": stop,
+        "stages": stages,
+        "skipped": skipped,
+    }
+
+
+def run_suite(
+    kinds: Sequence[str],
+    lines: Sequence[int],
+    seed: int = 0,
+    repeats: int = 1,
+    cut_limit: Optional[int] = DEFAULT_CUT_LIMIT,
+    render_frames: int = 0,
+    workdir: Optional[Path] = None,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Generate and time every ``kind`` x ``lines`` case.
+
+    Programs are written to ``workdir``, or a temporary directory that is
+    removed afterwards.
+    """
+
+    results: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "settings": {
+            "seed": seed,
+            "repeats": repeats,
+            "cut_limit": cut_limit,
+            "render_frames": render_frames,
+        },
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="vizualizer-bench-") as scratch:
+        directory = Path(workdir or scratch)
+        for kind in kinds:
+            for count in lines:
+                name = case_name(kind, count)
+                path = directory / f"{kind}-{count}.nc"
+                write_program(path, kind, count, seed)
+                case = run_case(path, repeats, cut_limit, render_frames)
+                if workdir is None:
+                    path.unlink()
+                results["cases"][name] = {"program": kind, "lines": count, **case}
+                log(_case_summary(name, case))
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = MIN_COMPARED_SECONDS,
+) -> List[Regression]:
+    """Return the stages of cases in both results that slowed down beyond ``threshold``.
+
+    Args:
+        baseline: Saved results to compare against.
+        current: New results.
+        threshold: Allowed slowdown as a fraction, e.g. 0.1 for 10%.
+        min_seconds: Baseline stages faster than this are ignored.
+    """
+
+    regressions = []
+    for name, case in current["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+        for stage, seconds in case["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is None or before < min_seconds:
+                continue
+            if seconds > before * (1.0 + threshold):
+                regressions.append(Regression(name, stage, before, seconds))
+    return regressions
+
+
+def _case_summary(name: str, case: Dict[str, Any]) -> str:
+    timings = ", ".join(
+        f"{stage} {case['stages'][stage] * 1000:.1f} ms"
+        for stage in STAGES
+        if stage in case["stages"]
+    )
+    skipped = "".join(f" [{stage} skipped: {why}]" for stage, why in case["skipped"].items())
+    return f"{name}: {case['segments']:,} segments; {timings}{skipped}"
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    results = json.loads(Path(path).read_text(encoding="utf-8"))
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark result")
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--programs", nargs="+", choices=sorted(PROGRAMS), default=list(PROGRAMS)
+    )
+    parser.add_argument("--lines", nargs="+", type=int, default=list(DEFAULT_LINES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--cut-limit",
+        type=int,
+        default=DEFAULT_CUT_LIMIT,
+        help="Segments cut by the removal stage; 0 cuts the whole program.",
+    )
+    parser.add_argument(
+        "--render", type=int, default=0, metavar="FRAMES", help="Time FRAMES offscreen frames."
+    )
+    parser.add_argument("--workdir", type=Path, help="Keep the generated programs here.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--input", type=Path, help="Compare these saved results instead of running."
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = _read(args.compare) if args.compare else None
+        if args.input:
+            results = _read(args.input)
+        else:
+            results = run_suite(
+                args.programs,
+                args.lines,
+                args.seed,
+                max(args.repeats, 1),
+                args.cut_limit or None,
+                args.render,
+                args.workdir,
+            )
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    except (OSError, ValueError) as exc:
+        print(f"suite: {exc}", file=sys.stderr)
+        return 2
+    if baseline is None:
+        return 0
+
+    regressions = compare_results(baseline, results, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.case} {regression.stage}: "
+            f"{regression.baseline * 1000:.1f} ms -> {regression.current * 1000:.1f} ms "
+            f"({(regression.ratio - 1.0) * 100:+.0f}%)"
+        )
+    compared = [name for name in results["cases"] if name in baseline["cases"]]
+    print(
+        f"{len(regressions)} regressions beyond {args.threshold:.0%} "
+        f"in {len(compared)} cases compared with {args.compare}"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+"""Benchmark TRACEPOSE logging against the binary trace recorder."""
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.state import KinematicConfig, MachineState, machine_states
+from core.tracepose import TraceRecorder, log_tracepose, trace_to_jsonl
+from kinematics.three_axis import forward_kinematics, forward_kinematics_batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--poses", type=int, default=1_000_000)
+    parser.add_argument(
+        "--logging-sample", type=int, default=50_000, help="Poses timed through logging."
+    )
+    args = parser.parse_args()
+
+    config = KinematicConfig()
+    rng = np.random.default_rng(0)
+    xs, ys, zs = rng.uniform(-500.0, 500.0, (3, args.poses))
+    sample = min(args.logging_sample, args.poses)
+    pairs = []
+    for i in range(sample):
+        state = MachineState(float(xs[i]), float(ys[i]), float(zs[i]), 25.0)
+        pairs.append((state, forward_kinematics(state, config)))
+
+    logger = logging.getLogger()
+    handler = logging.StreamHandler(io.StringIO())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    began = time.perf_counter()
+    for state, pose in pairs:
+        log_tracepose(state, pose)
+    logged = (time.perf_counter() - began) / sample
+    logger.removeHandler(handler)
+    print(f"log_tracepose (JSON via logging): {logged * 1e6:.2f} us per pose")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "run.trace"
+        with TraceRecorder(path) as recorder:
+            record = recorder.record
+            began = time.perf_counter()
+            for _ in range(args.poses // sample):
+                for state, pose in pairs:
+                    record(state, pose)
+            recorder.flush()
+            recorded = (time.perf_counter() - began) / len(recorder)
+        print(
+            f"TraceRecorder.record: {recorded * 1e6:.3f} us per pose "
+            f"including flushes, {logged / recorded:,.0f}x faster"
+        )
+
+        states = machine_states(xs, ys, zs, 25.0)
+        transforms = forward_kinematics_batch(states, config)
+        with TraceRecorder(path) as recorder:
+            began = time.perf_counter()
+            recorder.record_batch(states, transforms)
+            recorder.flush()
+            batched = (time.perf_counter() - began) / args.poses
+        print(f"TraceRecorder.record_batch: {batched * 1e9:.1f} ns per pose")
+
+        began = time.perf_counter()
+        rows = trace_to_jsonl(path, Path(directory) / "run.jsonl")
+        print(f"trace_to_jsonl: {rows:,} rows in {time.perf_counter() - began:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
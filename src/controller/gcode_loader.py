@@ -0,0 +1,211 @@
+"""Background G-code loading so the UI thread never blocks."""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from diagnostics.profiling import SPAN_LOAD, span
+from gcode.reader import GCodeFile
+from simulation.cache import ProgramCache, cache_key, source_digest
+from simulation.cycle_time import MachineLimits
+from simulation.pipeline import CompiledProgram, LoadCancelled, compile_file_job, compile_gcode
+
+PROCESS_THRESHOLD = 4 * 1024 * 1024
+_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True, eq=False)
+class LoadResult:
+    """Compiled program plus the memory-mapped source it was built from."""
+
+    path: Path
+    compiled: CompiledProgram
+    source: GCodeFile
+
+
+class GCodeLoadWorker(QObject):
+    """Runs the load pipeline off the UI thread and reports through signals.
+
+    Small files compile on the worker thread itself. Larger files compile in
+    a child process so the pipeline never competes with the UI thread for
+    the interpreter lock; the worker thread only relays queue messages.
+    Compiled programs are kept in a ``ProgramCache`` next to the file, so
+    reopening an unchanged program maps the cached arrays instead.
+    """
+
+    progress = pyqtSignal(str, int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, path: Path, limits: MachineLimits) -> None:
+        super().__init__()
+        self._path = path
+        self._limits = limits
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @pyqtSlot()
+    def run(self) -> None:
+        try:
+            source = GCodeFile.open(self._path)
+        except (OSError, ValueError) as exc:
+            self.failed.emit(str(exc))
+            return
+        with span(SPAN_LOAD):
+            cache = ProgramCache.beside(self._path)
+            try:
+                digest = source_digest(source, self.progress.emit, self._cancel.is_set)
+            except LoadCancelled:
+                source.close()
+                self.cancelled.emit()
+                return
+            key = cache_key(digest, self._limits)
+            compiled = cache.load(key)
+            if compiled is None:
+                if source.size < PROCESS_THRESHOLD:
+                    compiled = self._run_in_thread(source)
+                else:
+                    compiled = self._run_in_process()
+                if compiled is not None:
+                    cache.store(key, compiled)
+        if compiled is None:
+            source.close()
+        else:
+            self.finished.emit(LoadResult(self._path, compiled, source))
+
+    def _run_in_thread(self, source: GCodeFile) -> Optional[CompiledProgram]:
+        try:
+            return compile_gcode(
+                source.iter_chunks(),
+                source.size,
+                self._limits,
+                progress=self.progress.emit,
+                cancelled=self._cancel.is_set,
+            )
+        except LoadCancelled:
+            self.cancelled.emit()
+        except ValueError as exc:
+            self.failed.emit(str(exc))
+        return None
+
+    def _run_in_process(self) -> Optional[CompiledProgram]:
+        context = multiprocessing.get_context("spawn")
+        messages = context.Queue()
+        process = context.Process(
+            target=compile_file_job,
+            args=(self._path, self._limits, messages),
+            daemon=True,
+        )
+        process.start()
+        try:
+            while True:
+                if self._cancel.is_set():
+                    process.terminate()
+                    self.cancelled.emit()
+                    return None
+                try:
+                    message = messages.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    if not process.is_alive() and messages.empty():
+                        self.failed.emit("G-code loader process exited unexpectedly.")
+                        return None
+                    continue
+                kind = message[0]
+                if kind == "progress":
+                    self.progress.emit(*message[1:])
+                elif kind == "failed":
+                    self.failed.emit(message[1])
+                    return None
+                else:
+                    return message[1]
+        finally:
+            process.join()
+            messages.close()
+
+
+class GCodeLoader(QObject):
+    """Runs one load at a time; superseded or cancelled workers wind down alone.
+
+    Cancelling never blocks the UI thread: the worker notices the cancel
+    flag at its next checkpoint and its thread is released afterwards.
+    """
+
+    progress = pyqtSignal(str, int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._worker: Optional[GCodeLoadWorker] = None
+        self._threads: Dict[QThread, GCodeLoadWorker] = {}
+
+    def is_loading(self) -> bool:
+        return self._worker is not None
+
+    def start(self, path: Path, limits: MachineLimits) -> None:
+        self.cancel()
+        thread = QThread()
+        worker = GCodeLoadWorker(path, limits)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        for done in (worker.finished, worker.failed, worker.cancelled):
+            done.connect(thread.quit)
+        thread.finished.connect(self._release_thread)
+        worker.progress.connect(self._on_progress)
+        worker.finished.connect(self._on_finished)
+        worker.failed.connect(self._on_failed)
+        self._threads[thread] = worker
+        self._worker = worker
+        thread.start()
+
+    def cancel(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+            self.cancelled.emit()
+
+    def shutdown(self) -> None:
+        """Cancel any load and wait for worker threads before exit."""
+
+        self.cancel()
+        for thread, worker in list(self._threads.items()):
+            worker.cancel()
+            thread.quit()
+            thread.wait()
+        self._threads.clear()
+
+    def _on_progress(self, stage: str, done: int, total: int) -> None:
+        if self.sender() is self._worker:
+            self.progress.emit(stage, done, total)
+
+    def _on_finished(self, result: LoadResult) -> None:
+        if self.sender() is self._worker:
+            self._worker = None
+            self.finished.emit(result)
+        else:
+            # A superseded worker may finish past its last cancel check; its
+            # source is nobody's, so release the mapping and file handle.
+            result.source.close()
+
+    def _on_failed(self, message: str) -> None:
+        if self.sender() is self._worker:
+            self._worker = None
+            self.failed.emit(message)
+
+    def _release_thread(self) -> None:
+        thread = self.sender()
+        worker = self._threads.pop(thread, None)
+        if worker is not None:
+            worker.deleteLater()
+            thread.deleteLater()
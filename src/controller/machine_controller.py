@@ -1,182 +1,188 @@
-"""Controller to bridge UI interactions with simulator state."""
+"""Controller to bridge UI interactions with simulator state.
+
+``MachineController`` is a thin Qt adapter around ``SimulationEngine``: it
+re-emits engine events as signals, drives ``tick`` from a ``QTimer`` and
+loads files in the background with ``GCodeLoader``.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
+from core.toolpath import Toolpath
+from core.toolpath_lod import ToolpathLod
+from gcode.reader import GCodeFile
+from material.stock import StockModel
+from simulation.engine import (
+    ENGINE_EVENTS,
+    EVENT_MACHINE_STATE,
+    EVENT_PAUSED,
+    EVENT_STARTED,
+    EVENT_STOPPED,
+    MachineSnapshot,
+    SimulationEngine,
+)
+from simulation.machine import AxisConfig
 
-@dataclass
-class AxisConfig:
-    """Axis configuration as defined by the UI."""
-
-    name: str
-    axis_type: str
-    minimum: float
-    maximum: float
-    active: bool
-
-
-class ValidationError(Exception):
-    """Validation error for user input."""
+from .gcode_loader import GCodeLoader, LoadResult
 
-
-class InputValidator:
-    """Shared validation helpers for UI input."""
-
-    @staticmethod
-    def validate_axis_limits(min_val: float, max_val: float) -> None:
-        if min_val >= max_val:
-            raise ValidationError("Minimum value must be less than maximum.")
-
-    @staticmethod
-    def validate_tool_parameters(params: Dict[str, float]) -> None:
-        if params["diameter"] <= 0:
-            raise ValidationError("Tool diameter must be positive.")
-        if params["length"] < params["cutting_length"]:
-            raise ValidationError("Tool length must exceed cutting length.")
+FRAME_INTERVAL_MS = 16
 
 
 class MachineController(QObject):
-    """Controller that stores and updates machine-related state."""
+    """Controller that exposes a ``SimulationEngine`` through Qt signals.
+
+    ``machine_state_changed`` is throttled to one ``MachineSnapshot`` per
+    display frame: states arriving within a frame of the last delivery are
+    coalesced and only the newest is delivered at the frame boundary.
+    """
 
     simulation_started = pyqtSignal()
     simulation_paused = pyqtSignal()
     simulation_stopped = pyqtSignal()
-    simulation_progress = pyqtSignal(int, int)
-    machine_state_changed = pyqtSignal(dict)
+    machine_state_changed = pyqtSignal(object)
     error_occurred = pyqtSignal(str, str)
     workpiece_updated = pyqtSignal()
     tool_changed = pyqtSignal()
     gcode_loaded = pyqtSignal(int)
-
-    def __init__(self) -> None:
+    gcode_file_loaded = pyqtSignal(str)
+    gcode_load_progress = pyqtSignal(str, int, int)
+    gcode_load_cancelled = pyqtSignal()
+    gcode_load_finished = pyqtSignal()
+    cycle_time_estimated = pyqtSignal(float)
+    material_removed = pyqtSignal(float)
+
+    def __init__(self, engine: Optional[SimulationEngine] = None) -> None:
         super().__init__()
-        self._axis_config: List[AxisConfig] = []
-        self._tool_params: Dict[str, float | str] = {}
-        self._workpiece_params: Dict[str, float | str] = {}
-        self._gcode_lines: List[str] = []
-        self._axis_positions: Dict[str, float] = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self._engine = engine or SimulationEngine()
+        for event in ENGINE_EVENTS:
+            if event != EVENT_MACHINE_STATE:
+                self._engine.subscribe(event, getattr(self, event).emit)
+        self._engine.subscribe(EVENT_MACHINE_STATE, self._queue_machine_state)
+        self._pending_state: Optional[MachineSnapshot] = None
+        self._last_state_delivery = 0.0
+        self._state_timer = QTimer()
+        self._state_timer.setSingleShot(True)
+        self._state_timer.timeout.connect(self._deliver_machine_state)
         self._simulation_timer = QTimer()
-        self._simulation_timer.setInterval(50)
+        self._simulation_timer.setInterval(FRAME_INTERVAL_MS)
         self._simulation_timer.timeout.connect(self._advance_simulation)
-        self._simulation_current = 0
+        self._engine.subscribe(EVENT_STARTED, self._simulation_timer.start)
+        self._engine.subscribe(EVENT_PAUSED, self._simulation_timer.stop)
+        self._engine.subscribe(EVENT_STOPPED, self._simulation_timer.stop)
+        self._loader = GCodeLoader()
+        self._loader.progress.connect(self.gcode_load_progress)
+        self._loader.finished.connect(self._on_gcode_file_compiled)
+        self._loader.failed.connect(self._on_gcode_load_failed)
+        self._loader.cancelled.connect(self.gcode_load_cancelled)
+        self._loader.cancelled.connect(self.gcode_load_finished)
+
+    @property
+    def engine(self) -> SimulationEngine:
+        return self._engine
 
     def apply_axis_configuration(self, config: List[AxisConfig]) -> None:
-        try:
-            for axis in config:
-                InputValidator.validate_axis_limits(axis.minimum, axis.maximum)
-            self._axis_config = config
-            self._emit_machine_state()
-        except ValidationError as exc:
-            self.error_occurred.emit("Validation", str(exc))
+        self._engine.apply_axis_configuration(config)
 
     def set_axis_position(self, axis: str, value: float) -> None:
-        if axis in self._axis_positions:
-            self._axis_positions[axis] = value
-            self._emit_machine_state()
+        self._engine.set_axis_position(axis, value)
 
     def apply_tool_parameters(self, params: Dict[str, float | str]) -> None:
-        try:
-            InputValidator.validate_tool_parameters(
-                {
-                    "diameter": float(params["diameter"]),
-                    "length": float(params["length"]),
-                    "cutting_length": float(params["cutting_length"]),
-                }
-            )
-            self._tool_params = params
-            self.tool_changed.emit()
-        except ValidationError as exc:
-            self.error_occurred.emit("Validation", str(exc))
+        self._engine.apply_tool_parameters(params)
 
     def create_workpiece(self, params: Dict[str, float | str]) -> None:
-        self._workpiece_params = params
-        self.workpiece_updated.emit()
+        """Replace the stock with an uncut block sized from the workpiece setup."""
+
+        self._engine.create_workpiece(params)
 
     def load_gcode_text(self, text: str) -> None:
-        self._gcode_lines = [line for line in text.splitlines() if line.strip()]
-        self._simulation_current = 0
-        self.gcode_loaded.emit(len(self._gcode_lines))
+        self._engine.load_gcode_text(text)
 
     def load_gcode_file(self, filepath: Path) -> None:
-        try:
-            content = filepath.read_text(encoding="utf-8")
-        except OSError as exc:
-            self.error_occurred.emit("File error", str(exc))
-            return
-        self.load_gcode_text(content)
+        self.pause_simulation()
+        self._loader.start(filepath, self._engine.machine_limits())
 
-    def start_simulation(self, speed: int = 100) -> None:
-        if not self._gcode_lines:
-            self.error_occurred.emit("Simulation", "Load G-code before starting.")
-            return
-        self._simulation_timer.setInterval(max(10, int(200 - speed)))
-        if not self._simulation_timer.isActive():
-            self.simulation_started.emit()
-            self._simulation_timer.start()
+    def cancel_gcode_load(self) -> None:
+        self._loader.cancel()
+
+    def is_loading(self) -> bool:
+        return self._loader.is_loading()
+
+    def shutdown(self) -> None:
+        self._simulation_timer.stop()
+        self._state_timer.stop()
+        self._loader.shutdown()
+        self._engine.close()
+
+    def _on_gcode_file_compiled(self, result: LoadResult) -> None:
+        self._engine.set_program(result.source, result.compiled)
+        self.gcode_load_finished.emit()
+        self.gcode_file_loaded.emit(str(result.path))
+
+    def _on_gcode_load_failed(self, message: str) -> None:
+        self.gcode_load_finished.emit()
+        self.error_occurred.emit("File error", message)
+
+    def analyze_cycle_time(self) -> None:
+        self._engine.analyze_cycle_time()
+
+    def cycle_time(self) -> float:
+        return self._engine.cycle_time()
+
+    def remaining_time(self) -> float:
+        return self._engine.remaining_time()
+
+    def start_simulation(self, speed: float = 1.0) -> None:
+        self._engine.start(speed)
+
+    def set_simulation_speed(self, speed: float) -> None:
+        self._engine.set_speed(speed)
 
     def pause_simulation(self) -> None:
-        if self._simulation_timer.isActive():
-            self._simulation_timer.stop()
-            self.simulation_paused.emit()
+        self._engine.pause()
 
     def stop_simulation(self) -> None:
-        if self._simulation_timer.isActive():
-            self._simulation_timer.stop()
-        self._simulation_current = 0
-        self.simulation_stopped.emit()
-        self.simulation_progress.emit(0, len(self._gcode_lines))
+        self._engine.stop()
 
     def is_simulation_running(self) -> bool:
-        return self._simulation_timer.isActive()
+        return self._engine.running
 
     def _advance_simulation(self) -> None:
-        total = len(self._gcode_lines)
-        if self._simulation_current >= total:
-            self.stop_simulation()
-            return
-        line = self._gcode_lines[self._simulation_current]
-        self._apply_gcode_line(line)
-        self._simulation_current += 1
-        self.simulation_progress.emit(self._simulation_current, total)
-        self._emit_machine_state()
-
-    def _emit_machine_state(self) -> None:
-        positions = dict(self._axis_positions)
-        for axis in self._axis_config:
-            if not axis.active:
-                positions.pop(axis.name, None)
-            else:
-                positions.setdefault(axis.name, 0.0)
-        if not positions:
-            positions = {"X": 0.0, "Y": 0.0, "Z": 0.0}
-        self.machine_state_changed.emit(positions)
-
-    def current_gcode(self) -> str:
-        return "\n".join(self._gcode_lines)
-
-    def _apply_gcode_line(self, line: str) -> None:
-        cleaned = line.split(";")[0].strip()
-        if not cleaned:
-            return
-        if "(" in cleaned and ")" in cleaned:
-            cleaned = cleaned.split("(")[0].strip()
-        if not cleaned:
-            return
-        parts = cleaned.upper().split()
-        if not any(part.startswith(("G0", "G00", "G1", "G01")) for part in parts):
+        self._engine.tick()
+
+    def _queue_machine_state(self, state: MachineSnapshot) -> None:
+        self._pending_state = state
+        if self._state_timer.isActive():
             return
-        for part in parts:
-            try:
-                if part.startswith("X"):
-                    self._axis_positions["X"] = float(part[1:])
-                elif part.startswith("Y"):
-                    self._axis_positions["Y"] = float(part[1:])
-                elif part.startswith("Z"):
-                    self._axis_positions["Z"] = float(part[1:])
-            except ValueError:
-                continue
+        wait_ms = FRAME_INTERVAL_MS - (time.perf_counter() - self._last_state_delivery) * 1000.0
+        if wait_ms <= 0.0:
+            self._deliver_machine_state()
+        else:
+            self._state_timer.start(int(wait_ms) + 1)
+
+    def _deliver_machine_state(self) -> None:
+        state, self._pending_state = self._pending_state, None
+        if state is not None:
+            self._last_state_delivery = time.perf_counter()
+            self.machine_state_changed.emit(state)
+
+    def gcode_source(self) -> GCodeFile:
+        return self._engine.gcode_source()
+
+    def current_line(self) -> int:
+        """Zero-based source line of the segment being executed, -1 if none."""
+
+        return self._engine.current_line()
+
+    def toolpath(self) -> Toolpath:
+        return self._engine.toolpath()
+
+    def toolpath_preview(self) -> ToolpathLod:
+        return self._engine.toolpath_preview()
+
+    def stock(self) -> Optional[StockModel]:
+        return self._engine.stock()
@@ -7,24 +7,78 @@ from typing import Optional
 import numpy as np
 
 
-@dataclass
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False, slots=True)
 class Pose:
     """Rigid transform from TCP (tool center point) to MCS.
 
     The pose follows the convention: p_mcs = T_mcs_from_tcp @ p_tcp,
     where vectors are 4x1 homogeneous column vectors.
 
+    Derived quantities (TCP position, tool axis, GL matrix and inverse) are
+    computed on first access and cached as read-only arrays, so the matrix
+    must not be modified in place after the pose is created.
+
     Attributes:
         T_mcs_from_tcp: 4x4 homogeneous transform matrix.
 
     Example:
         T = np.eye(4)
         pose = Pose(T)
-        tcp_in_mcs = pose.transform_point(np.array([0, 0, 0, 1]))
+        tcp_in_mcs = pose.tcp_position
     """
 
     T_mcs_from_tcp: np.ndarray
     _T_wcs_from_tcp: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _tcp_position: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _tool_axis: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _gl_matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _T_tcp_from_mcs: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    @property
+    def tcp_position(self) -> np.ndarray:
+        """(3,) TCP origin in MCS, the translation column of the transform."""
+
+        if self._tcp_position is None:
+            object.__setattr__(
+                self, "_tcp_position", _read_only(self.T_mcs_from_tcp[:3, 3].astype(float))
+            )
+        return self._tcp_position
+
+    @property
+    def tool_axis(self) -> np.ndarray:
+        """(3,) TCP Z axis in MCS; the tool points along its negative."""
+
+        if self._tool_axis is None:
+            object.__setattr__(
+                self, "_tool_axis", _read_only(self.T_mcs_from_tcp[:3, 2].astype(float))
+            )
+        return self._tool_axis
+
+    @property
+    def gl_matrix(self) -> np.ndarray:
+        """(16,) float32 column-major matrix for ``glMultMatrixf``/``glLoadMatrixf``."""
+
+        if self._gl_matrix is None:
+            matrix = np.ascontiguousarray(self.T_mcs_from_tcp.T, dtype=np.float32).reshape(16)
+            object.__setattr__(self, "_gl_matrix", _read_only(matrix))
+        return self._gl_matrix
+
+    @property
+    def T_tcp_from_mcs(self) -> np.ndarray:
+        """4x4 inverse transform, computed in closed form for a rigid pose."""
+
+        if self._T_tcp_from_mcs is None:
+            rotation_t = self.T_mcs_from_tcp[:3, :3].T
+            inverse = np.eye(4)
+            inverse[:3, :3] = rotation_t
+            inverse[:3, 3] = -rotation_t @ self.T_mcs_from_tcp[:3, 3]
+            object.__setattr__(self, "_T_tcp_from_mcs", _read_only(inverse))
+        return self._T_tcp_from_mcs
 
     def transform_point(self, p_tcp: np.ndarray) -> np.ndarray:
         """Transform a point from TCP coordinates to MCS.
@@ -46,11 +100,33 @@ class Pose:
             raise ValueError("p_tcp must be a homogeneous 4-element vector")
         return self.T_mcs_from_tcp @ p_tcp_array
 
+    def transform_points(self, points_tcp: np.ndarray) -> np.ndarray:
+        """Transform many points from TCP coordinates to MCS at once.
+
+        Args:
+            points_tcp: (N, 3) Cartesian points or (N, 4) homogeneous points.
+
+        Returns:
+            Points in MCS with the same shape as the input.
+
+        Raises:
+            ValueError: If the points are not (N, 3) or (N, 4).
+
+        Example:
+            outline_mcs = pose.transform_points(outline_tcp)
+        """
+
+        points = np.asarray(points_tcp, dtype=float)
+        if points.ndim != 2 or points.shape[1] not in (3, 4):
+            raise ValueError("points_tcp must be an (N, 3) or (N, 4) array")
+        if points.shape[1] == 4:
+            return points @ self.T_mcs_from_tcp.T
+        return points @ self.T_mcs_from_tcp[:3, :3].T + self.T_mcs_from_tcp[:3, 3]
+
     def apply_to_gl(self, gl_mult_matrixf=None) -> None:
         """Load the pose matrix into OpenGL without axis reinterpretation.
 
-        OpenGL expects column-major order. NumPy uses row-major by default,
-        so the matrix is transposed before flattening.
+        OpenGL expects column-major order, which ``gl_matrix`` caches.
 
         Args:
             gl_mult_matrixf: Optional OpenGL function for loading a matrix.
@@ -64,5 +140,4 @@ class Pose:
             from OpenGL.GL import glMultMatrixf
 
             gl_mult_matrixf = glMultMatrixf
-        gl_matrix = self.T_mcs_from_tcp.T.flatten()
-        gl_mult_matrixf(gl_matrix)
+        gl_mult_matrixf(self.gl_matrix)
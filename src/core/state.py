@@ -1,7 +1,19 @@
 """State structures for CNC simulator kinematics."""
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+import numpy as np
+
+MACHINE_STATE_DTYPE = np.dtype(
+    [("x", np.float64), ("y", np.float64), ("z", np.float64), ("tool_length_offset", np.float64)]
+)
+
+ROTARY_TABLE = "table"
+ROTARY_HEAD = "head"
+ROTARY_DIRECTIONS = {"A": (1.0, 0.0, 0.0), "B": (0.0, 1.0, 0.0), "C": (0.0, 0.0, 1.0)}
 
 
 @dataclass(frozen=True)
@@ -26,14 +38,104 @@ class MachineState:
     tool_length_offset: float
 
 
+def machine_states(x, y, z, tool_length_offset=0.0) -> np.ndarray:
+    """Pack axis arrays into an (N,) ``MACHINE_STATE_DTYPE`` structured array.
+
+    The arguments broadcast against each other, so a scalar tool length
+    offset applies to every state.
+
+    Example:
+        states = machine_states(xs, ys, zs, tool_length_offset=10.0)
+    """
+
+    axes = (x, y, z, tool_length_offset)
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in axes))
+    states = np.empty(columns[0].shape, dtype=MACHINE_STATE_DTYPE)
+    for name, column in zip(MACHINE_STATE_DTYPE.names, columns):
+        states[name] = column
+    return states
+
+
+@dataclass(frozen=True)
+class RotaryAxis:
+    """One rotary axis of a kinematic chain.
+
+    Angles are in degrees and turn right-handed about ``direction``. A
+    table axis turns the workpiece, a head axis turns the tool; the pivot is
+    given in MCS for table axes and relative to the spindle gauge point
+    (the X/Y/Z position) for head axes.
+
+    Attributes:
+        name: Axis letter as programmed, e.g. ``"A"``.
+        location: ``ROTARY_TABLE`` or ``ROTARY_HEAD``.
+        direction: Rotation axis direction, normalized on creation.
+        pivot: Point on the rotation axis in millimeters.
+        minimum: Lower travel limit in degrees.
+        maximum: Upper travel limit in degrees.
+
+    Raises:
+        ValueError: If the location is unknown, the direction is zero or
+            the limits are inverted.
+
+    Example:
+        axis = RotaryAxis("C", ROTARY_TABLE, (0.0, 0.0, 1.0))
+    """
+
+    name: str
+    location: str = ROTARY_TABLE
+    direction: Tuple[float, float, float] = (0.0, 0.0, 1.0)
+    pivot: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    minimum: float = -math.inf
+    maximum: float = math.inf
+
+    def __post_init__(self) -> None:
+        if self.location not in (ROTARY_TABLE, ROTARY_HEAD):
+            raise ValueError(f"Unknown rotary axis location '{self.location}'.")
+        length = math.sqrt(sum(component * component for component in self.direction))
+        if length == 0.0:
+            raise ValueError(f"Rotary axis {self.name} needs a non-zero direction.")
+        if self.minimum >= self.maximum:
+            raise ValueError(f"Rotary axis {self.name} minimum must be less than maximum.")
+        object.__setattr__(
+            self, "direction", tuple(float(component) / length for component in self.direction)
+        )
+        object.__setattr__(self, "pivot", tuple(float(component) for component in self.pivot))
+
+
 @dataclass(frozen=True)
 class KinematicConfig:
     """Kinematic configuration for a machine.
 
-    This placeholder is intentionally minimal for Sprint 1.
+    Three linear axes carry the spindle; ``rotary_axes`` lists table axes
+    from the machine base to the workpiece and head axes from the spindle
+    carrier to the tool. An empty tuple is a 3-axis VMC.
 
     Example:
         config = KinematicConfig()
+        trunnion = KinematicConfig((RotaryAxis("A", direction=(1, 0, 0)), RotaryAxis("C")))
     """
 
-    pass
+    rotary_axes: Tuple[RotaryAxis, ...] = ()
+
+    @classmethod
+    def from_axis_config(cls, axes: Iterable) -> KinematicConfig:
+        """Build a table-rotary configuration from ``AxisConfig``-like objects.
+
+        Active rotary axes named A, B or C turn about X, Y or Z through the
+        MCS origin, in the order listed.
+
+        Args:
+            axes: Objects exposing ``name``, ``axis_type``, ``active``,
+                ``minimum`` and ``maximum``.
+
+        Returns:
+            KinematicConfig with one table axis per active rotary axis.
+        """
+
+        rotary = []
+        for axis in axes:
+            if axis.active and axis.axis_type == "Rotary" and axis.name in ROTARY_DIRECTIONS:
+                direction = ROTARY_DIRECTIONS[axis.name]
+                limits = {"minimum": axis.minimum, "maximum": axis.maximum}
+                rotary.append(RotaryAxis(axis.name, ROTARY_TABLE, direction, **limits))
+        return cls(tuple(rotary))
@@ -0,0 +1,174 @@
+"""Columnar toolpath representation for resolved motion programs."""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+MOTION_RAPID = 0
+MOTION_LINEAR = 1
+MOTION_ARC_CW = 2
+MOTION_ARC_CCW = 3
+
+DEFAULT_RAPID_FEED = 5000.0
+
+
+@dataclass(frozen=True, eq=False)
+class Toolpath:
+    """Fully resolved motion program stored as contiguous arrays.
+
+    Segment ``i`` runs from ``points[i]`` to ``points[i + 1]``, so start and
+    end coordinates are views into a single (N + 1, 3) array instead of two
+    copies. All coordinates are TCP positions in MCS millimeters.
+
+    Attributes:
+        points: (N + 1, 3) float64 path vertices.
+        feed: (N,) float64 programmed feed in mm/min.
+        motion: (N,) uint8 motion type (``MOTION_*`` constants).
+        line: (N,) uint32 zero-based source line of each segment.
+        cum_length: (N,) float64 path length at the end of each segment.
+        cum_time: (N,) float64 machine time in seconds at the end of each
+            segment.
+
+    Example:
+        path = Toolpath.from_moves(start, targets, feed, motion, line)
+        remaining = path.total_time - path.cum_time[current]
+    """
+
+    points: np.ndarray
+    feed: np.ndarray
+    motion: np.ndarray
+    line: np.ndarray
+    cum_length: np.ndarray
+    cum_time: np.ndarray
+
+    @classmethod
+    def empty(cls, start: np.ndarray | None = None) -> Toolpath:
+        """Create a toolpath without segments.
+
+        Args:
+            start: Optional (3,) start position, defaults to the origin.
+
+        Returns:
+            Toolpath with a single vertex and no segments.
+        """
+
+        origin = np.zeros((1, 3)) if start is None else np.asarray(start, dtype=np.float64)
+        return cls.from_moves(
+            origin.reshape(3),
+            np.zeros((0, 3)),
+            np.zeros(0),
+            np.zeros(0, dtype=np.uint8),
+            np.zeros(0, dtype=np.uint32),
+        )
+
+    @classmethod
+    def from_moves(
+        cls,
+        start: np.ndarray,
+        targets: np.ndarray,
+        feed: np.ndarray,
+        motion: np.ndarray,
+        line: np.ndarray,
+        rapid_feed: float = DEFAULT_RAPID_FEED,
+    ) -> Toolpath:
+        """Build a toolpath from move targets in a single vectorized pass.
+
+        Segment times are nominal (length / feed). Rapid moves use
+        ``rapid_feed``; feed moves without a programmed feed take no time.
+
+        Args:
+            start: (3,) position before the first move.
+            targets: (N, 3) end position of every move.
+            feed: (N,) programmed feed in mm/min.
+            motion: (N,) motion type of every move.
+            line: (N,) source line of every move.
+            rapid_feed: Traverse rate for rapid moves in mm/min.
+
+        Returns:
+            Toolpath with cumulative length and time arrays.
+
+        Example:
+            path = Toolpath.from_moves(np.zeros(3), targets, feed, motion, line)
+        """
+
+        points = np.empty((len(targets) + 1, 3), dtype=np.float64)
+        points[0] = start
+        points[1:] = targets
+        motion = np.ascontiguousarray(motion, dtype=np.uint8)
+        feed = np.ascontiguousarray(feed, dtype=np.float64)
+
+        lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        rate = np.where(motion == MOTION_RAPID, rapid_feed, feed)
+        times = np.divide(lengths * 60.0, rate, out=np.zeros_like(lengths), where=rate > 0)
+        return cls(
+            points=points,
+            feed=feed,
+            motion=motion,
+            line=np.ascontiguousarray(line, dtype=np.uint32),
+            cum_length=np.cumsum(lengths),
+            cum_time=np.cumsum(times),
+        )
+
+    def __len__(self) -> int:
+        return len(self.feed)
+
+    @property
+    def start(self) -> np.ndarray:
+        """(N, 3) view of segment start points."""
+
+        return self.points[:-1]
+
+    @property
+    def end(self) -> np.ndarray:
+        """(N, 3) view of segment end points."""
+
+        return self.points[1:]
+
+    @property
+    def segment_lengths(self) -> np.ndarray:
+        """(N,) length of every segment in millimeters."""
+
+        return np.diff(self.cum_length, prepend=0.0)
+
+    @property
+    def segment_times(self) -> np.ndarray:
+        """(N,) duration of every segment in seconds."""
+
+        return np.diff(self.cum_time, prepend=0.0)
+
+    @property
+    def total_length(self) -> float:
+        return float(self.cum_length[-1]) if len(self) else 0.0
+
+    @property
+    def total_time(self) -> float:
+        return float(self.cum_time[-1]) if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the toolpath arrays in bytes."""
+
+        return sum(
+            array.nbytes
+            for array in (
+                self.points,
+                self.feed,
+                self.motion,
+                self.line,
+                self.cum_length,
+                self.cum_time,
+            )
+        )
+
+    def with_segment_times(self, segment_times: np.ndarray) -> Toolpath:
+        """Return a copy sharing geometry but using new segment durations.
+
+        Args:
+            segment_times: (N,) duration of every segment in seconds.
+
+        Returns:
+            Toolpath with a recomputed ``cum_time`` array.
+        """
+
+        return replace(self, cum_time=np.cumsum(segment_times, dtype=np.float64))
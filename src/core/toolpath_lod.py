@@ -0,0 +1,162 @@
+"""Toolpath polyline with precomputed level-of-detail for the viewport.
+
+All levels share one vertex array so they can live in a single vertex
+buffer. Level 0 is the exact path. Every coarser level snaps the previous
+level to a grid twice as coarse and drops vertices that stay in the cell
+of their predecessor, which bounds the deviation of level ``k`` by about
+twice its cell diagonal. Vertices where the motion type changes are never
+dropped, so rapid and feed colors stay exact at every level.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.toolpath import MOTION_RAPID, Toolpath
+
+PATH_VERTEX_DTYPE = np.dtype([("position", np.float32, 3), ("color", np.uint8, 4)])
+PATH_VERTEX_STRIDE = PATH_VERTEX_DTYPE.itemsize
+PATH_COLOR_OFFSET = PATH_VERTEX_DTYPE.fields["color"][1]
+
+RAPID_COLOR = (230, 140, 60, 255)
+FEED_COLOR = (90, 180, 250, 255)
+
+MAX_LOD_LEVELS = 12
+FINEST_CELL_FRACTION = 1.0 / 8192.0
+MIN_LEVEL_REDUCTION = 0.75
+
+
+def _snap_keep(cells: np.ndarray, pinned: np.ndarray) -> np.ndarray:
+    """Mask of vertices whose grid cell differs from their predecessor's."""
+
+    keep = np.empty(len(cells), dtype=bool)
+    keep[0] = True
+    np.not_equal(cells[1:], cells[:-1], out=keep[1:])
+    keep |= pinned
+    keep[-1] = True
+    return keep
+
+
+def _cell_keys(cells: np.ndarray, shift: int, bits: int) -> np.ndarray:
+    """Pack (N, 3) non-negative integer cells coarsened by ``2**shift`` into keys."""
+
+    coarse = (cells >> shift).astype(np.int64)
+    return (coarse[:, 0] << (2 * bits)) | (coarse[:, 1] << bits) | coarse[:, 2]
+
+
+@dataclass(frozen=True, eq=False)
+class ToolpathLod:
+    """Decimated polylines of a toolpath, concatenated level by level.
+
+    Attributes:
+        vertices: (V,) ``PATH_VERTEX_DTYPE`` vertices of all levels. With
+            flat shading the color of vertex ``j`` colors the line ending
+            at ``j``.
+        source_index: (V,) toolpath vertex each LOD vertex was taken from.
+        level_first: (L,) first vertex of every level.
+        level_count: (L,) vertex count of every level.
+        cell_size: (L,) grid cell of every level in mm, 0 for level 0.
+
+    Example:
+        lod = ToolpathLod.build(toolpath)
+        level = lod.level_for(world_per_pixel=0.5)
+        executed = lod.executed_vertices(level, completed_segments)
+    """
+
+    vertices: np.ndarray
+    source_index: np.ndarray
+    level_first: np.ndarray
+    level_count: np.ndarray
+    cell_size: np.ndarray
+
+    @classmethod
+    def empty(cls) -> ToolpathLod:
+        return cls(
+            np.zeros(0, PATH_VERTEX_DTYPE),
+            np.zeros(0, np.uint32),
+            np.zeros(1, np.int64),
+            np.zeros(1, np.int64),
+            np.zeros(1),
+        )
+
+    @classmethod
+    def build(cls, toolpath: Toolpath, max_levels: int = MAX_LOD_LEVELS) -> ToolpathLod:
+        """Decimate a toolpath into LOD levels.
+
+        The finest grid is ``FINEST_CELL_FRACTION`` of the path bounding
+        box diagonal. A level is only kept if it removes at least a quarter
+        of the vertices of the previous one.
+
+        Args:
+            toolpath: Resolved toolpath.
+            max_levels: Upper bound on the number of levels, including 0.
+
+        Returns:
+            ToolpathLod ready for a single buffer upload.
+        """
+
+        if not len(toolpath):
+            return cls.empty()
+        points = toolpath.points
+        motion = toolpath.motion
+        palette = np.array([FEED_COLOR, RAPID_COLOR], dtype=np.uint8)
+        rapid = np.concatenate([motion[:1], motion]) == MOTION_RAPID
+        pinned = np.zeros(len(points), dtype=bool)
+        pinned[1:-1] = motion[1:] != motion[:-1]
+
+        low = points.min(axis=0)
+        diagonal = float(np.linalg.norm(points.max(axis=0) - low))
+        cell = max(diagonal, 1e-9) * FINEST_CELL_FRACTION
+        scaled = points - low
+        scaled *= 1.0 / cell
+        cells = scaled.astype(np.int32)
+        del scaled
+        bits = int(cells.max()).bit_length()
+        index_dtype = np.uint32 if len(points) < np.iinfo(np.uint32).max else np.int64
+        levels = [np.arange(len(points), dtype=index_dtype)]
+        sizes = [0.0]
+        shift = 0
+        while len(levels) < max_levels and len(levels[-1]) > 2 and shift <= bits:
+            current = levels[-1]
+            keep = _snap_keep(_cell_keys(cells[current], shift, bits), pinned[current])
+            if keep.sum() <= MIN_LEVEL_REDUCTION * len(current):
+                levels.append(current[keep])
+                sizes.append(cell * (1 << shift))
+            shift += 1
+
+        source_index = np.concatenate(levels)
+        vertices = np.empty(len(source_index), PATH_VERTEX_DTYPE)
+        vertices["position"] = points.astype(np.float32)[source_index]
+        vertices["color"] = palette[rapid.view(np.uint8)[source_index]]
+        level_count = np.array([len(level) for level in levels], dtype=np.int64)
+        level_first = np.concatenate([[0], np.cumsum(level_count)[:-1]])
+        return cls(vertices, source_index, level_first, level_count, np.asarray(sizes))
+
+    @property
+    def levels(self) -> int:
+        return len(self.level_count)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.vertices.nbytes + self.source_index.nbytes)
+
+    def level_for(self, world_per_pixel: float, tolerance_pixels: float = 1.0) -> int:
+        """Coarsest level whose grid cell stays below the pixel tolerance."""
+
+        limit = world_per_pixel * tolerance_pixels
+        return int(np.searchsorted(self.cell_size, limit, side="right")) - 1
+
+    def executed_vertices(self, level: int, segments: int) -> int:
+        """Number of leading vertices of ``level`` covered by executed segments.
+
+        The line strip ``[0, n)`` is the executed part and ``[n - 1, count)``
+        the remaining part, so both draw from the same buffer range.
+        """
+
+        first = int(self.level_first[level])
+        count = int(self.level_count[level])
+        if not count:
+            return 0
+        source = self.source_index[first : first + count]
+        return int(np.searchsorted(source, segments, side="right"))
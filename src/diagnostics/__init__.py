@@ -0,0 +1 @@
+"""Runtime instrumentation: frame and step metrics, memory and their export."""
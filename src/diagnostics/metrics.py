@@ -0,0 +1,268 @@
+"""Frame-time, step-rate and memory metrics without Qt.
+
+``FrameTimes`` keeps a rolling window of frame durations in preallocated
+arrays, ``FrameLimiter`` paces repaints to an FPS cap, and
+``MetricsRecorder`` turns periodic samples of both plus the simulation step
+counter and process RSS into a trace that exports to CSV or JSON.
+
+Example:
+    frames = FrameTimes()
+    recorder = MetricsRecorder()
+    frames.record(started, time.perf_counter())
+    sample = recorder.sample(time.perf_counter(), frames, engine.step_count)
+    recorder.export(Path("metrics.csv"))
+"""
+from __future__ import annotations
+
+import csv
+import ctypes
+import json
+import os
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FRAME_HISTORY = 240
+PERCENTILES = (50.0, 95.0, 99.0)
+HISTOGRAM_EDGES_MS = (0.0, 2.0, 4.0, 8.0, 16.7, 33.3, 50.0, 100.0, float("inf"))
+
+
+class FrameTimes:
+    """Rolling window of the most recent frame durations.
+
+    Durations and start times live in fixed-size ring buffers, so recording
+    a frame never allocates. The frame rate is taken from the start times.
+    """
+
+    def __init__(self, capacity: int = FRAME_HISTORY) -> None:
+        if capacity < 2:
+            raise ValueError("Frame history needs at least two frames.")
+        self._durations = np.zeros(capacity)
+        self._stamps = np.zeros(capacity)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, started: float, finished: float) -> None:
+        """Add one frame that ran from ``started`` to ``finished`` seconds."""
+
+        self._durations[self._next] = finished - started
+        self._stamps[self._next] = started
+        self._next = (self._next + 1) % len(self._durations)
+        self._count = min(self._count + 1, len(self._durations))
+
+    def durations(self) -> np.ndarray:
+        """Frame durations in seconds, oldest first."""
+
+        if self._count < len(self._durations):
+            return self._durations[: self._count].copy()
+        return np.roll(self._durations, -self._next)
+
+    def fps(self) -> float:
+        """Frames per second over the window, 0 with fewer than two frames."""
+
+        if self._count < 2:
+            return 0.0
+        newest = self._stamps[self._next - 1]
+        oldest = self._stamps[0 if self._count < len(self._stamps) else self._next]
+        span = newest - oldest
+        return (self._count - 1) / span if span > 0.0 else 0.0
+
+    def percentiles(self, q: Sequence[float] = PERCENTILES) -> Tuple[float, ...]:
+        """Frame time percentiles in milliseconds, zeros for an empty window."""
+
+        if not self._count:
+            return tuple(0.0 for _ in q)
+        values = np.percentile(self._durations[: self._count], q)
+        return tuple(float(value) * 1000.0 for value in values)
+
+    def histogram(self, edges_ms: Sequence[float] = HISTOGRAM_EDGES_MS) -> np.ndarray:
+        """Frame counts per millisecond bin ``[edges_ms[i], edges_ms[i + 1])``."""
+
+        counts, _ = np.histogram(self._durations[: self._count] * 1000.0, bins=edges_ms)
+        return counts
+
+
+class FrameLimiter:
+    """Spaces frame starts at least ``1 / max_fps`` seconds apart.
+
+    A ``max_fps`` of 0 disables the limit.
+    """
+
+    def __init__(self, max_fps: float = 0.0) -> None:
+        self._interval = 0.0
+        self._last_frame = float("-inf")
+        self.max_fps = max_fps
+
+    @property
+    def max_fps(self) -> float:
+        return 1.0 / self._interval if self._interval else 0.0
+
+    @max_fps.setter
+    def max_fps(self, value: float) -> None:
+        if value < 0.0:
+            raise ValueError("FPS limit must not be negative.")
+        self._interval = 1.0 / value if value else 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds to wait before a frame may start at ``now``; 0 if it may start."""
+
+        return max(self._last_frame + self._interval - now, 0.0)
+
+    def mark(self, now: float) -> None:
+        """Record that a frame started at ``now``."""
+
+        self._last_frame = now
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where unknown.
+
+    Reads ``/proc/self/statm`` on Linux and the working set on Windows; on
+    other systems falls back to the peak RSS from ``getrusage``.
+    """
+
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm", "rb") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(
+                process, ctypes.byref(counters), counters.cb
+            ):
+                return int(counters.WorkingSetSize)
+            return None
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+    except (OSError, ValueError, AttributeError, ImportError):
+        return None
+
+
+@dataclass(frozen=True)
+class MetricsSample:
+    """One row of the metrics trace.
+
+    Attributes:
+        time: Sample time in seconds since the recorder started.
+        fps: Displayed frames per second.
+        frame_p50_ms: Median frame time in milliseconds.
+        frame_p95_ms: 95th percentile frame time in milliseconds.
+        frame_p99_ms: 99th percentile frame time in milliseconds.
+        step_rate: Simulation steps per second since the previous sample.
+        rss_bytes: Process resident set size, -1 if unknown.
+    """
+
+    time: float
+    fps: float
+    frame_p50_ms: float
+    frame_p95_ms: float
+    frame_p99_ms: float
+    step_rate: float
+    rss_bytes: int
+
+
+class MetricsRecorder:
+    """Collects ``MetricsSample`` rows and exports them as a trace.
+
+    Args:
+        capacity: Maximum number of samples kept; the oldest are dropped.
+    """
+
+    def __init__(self, capacity: int = 7200) -> None:
+        self._samples: deque[MetricsSample] = deque(maxlen=capacity)
+        self._started: Optional[float] = None
+        self._last_time = 0.0
+        self._last_steps = 0
+
+    @property
+    def samples(self) -> List[MetricsSample]:
+        return list(self._samples)
+
+    def sample(
+        self, now: float, frames: FrameTimes, steps: int, rss: Optional[int] = None
+    ) -> MetricsSample:
+        """Record the current metrics.
+
+        Args:
+            now: Current ``time.perf_counter()`` value.
+            frames: Frame window of the viewport.
+            steps: Total simulation steps so far; the rate is taken from the
+                difference to the previous sample.
+            rss: Resident set size; read with ``process_rss`` when omitted.
+
+        Returns:
+            The recorded sample.
+        """
+
+        if self._started is None:
+            self._started = self._last_time = now
+            self._last_steps = steps
+        elapsed = now - self._last_time
+        step_rate = (steps - self._last_steps) / elapsed if elapsed > 0.0 else 0.0
+        self._last_time, self._last_steps = now, steps
+        if rss is None:
+            rss = process_rss()
+        p50, p95, p99 = frames.percentiles(PERCENTILES)
+        sample = MetricsSample(
+            now - self._started,
+            frames.fps(),
+            p50,
+            p95,
+            p99,
+            step_rate,
+            -1 if rss is None else rss,
+        )
+        self._samples.append(sample)
+        return sample
+
+    def export(self, path: Path) -> None:
+        """Write the samples to ``path`` as CSV or JSON, chosen by the suffix.
+
+        Raises:
+            ValueError: If the suffix is neither ``.csv`` nor ``.json``.
+            OSError: If the file cannot be written.
+        """
+
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            with path.open("w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(field.name for field in fields(MetricsSample))
+                for sample in self._samples:
+                    writer.writerow(asdict(sample).values())
+        elif suffix == ".json":
+            document = {
+                "platform": sys.platform,
+                "percentiles": list(PERCENTILES),
+                "samples": [asdict(sample) for sample in self._samples],
+            }
+            path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        else:
+            raise ValueError(f"Unsupported metrics format: {path.suffix or path.name}")
@@ -0,0 +1,231 @@
+"""Span timers for the hot paths, exportable as a Chrome trace.
+
+Profiling is off by default and ``span`` then returns a shared no-op
+context manager, so instrumented code pays one global lookup and call per
+span. ``enable`` installs a ``Profiler`` that writes every finished span
+into a preallocated ring buffer and keeps per-stage counts and totals that
+survive the ring wrapping around.
+
+Spans only cover the current process; programs compiled in a worker
+process by ``GCodeLoader`` are not recorded.
+
+Example:
+    profiling.enable()
+    with profiling.span(SPAN_TOKENIZE):
+        words = tokenize(source)
+
+    @profiling.profiled(SPAN_FK)
+    def forward(joints): ...
+
+    profiling.current().export_chrome_trace(Path("trace.json"))
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import time
+from functools import wraps
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+DEFAULT_CAPACITY = 1 << 16
+
+_F = TypeVar("_F", bound=Callable)
+
+SPAN_LOAD = "load"
+SPAN_TOKENIZE = "tokenize"
+SPAN_INTERPRET = "interpret"
+SPAN_CYCLE_TIME = "cycle_time"
+SPAN_PREVIEW = "preview"
+SPAN_FK = "kinematics"
+SPAN_REMOVAL = "material_removal"
+SPAN_STEP = "simulation_step"
+SPAN_MESH = "mesh_update"
+SPAN_PAINT = "paintGL"
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_record", "_name", "_started")
+
+    def __init__(self, profiler: Profiler, name: int) -> None:
+        self._record = profiler.record
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> bool:
+        self._record(self._name, self._started, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """Ring buffer of finished spans plus per-name aggregates.
+
+    Args:
+        capacity: Number of most recent spans kept for the trace export.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("Profiler capacity must be positive.")
+        self._capacity = capacity
+        self._ring: List[Optional[Tuple[int, int, int, int]]] = [None] * capacity
+        self._slots = itertools.count()
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._counts: List[int] = []
+        self._totals: List[int] = []
+        self._maxima: List[int] = []
+        self._lock = Lock()
+        self._origin = time.perf_counter_ns()
+
+    def name_id(self, name: str) -> int:
+        """Intern a span name; ids index the aggregate lists."""
+
+        try:
+            return self._ids[name]
+        except KeyError:
+            with self._lock:
+                if name not in self._ids:
+                    self._names.append(name)
+                    self._counts.append(0)
+                    self._totals.append(0)
+                    self._maxima.append(0)
+                    self._ids[name] = len(self._names) - 1
+                return self._ids[name]
+
+    def span(self, name: str) -> _Span:
+        name_id = self._ids.get(name)
+        return _Span(self, self.name_id(name) if name_id is None else name_id)
+
+    def record(self, name: int, started_ns: int, finished_ns: int) -> None:
+        """Store one finished span of interned name ``name``."""
+
+        duration = finished_ns - started_ns
+        self._ring[next(self._slots) % self._capacity] = (
+            started_ns,
+            duration,
+            name,
+            get_ident(),
+        )
+        self._counts[name] += 1
+        self._totals[name] += duration
+        if duration > self._maxima[name]:
+            self._maxima[name] = duration
+
+    def span_count(self) -> int:
+        """Spans recorded so far, including those the ring has dropped."""
+
+        return sum(self._counts)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-name ``count``, ``total_ms``, ``mean_ms`` and ``max_ms``."""
+
+        return {
+            name: {
+                "count": count,
+                "total_ms": total / 1e6,
+                "mean_ms": total / count / 1e6 if count else 0.0,
+                "max_ms": maximum / 1e6,
+            }
+            for name, count, total, maximum in zip(
+                self._names, self._counts, self._totals, self._maxima
+            )
+        }
+
+    def trace_events(self) -> List[dict]:
+        """Spans still in the ring as Chrome ``"X"`` complete events, oldest first."""
+
+        pid = os.getpid()
+        threads: Dict[int, int] = {}
+        events = []
+        for started, duration, name, ident in sorted(span for span in self._ring if span):
+            events.append(
+                {
+                    "name": self._names[name],
+                    "cat": "vizualizer",
+                    "ph": "X",
+                    "ts": (started - self._origin) / 1000.0,
+                    "dur": duration / 1000.0,
+                    "pid": pid,
+                    "tid": threads.setdefault(ident, len(threads) + 1),
+                }
+            )
+        return events
+
+    def export_chrome_trace(self, path: Path) -> None:
+        """Write the trace for ``chrome://tracing`` or Perfetto, with the summary.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+
+        document = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary()},
+        }
+        Path(path).write_text(json.dumps(document), encoding="utf-8")
+
+
+_current: Optional[Profiler] = None
+
+
+def span(name: str):
+    """Context manager timing a block as ``name``; a no-op while disabled."""
+
+    if _current is None:
+        return _NULL_SPAN
+    return _current.span(name)
+
+
+def profiled(name: str) -> Callable[[_F], _F]:
+    """Decorator timing every call of a function as a span named ``name``."""
+
+    def decorate(function: _F) -> _F:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current is None:
+                return function(*args, **kwargs)
+            with _current.span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def enable(capacity: int = DEFAULT_CAPACITY) -> Profiler:
+    """Start recording into a fresh ``Profiler`` and return it."""
+
+    global _current
+    _current = Profiler(capacity)
+    return _current
+
+
+def disable() -> Optional[Profiler]:
+    """Stop recording; returns the profiler that was active, if any."""
+
+    global _current
+    profiler, _current = _current, None
+    return profiler
+
+
+def current() -> Optional[Profiler]:
+    return _current
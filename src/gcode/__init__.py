@@ -0,0 +1 @@
+"""G-code parsing and interpretation."""
@@ -0,0 +1,149 @@
+"""Vectorized G2/G3 arc interpolation with chord-tolerance segmentation."""
+from __future__ import annotations
+
+import numpy as np
+
+DEFAULT_CHORD_TOLERANCE = 0.01
+MAX_SEGMENTS_PER_ARC = 10000
+
+_ANGULAR_EPSILON = 5e-7
+
+# Axis order (first plane axis, second plane axis, helical axis) for
+# G17 (XY), G18 (ZX) and G19 (YZ). Rotation is counter-clockwise when
+# looking down the helical axis, matching RS274 direction conventions.
+_PLANE_AXES = np.array([[0, 1, 2], [2, 0, 1], [1, 2, 0]], dtype=np.intp)
+
+
+def _radius_centers(
+    start: np.ndarray,
+    end: np.ndarray,
+    radius: np.ndarray,
+    clockwise: np.ndarray,
+) -> np.ndarray:
+    """Return in-plane center offsets from start for R-format arcs.
+
+    A positive radius selects the arc shorter than 180 degrees, a negative
+    radius the longer one. Chords longer than the diameter are clamped to a
+    half circle.
+    """
+
+    dx = end[:, 0] - start[:, 0]
+    dy = end[:, 1] - start[:, 1]
+    chord = np.hypot(dx, dy)
+    height = np.sqrt(np.maximum(4.0 * radius * radius - chord * chord, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h_x2_div_d = np.where(chord > 0.0, -height / chord, 0.0)
+    h_x2_div_d = np.where(clockwise, h_x2_div_d, -h_x2_div_d)
+    h_x2_div_d = np.where(radius < 0.0, -h_x2_div_d, h_x2_div_d)
+    return np.column_stack(
+        [0.5 * (dx - dy * h_x2_div_d), 0.5 * (dy + dx * h_x2_div_d)]
+    )
+
+
+def segment_arcs(
+    start: np.ndarray,
+    end: np.ndarray,
+    plane: np.ndarray,
+    clockwise: np.ndarray,
+    offsets: np.ndarray | None = None,
+    radius: np.ndarray | None = None,
+    tolerance: float = DEFAULT_CHORD_TOLERANCE,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Segment many arcs into chords in a single vectorized pass.
+
+    The chord count of every arc is chosen so the maximum deviation between
+    chord and true arc stays below ``tolerance``. Motion along the axis
+    normal to the arc plane is interpolated linearly (helical arcs). When
+    start and end points coincide the arc is a full circle.
+
+    Args:
+        start: (N, 3) arc start points in XYZ.
+        end: (N, 3) arc end points in XYZ.
+        plane: (N,) plane index, 0 for G17, 1 for G18, 2 for G19.
+        clockwise: (N,) True for G2, False for G3.
+        offsets: Optional (N, 3) I/J/K center offsets relative to start.
+            Missing words must be zero.
+        radius: Optional (N,) R words. Entries that are not NaN override
+            ``offsets``.
+        tolerance: Maximum chord deviation in millimeters.
+
+    Returns:
+        Tuple ``(counts, points)`` where ``counts`` is the (N,) number of
+        chords per arc and ``points`` the (counts.sum(), 3) chord end points
+        in arc order. The last point of every arc equals its end point.
+
+    Example:
+        counts, points = segment_arcs(start, end, plane, clockwise, offsets=ijk)
+    """
+
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    count = len(start)
+    clockwise = np.asarray(clockwise, dtype=bool)
+    axes = _PLANE_AXES[np.asarray(plane, dtype=np.intp)]
+    planar_start = np.take_along_axis(start, axes, axis=1)
+    planar_end = np.take_along_axis(end, axes, axis=1)
+
+    center = np.zeros((count, 2))
+    if offsets is not None:
+        center = np.take_along_axis(np.asarray(offsets, dtype=np.float64), axes, axis=1)[:, :2]
+    if radius is not None:
+        radius = np.asarray(radius, dtype=np.float64)
+        use_radius = ~np.isnan(radius)
+        if use_radius.any():
+            center[use_radius] = _radius_centers(
+                planar_start[use_radius],
+                planar_end[use_radius],
+                radius[use_radius],
+                clockwise[use_radius],
+            )
+    center = center + planar_start[:, :2]
+
+    from_center = planar_start[:, :2] - center
+    to_center = planar_end[:, :2] - center
+    start_radius = np.hypot(from_center[:, 0], from_center[:, 1])
+    end_radius = np.hypot(to_center[:, 0], to_center[:, 1])
+    travel = np.arctan2(
+        from_center[:, 0] * to_center[:, 1] - from_center[:, 1] * to_center[:, 0],
+        from_center[:, 0] * to_center[:, 0] + from_center[:, 1] * to_center[:, 1],
+    )
+    travel = np.where(
+        clockwise,
+        np.where(travel >= -_ANGULAR_EPSILON, travel - 2.0 * np.pi, travel),
+        np.where(travel <= _ANGULAR_EPSILON, travel + 2.0 * np.pi, travel),
+    )
+
+    arc_radius = np.maximum(start_radius, end_radius)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.clip(1.0 - tolerance / arc_radius, -1.0, 1.0)
+        max_step = 2.0 * np.arccos(cosine)
+        counts = np.where(
+            (arc_radius > 0.0) & (max_step > 0.0),
+            np.ceil(np.abs(travel) / max_step),
+            1.0,
+        )
+    counts = np.clip(counts, 1, MAX_SEGMENTS_PER_ARC).astype(np.intp)
+
+    arc_of_point = np.repeat(np.arange(count), counts)
+    step = np.arange(len(arc_of_point)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    fraction = step / counts[arc_of_point]
+    angle = (
+        np.arctan2(from_center[:, 1], from_center[:, 0])[arc_of_point]
+        + travel[arc_of_point] * fraction
+    )
+    point_radius = start_radius[arc_of_point] + (
+        end_radius[arc_of_point] - start_radius[arc_of_point]
+    ) * fraction
+    planar = np.column_stack(
+        [
+            center[arc_of_point, 0] + point_radius * np.cos(angle),
+            center[arc_of_point, 1] + point_radius * np.sin(angle),
+            planar_start[arc_of_point, 2]
+            + (planar_end[arc_of_point, 2] - planar_start[arc_of_point, 2]) * fraction,
+        ]
+    )
+    points = np.empty_like(planar)
+    np.put_along_axis(points, axes[arc_of_point], planar, axis=1)
+    last = np.cumsum(counts) - 1
+    points[last] = end
+    return counts, points
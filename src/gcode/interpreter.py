@@ -0,0 +1,781 @@
+"""Batch modal interpreter turning G-code word tables into toolpaths.
+
+The interpreter never replays the program block by block. Every modal
+group is resolved for all blocks at once with vectorized forward fills,
+and modal changes are kept as run-length arrays so the state at any source
+line is a binary search away.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.toolpath import (
+    DEFAULT_RAPID_FEED,
+    MOTION_ARC_CCW,
+    MOTION_ARC_CW,
+    MOTION_LINEAR,
+    MOTION_RAPID,
+    Toolpath,
+)
+
+from .arcs import DEFAULT_CHORD_TOLERANCE, segment_arcs
+from .tokenizer import block_starts, code_key
+
+_AXES = ("X", "Y", "Z")
+
+MOTION_NONE = -1
+# Canned cycles keep their G number as the modal motion value.
+CANNED_CYCLES = (73, 81, 82, 83, 84, 85, 86, 87, 88, 89)
+PLANE_XY, PLANE_ZX, PLANE_YZ = 0, 1, 2
+DISTANCE_ABSOLUTE, DISTANCE_INCREMENTAL = 0, 1
+UNITS_INCH, UNITS_MM = 0, 1
+FEED_INVERSE_TIME, FEED_PER_MINUTE, FEED_PER_REVOLUTION = 0, 1, 2
+RETURN_INITIAL, RETURN_R = 0, 1
+WORK_OFFSETS = ("G54", "G55", "G56", "G57", "G58", "G59")
+# Peck drilling retracts: G83 returns to R and rapids back down to this far
+# above the previous depth, G73 only backs off by the chip break distance.
+PECK_CLEARANCE = 0.25
+CHIP_BREAK_RETRACT = 0.25
+
+_MODAL_GROUPS: Dict[str, Dict[float, int]] = {
+    "motion": {
+        0: MOTION_RAPID,
+        1: MOTION_LINEAR,
+        2: MOTION_ARC_CW,
+        3: MOTION_ARC_CCW,
+        80: MOTION_NONE,
+        **{code: code for code in CANNED_CYCLES},
+    },
+    "plane": {17: PLANE_XY, 18: PLANE_ZX, 19: PLANE_YZ},
+    "distance": {90: DISTANCE_ABSOLUTE, 91: DISTANCE_INCREMENTAL},
+    "feed_mode": {93: FEED_INVERSE_TIME, 94: FEED_PER_MINUTE, 95: FEED_PER_REVOLUTION},
+    "units": {20: UNITS_INCH, 21: UNITS_MM},
+    "work_offset": {54 + index: index for index in range(len(WORK_OFFSETS))},
+    "return_mode": {98: RETURN_INITIAL, 99: RETURN_R},
+}
+_MODAL_DEFAULTS = {
+    "motion": MOTION_NONE,
+    "plane": PLANE_XY,
+    "distance": DISTANCE_ABSOLUTE,
+    "feed_mode": FEED_PER_MINUTE,
+    "units": UNITS_MM,
+    "work_offset": 0,
+    "return_mode": RETURN_INITIAL,
+}
+_MACHINE_COORDINATES = code_key(53)
+_NON_MODAL = tuple(code_key(code) for code in (4, 10, 28, 28.1, 30, 30.1, 92, 92.1, 92.2, 92.3))
+_SET_WORK_OFFSET = code_key(10)
+_HOME, _SECOND_HOME = code_key(28), code_key(30)
+_G92, _G92_CANCEL, _G92_SUSPEND, _G92_RESTORE = (
+    code_key(code) for code in (92, 92.1, 92.2, 92.3)
+)
+_EXPANDED_CYCLES = (73, 81, 82, 83, 84, 85, 86, 89)
+_FEED_OUT_CYCLES = (84, 85, 89)
+_PECK_CYCLES = (73, 83)
+_MM_PER_INCH = 25.4
+_CODE_TABLE_SIZE = 1000
+
+
+def _build_code_tables() -> tuple[np.ndarray, np.ndarray]:
+    group_table = np.full(_CODE_TABLE_SIZE, -1, dtype=np.int8)
+    value_table = np.zeros(_CODE_TABLE_SIZE, dtype=np.int8)
+    for group_index, codes in enumerate(_MODAL_GROUPS.values()):
+        for code, value in codes.items():
+            group_table[code_key(code)] = group_index
+            value_table[code_key(code)] = value
+    return group_table, value_table
+
+
+_GROUP_TABLE, _VALUE_TABLE = _build_code_tables()
+
+
+@dataclass(frozen=True, eq=False)
+class ModalRuns:
+    """Run-length encoded values of one modal group.
+
+    Attributes:
+        block: Index of the block that starts each run.
+        line: Source line that starts each run.
+        value: Modal value held during each run.
+
+    Example:
+        units = program.modal["units"]
+        mode = units.value_at_line(120)
+    """
+
+    block: np.ndarray
+    line: np.ndarray
+    value: np.ndarray
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, lines: np.ndarray) -> ModalRuns:
+        """Compress per-block modal values into runs."""
+
+        if not len(values):
+            return cls(np.zeros(0, np.intp), np.zeros(0, np.uint32), np.zeros(0, np.int8))
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        return cls(block=starts, line=lines[starts], value=values[starts].astype(np.int8))
+
+    def value_at_line(self, line: int, default: int = 0) -> int:
+        """Return the modal value in effect after ``line`` has executed."""
+
+        index = int(np.searchsorted(self.line, line, side="right")) - 1
+        return int(self.value[index]) if index >= 0 else default
+
+
+@dataclass(frozen=True, eq=False)
+class InterpretedProgram:
+    """Interpreter output: resolved toolpath plus modal state history.
+
+    Attributes:
+        toolpath: Resolved motion in MCS coordinates.
+        block_lines: Source line of every block.
+        modal: Run-length modal history keyed by group name
+            (``motion``, ``plane``, ``distance``, ``feed_mode``, ``units``,
+            ``work_offset``, ``return_mode``).
+        unsupported_lines: Source lines of blocks that were skipped because
+            the interpreter cannot execute them, e.g. G87 back boring.
+
+    Example:
+        program = interpret(tokenize(text))
+        plane = program.modal_state_at(line)["plane"]
+    """
+
+    toolpath: Toolpath
+    block_lines: np.ndarray
+    modal: Dict[str, ModalRuns]
+    unsupported_lines: np.ndarray = field(default_factory=lambda: np.zeros(0, np.uint32))
+
+    @property
+    def block_count(self) -> int:
+        return len(self.block_lines)
+
+    def modal_state_at(self, line: int) -> Dict[str, int]:
+        """Return every modal group value in effect after ``line``."""
+
+        return {
+            name: runs.value_at_line(line, _MODAL_DEFAULTS[name])
+            for name, runs in self.modal.items()
+        }
+
+    def segment_at_line(self, line: int) -> int:
+        """Return the number of segments completed once ``line`` has executed."""
+
+        return int(np.searchsorted(self.toolpath.line, line, side="right"))
+
+
+def _block_words(words: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Map every word to the index of the block containing it."""
+
+    block_of_word = np.zeros(len(words), dtype=np.intp)
+    block_of_word[starts[1:]] = 1
+    return np.cumsum(block_of_word)
+
+
+def _block_values(
+    words: np.ndarray, block_of_word: np.ndarray, count: int, letter: str
+) -> np.ndarray:
+    """Return the value of ``letter`` in every block, NaN where absent."""
+
+    values = np.full(count, np.nan)
+    mask = words["letter"] == ord(letter)
+    values[block_of_word[mask]] = words["value"][mask]
+    return values
+
+
+def _forward_fill_index(present: np.ndarray) -> np.ndarray:
+    """Return the index of the last ``True`` entry at or before each position."""
+
+    index = np.where(present, np.arange(len(present)), -1)
+    np.maximum.accumulate(index, out=index)
+    return index
+
+
+def _forward_fill(values: np.ndarray, initial: float) -> np.ndarray:
+    """Propagate the last non-NaN value forward, starting from ``initial``."""
+
+    index = _forward_fill_index(~np.isnan(values))
+    return np.where(index >= 0, values[index], initial)
+
+
+def _resolve_axis(
+    words: np.ndarray,
+    incremental: np.ndarray,
+    scale: np.ndarray,
+    offset: np.ndarray,
+    start: float,
+    reset: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Resolve one axis to machine coordinates for every block.
+
+    Absolute words set the position outright; incremental words are summed
+    with a single cumulative sum that restarts after each absolute word.
+    ``reset`` holds machine positions, NaN elsewhere, that blocks end at
+    regardless of their words, e.g. the home position of G28.
+    """
+
+    present = ~np.isnan(words)
+    absolute = present & ~incremental
+    relative = present & incremental
+    target = np.where(absolute, words * scale + offset, 0.0)
+    if reset is not None:
+        fixed = ~np.isnan(reset)
+        absolute |= fixed
+        relative &= ~fixed
+        target = np.where(fixed, reset, target)
+    steps = np.cumsum(np.where(relative, words * scale, 0.0))
+    last_absolute = _forward_fill_index(absolute)
+    base = np.where(
+        last_absolute >= 0,
+        target[last_absolute] - steps[last_absolute],
+        start,
+    )
+    return base + steps
+
+
+def _work_offset_table(work_offsets: Mapping[str, Sequence[float]] | None) -> np.ndarray:
+    table = np.zeros((len(WORK_OFFSETS), 3))
+    for name, offset in (work_offsets or {}).items():
+        table[WORK_OFFSETS.index(name.upper())] = offset
+    return table
+
+
+def _blocks_with(g_blocks: np.ndarray, g_codes: np.ndarray, count: int, codes) -> np.ndarray:
+    """Mask of the blocks that contain any of the G code keys ``codes``."""
+
+    found = np.zeros(count, dtype=bool)
+    found[g_blocks[np.isin(g_codes, codes)]] = True
+    return found
+
+
+def _work_offsets(
+    table: np.ndarray,
+    active: np.ndarray,
+    updates: np.ndarray,
+    systems: np.ndarray,
+    axis_words: List[np.ndarray],
+    scale: np.ndarray,
+) -> np.ndarray:
+    """Work offset in effect at every block, with G10 L2 updates applied.
+
+    Args:
+        table: (6, 3) initial G54-G59 offsets.
+        active: (N,) selected work offset index per block.
+        updates: (N,) mask of G10 L2 blocks.
+        systems: (N,) offset index each G10 L2 block sets.
+        axis_words: X/Y/Z values per block, NaN where absent.
+        scale: (N,) millimeters per program unit.
+
+    Returns:
+        (N, 3) offsets; a G10 L2 block changes only the axes it names.
+    """
+
+    offsets = table[active]
+    blocks = np.flatnonzero(updates)
+    for system in np.unique(systems[blocks]):
+        selected = blocks[systems[blocks] == system]
+        for axis, values in enumerate(axis_words):
+            programmed = np.full(len(active), np.nan)
+            programmed[selected] = values[selected] * scale[selected]
+            if np.isnan(programmed[selected]).all():
+                continue
+            filled = _forward_fill(programmed, table[system, axis])
+            offsets[:, axis] = np.where(active == system, filled, offsets[:, axis])
+    return offsets
+
+
+@dataclass(eq=False)
+class _CannedCycles:
+    """Per-block canned cycle inputs and the levels planned for each run.
+
+    A run is a stretch of blocks in a canned cycle motion mode. Its initial
+    Z level, the G98 retract height, is only known once the blocks before
+    it are resolved, so runs are planned one at a time in order.
+    """
+
+    blocks: np.ndarray
+    run_starts: np.ndarray
+    run_ends: np.ndarray
+    retract_words: np.ndarray
+    bottom_words: np.ndarray
+    return_to_r: np.ndarray
+    r_level: np.ndarray
+    bottom: np.ndarray
+
+    def plan_run(
+        self,
+        run: int,
+        initial_z: float,
+        offset_z: np.ndarray,
+        incremental: np.ndarray,
+        scale: np.ndarray,
+        resets: np.ndarray,
+    ) -> None:
+        """Fill R, bottom and end levels of the run starting at block ``run``.
+
+        In G91 R is measured from the initial level and Z from R.
+        """
+
+        end = self.run_ends[np.searchsorted(self.run_starts, run)]
+        span = slice(run, end)
+        scaled_r = self.retract_words[span] * scale[span]
+        scaled_bottom = self.bottom_words[span] * scale[span]
+        relative = incremental[span]
+        r_level = np.where(relative, initial_z + scaled_r, scaled_r + offset_z[span])
+        bottom = np.where(relative, r_level + scaled_bottom, scaled_bottom + offset_z[span])
+        clear = np.where(self.return_to_r[span], r_level, np.maximum(initial_z, r_level))
+        self.r_level[span] = r_level
+        self.bottom[span] = bottom
+        resets[span, 2] = np.where(self.blocks[span], clear, resets[span, 2])
+
+
+def _resolve_positions(
+    axis_words: List[np.ndarray],
+    g92_words: List[np.ndarray],
+    g92_codes: np.ndarray,
+    incremental: np.ndarray,
+    scale: np.ndarray,
+    work: np.ndarray,
+    machine_coordinates: np.ndarray,
+    start: np.ndarray,
+    resets: Optional[np.ndarray],
+    cycles: Optional[_CannedCycles],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Resolve machine positions and the offsets applied for every block.
+
+    G92 offsets and canned cycle runs depend on the machine position where
+    they start, so the blocks are resolved in vectorized stretches between
+    those events. Programs without them resolve in one stretch.
+
+    Returns:
+        ``(positions, offsets)``, both (N, 3).
+    """
+
+    count = len(scale)
+    positions = np.empty((count, 3))
+    offsets = np.empty((count, 3))
+    events = np.flatnonzero(g92_codes)
+    if cycles is not None:
+        events = np.union1d(events, cycles.run_starts)
+    run_starts = set() if cycles is None else set(cycles.run_starts.tolist())
+    g92 = np.zeros(3)
+    suspended = np.zeros(3)
+    position = np.asarray(start, dtype=np.float64)
+    begin = 0
+    for block in [*events.tolist(), count]:
+        if block > begin:
+            span = slice(begin, block)
+            offsets[span] = np.where(machine_coordinates[span, None], 0.0, work[span] + g92)
+            for axis in range(3):
+                positions[span, axis] = _resolve_axis(
+                    axis_words[axis][span],
+                    incremental[span],
+                    scale[span],
+                    offsets[span, axis],
+                    position[axis],
+                    None if resets is None else resets[span, axis],
+                )
+            position = positions[block - 1].copy()
+            begin = block
+        if block == count:
+            break
+        code = g92_codes[block]
+        if code == _G92:
+            for axis, values in enumerate(g92_words):
+                if not np.isnan(values[block]):
+                    g92[axis] = position[axis] - work[block, axis] - values[block] * scale[block]
+        elif code == _G92_CANCEL:
+            g92, suspended = np.zeros(3), np.zeros(3)
+        elif code == _G92_SUSPEND:
+            g92, suspended = np.zeros(3), g92
+        elif code == _G92_RESTORE:
+            g92 = suspended.copy()
+        if code:
+            offsets[block] = work[block] + g92
+            positions[block] = position
+            begin = block + 1
+        if block in run_starts:
+            cycles.plan_run(block, position[2], work[:, 2] + g92[2], incremental, scale, resets)
+    return positions, offsets
+
+
+def _cycle_legs(
+    previous: np.ndarray,
+    target: np.ndarray,
+    r_level: np.ndarray,
+    bottom: np.ndarray,
+    kind: np.ndarray,
+    peck: np.ndarray,
+) -> List[Tuple]:
+    """Expand canned cycle blocks into candidate moves.
+
+    Every hole rapids to the R level, feeds to the bottom, in pecks of ``Q``
+    for G73/G83, and retracts to its end level: by rapid, or at feed to R
+    for the feed-out cycles G84, G85 and G89. Dwells are not timed.
+
+    Returns:
+        ``(hole, order, points, motion, valid)`` candidate legs, ``order``
+        sorting the legs of one hole.
+    """
+
+    holes = len(target)
+    x, y, clear = target[:, 0], target[:, 1], target[:, 2]
+    above = np.maximum(previous[:, 2], r_level)
+    pecking = np.isin(kind, _PECK_CYCLES) & (peck > 0)
+    pecks = np.ones(holes, dtype=np.intp)
+    pecks[pecking] = np.maximum(
+        np.ceil((r_level - bottom)[pecking] / peck[pecking]), 1
+    ).astype(np.intp)
+
+    hole = np.arange(holes)
+    owner_of_peck = np.repeat(hole, pecks)
+    number = np.arange(len(owner_of_peck)) - np.repeat(np.cumsum(pecks) - pecks, pecks) + 1
+    depth = np.where(
+        pecking[owner_of_peck],
+        np.maximum(r_level[owner_of_peck] - number * peck[owner_of_peck], bottom[owner_of_peck]),
+        bottom[owner_of_peck],
+    )
+    last = number == pecks[owner_of_peck]
+    full_retract = kind[owner_of_peck] == 83
+    retract = np.where(full_retract, r_level[owner_of_peck], depth + CHIP_BREAK_RETRACT)
+    feed_out = np.isin(kind, _FEED_OUT_CYCLES)
+
+    def at(owner: np.ndarray, z: np.ndarray) -> np.ndarray:
+        return np.column_stack([x[owner], y[owner], z])
+
+    return [
+        (
+            hole,
+            0,
+            np.column_stack([previous[:, :2], r_level]),
+            MOTION_RAPID,
+            previous[:, 2] < r_level,
+        ),
+        (hole, 1, at(hole, above), MOTION_RAPID, np.any(previous[:, :2] != target[:, :2], axis=1)),
+        (hole, 2, at(hole, r_level), MOTION_RAPID, above > r_level),
+        (owner_of_peck, 3 * number, at(owner_of_peck, depth), MOTION_LINEAR, np.ones_like(last)),
+        (owner_of_peck, 3 * number + 1, at(owner_of_peck, retract), MOTION_RAPID, ~last),
+        (
+            owner_of_peck,
+            3 * number + 2,
+            at(owner_of_peck, depth + PECK_CLEARANCE),
+            MOTION_RAPID,
+            ~last & full_retract,
+        ),
+        (hole, 3 * pecks + 3, at(hole, r_level), MOTION_LINEAR, feed_out),
+        (hole, 3 * pecks + 4, at(hole, clear), MOTION_RAPID, ~feed_out | (clear > r_level)),
+    ]
+
+
+def _stack_legs(legs: List[Tuple]) -> Tuple[np.ndarray, ...]:
+    owner = np.concatenate([leg[0] for leg in legs])
+    order = np.concatenate([np.broadcast_to(leg[1], leg[0].shape) for leg in legs])
+    points = np.concatenate([leg[2] for leg in legs])
+    motion = np.concatenate([np.full(len(leg[0]), leg[3], dtype=np.uint8) for leg in legs])
+    valid = np.concatenate([np.broadcast_to(leg[4], leg[0].shape) for leg in legs])
+    return owner, order, points, motion, valid
+
+
+def interpret(
+    words: np.ndarray,
+    start: np.ndarray | None = None,
+    work_offsets: Mapping[str, Sequence[float]] | None = None,
+    rapid_feed: float = DEFAULT_RAPID_FEED,
+    chord_tolerance: float = DEFAULT_CHORD_TOLERANCE,
+    home: np.ndarray | None = None,
+    second_home: np.ndarray | None = None,
+) -> InterpretedProgram:
+    """Resolve a tokenized program into MCS moves and modal history.
+
+    Supports G0-G3 motion modes, G17-G19 planes, G90/G91 distance modes,
+    G20/G21 units, G93-G95 feed modes, G54-G59 work offsets and non-modal
+    G53 machine coordinates. G2/G3 arcs in I/J/K or R form are split into
+    chords by ``gcode.arcs.segment_arcs``; every chord becomes a toolpath
+    segment tagged with the arc motion type and source line.
+
+    Non-modal blocks never move with the modal motion: G4 dwells, G10 L2
+    sets work offsets, G92/G92.1/G92.2/G92.3 set, clear, suspend and restore
+    the coordinate system offset, and G28/G30 rapid through the programmed
+    intermediate point to the home position of the named axes, or of all
+    axes without axis words. Canned cycles G73 and G81-G86, G89 with G98/G99
+    retract modes are expanded into rapid and feed moves. Blocks that
+    cannot be executed, such as G87/G88 cycles or G10 forms other than L2,
+    produce no motion and are listed in ``unsupported_lines``.
+
+    Args:
+        words: Word table produced by ``gcode.tokenizer.tokenize``.
+        start: Optional (3,) machine position before the program starts.
+        work_offsets: Optional mapping such as ``{"G54": (x, y, z)}`` in
+            millimeters, unset offsets are zero.
+        rapid_feed: Traverse rate for rapid moves in mm/min.
+        chord_tolerance: Maximum chord deviation for arc segmentation in
+            millimeters.
+        home: Optional (3,) machine position G28 returns to, default zero.
+        second_home: Optional (3,) machine position for G30, default zero.
+
+    Returns:
+        InterpretedProgram holding the toolpath and modal run arrays.
+
+    Example:
+        program = interpret(tokenize(text), work_offsets={"G54": (100, 50, 0)})
+    """
+
+    start = np.zeros(3) if start is None else np.asarray(start, dtype=np.float64)
+    starts = block_starts(words)
+    count = len(starts)
+    block_lines = words["line"][starts]
+    block_of_word = _block_words(words, starts)
+
+    g_mask = words["letter"] == ord("G")
+    g_blocks = block_of_word[g_mask]
+    g_codes = np.rint(words["value"][g_mask] * 10.0).astype(np.int64)
+    known = (g_codes >= 0) & (g_codes < _CODE_TABLE_SIZE)
+    g_blocks, g_codes = g_blocks[known], g_codes[known]
+    g_groups = _GROUP_TABLE[g_codes]
+
+    modal_values: Dict[str, np.ndarray] = {}
+    for group_index, name in enumerate(_MODAL_GROUPS):
+        programmed = np.full(count, np.nan)
+        selected = g_groups == group_index
+        programmed[g_blocks[selected]] = _VALUE_TABLE[g_codes[selected]]
+        modal_values[name] = _forward_fill(programmed, _MODAL_DEFAULTS[name]).astype(np.int8)
+    machine_coordinates = _blocks_with(g_blocks, g_codes, count, [_MACHINE_COORDINATES])
+    non_modal = _blocks_with(g_blocks, g_codes, count, _NON_MODAL)
+    unsupported = np.zeros(count, dtype=bool)
+
+    scale = np.where(modal_values["units"] == UNITS_INCH, _MM_PER_INCH, 1.0)
+    incremental = (modal_values["distance"] == DISTANCE_INCREMENTAL) & ~machine_coordinates
+    raw_axis_words = [_block_values(words, block_of_word, count, axis) for axis in _AXES]
+    has_axis_word = np.logical_or.reduce([~np.isnan(values) for values in raw_axis_words])
+
+    table = _work_offset_table(work_offsets)
+    work = table[modal_values["work_offset"]]
+    set_offsets = _blocks_with(g_blocks, g_codes, count, [_SET_WORK_OFFSET])
+    if set_offsets.any():
+        level = _block_values(words, block_of_word, count, "L")
+        system = _block_values(words, block_of_word, count, "P")
+        valid_system = (system >= 0) & (system <= len(WORK_OFFSETS)) & (system == np.rint(system))
+        updates = set_offsets & (level == 2) & valid_system
+        unsupported |= set_offsets & ~updates
+        systems = np.where(
+            system == 0, modal_values["work_offset"], np.nan_to_num(system, nan=1.0) - 1
+        ).astype(np.intp)
+        work = _work_offsets(table, modal_values["work_offset"], updates, systems,
+                             raw_axis_words, scale)
+
+    g92_codes = np.zeros(count, dtype=np.int64)
+    for code in (_G92, _G92_CANCEL, _G92_SUSPEND, _G92_RESTORE):
+        g92_codes[_blocks_with(g_blocks, g_codes, count, [code])] = code
+    unsupported |= _blocks_with(g_blocks, g_codes, count, [code_key(28.1), code_key(30.1)])
+
+    motion = modal_values["motion"]
+    plain_motion = (motion >= MOTION_RAPID) & (motion <= MOTION_ARC_CCW)
+    homing = _blocks_with(g_blocks, g_codes, count, [_HOME, _SECOND_HOME])
+    second = _blocks_with(g_blocks, g_codes, count, [_SECOND_HOME])
+    in_cycle = np.isin(motion, CANNED_CYCLES)
+    cycle = in_cycle & has_axis_word & ~non_modal
+
+    axis_words = [np.where(non_modal, np.nan, values) for values in raw_axis_words]
+    resets: Optional[np.ndarray] = None
+    if homing.any() or cycle.any():
+        resets = np.full((count, 3), np.nan)
+    if homing.any():
+        positions_home = np.where(
+            second[:, None],
+            np.zeros(3) if second_home is None else np.asarray(second_home, dtype=np.float64),
+            np.zeros(3) if home is None else np.asarray(home, dtype=np.float64),
+        )
+        named = np.column_stack([~np.isnan(values) for values in raw_axis_words])
+        named[homing & ~has_axis_word] = True
+        resets[homing] = np.where(named[homing], positions_home[homing], np.nan)
+
+    cycles: Optional[_CannedCycles] = None
+    if cycle.any():
+        bottom_words = np.where(in_cycle, axis_words[2], np.nan)
+        retract_words = np.where(in_cycle, _block_values(words, block_of_word, count, "R"), np.nan)
+        # R, Z and Q stay in effect for the following holes of a cycle.
+        cycle_fill = _forward_fill_index(~np.isnan(retract_words))
+        retract_words = np.where(cycle_fill >= 0, retract_words[cycle_fill], np.nan)
+        cycle_fill = _forward_fill_index(~np.isnan(bottom_words))
+        bottom_words = np.where(cycle_fill >= 0, bottom_words[cycle_fill], np.nan)
+        executable = (
+            cycle
+            & np.isin(motion, _EXPANDED_CYCLES)
+            & ~np.isnan(retract_words)
+            & ~np.isnan(bottom_words)
+        )
+        unsupported |= cycle & ~executable
+        cycle = executable
+        for values in axis_words:
+            values[in_cycle & ~cycle] = np.nan
+        axis_words[2] = np.where(in_cycle, np.nan, axis_words[2])
+        run_starts = np.flatnonzero(in_cycle & ~np.r_[False, in_cycle[:-1]])
+        outside = np.flatnonzero(~in_cycle)
+        after = np.searchsorted(outside, run_starts)
+        run_ends = np.where(
+            after < len(outside), outside[np.minimum(after, len(outside) - 1)], count
+        )
+        cycles = _CannedCycles(
+            blocks=cycle,
+            run_starts=run_starts,
+            run_ends=run_ends,
+            retract_words=retract_words,
+            bottom_words=bottom_words,
+            return_to_r=modal_values["return_mode"] == RETURN_R,
+            r_level=np.full(count, np.nan),
+            bottom=np.full(count, np.nan),
+        )
+
+    positions, offsets = _resolve_positions(
+        axis_words,
+        raw_axis_words,
+        g92_codes,
+        incremental,
+        scale,
+        work,
+        machine_coordinates,
+        start,
+        resets,
+        cycles,
+    )
+    feed = _forward_fill(_block_values(words, block_of_word, count, "F"), 0.0)
+    spindle = _forward_fill(_block_values(words, block_of_word, count, "S"), 0.0)
+
+    arc_blocks = (motion == MOTION_ARC_CW) | (motion == MOTION_ARC_CCW)
+    center_words = [_block_values(words, block_of_word, count, letter) for letter in "IJK"]
+    radius_words = _block_values(words, block_of_word, count, "R")
+    has_center_word = np.logical_or.reduce(
+        [~np.isnan(values) for values in (*center_words, radius_words)]
+    )
+    moves = (has_axis_word | (arc_blocks & has_center_word)) & plain_motion & ~non_modal
+    moves |= homing | cycle
+    move_blocks = np.flatnonzero(moves)
+    targets = positions[move_blocks]
+    previous = np.vstack([start, targets[:-1]])
+
+    counts = np.ones(len(move_blocks), dtype=np.intp)
+    expanded = homing[move_blocks] | cycle[move_blocks]
+    is_arc = arc_blocks[move_blocks] & ~expanded
+    arc_points = np.zeros((0, 3))
+    if is_arc.any():
+        arc_move_blocks = move_blocks[is_arc]
+        arc_scale = scale[arc_move_blocks]
+        counts[is_arc], arc_points = segment_arcs(
+            previous[is_arc],
+            targets[is_arc],
+            modal_values["plane"][arc_move_blocks],
+            motion[arc_move_blocks] == MOTION_ARC_CW,
+            offsets=np.column_stack(
+                [np.nan_to_num(values[arc_move_blocks]) for values in center_words]
+            )
+            * arc_scale[:, None],
+            radius=radius_words[arc_move_blocks] * arc_scale,
+            tolerance=chord_tolerance,
+        )
+
+    legs = []
+    if homing.any():
+        # G28/G30: rapid through the intermediate point, then home.
+        moved = np.flatnonzero(homing[move_blocks])
+        blocks = move_blocks[moved]
+        intermediate = previous[moved].copy()
+        for axis, values in enumerate(raw_axis_words):
+            present = ~np.isnan(values[blocks])
+            step = values[blocks] * scale[blocks]
+            programmed = np.where(
+                incremental[blocks], previous[moved, axis] + step, step + offsets[blocks, axis]
+            )
+            intermediate[present, axis] = programmed[present]
+        legs += [
+            (moved, 0, intermediate, MOTION_RAPID, np.any(intermediate != previous[moved], 1)),
+            (moved, 1, targets[moved], MOTION_RAPID, np.ones(len(moved), dtype=bool)),
+        ]
+    if cycles is not None:
+        moved = np.flatnonzero(cycle[move_blocks])
+        blocks = move_blocks[moved]
+        peck = _forward_fill(
+            np.where(in_cycle, _block_values(words, block_of_word, count, "Q"), np.nan), 0.0
+        )
+        cycle_legs = _cycle_legs(
+            previous[moved],
+            targets[moved],
+            cycles.r_level[blocks],
+            cycles.bottom[blocks],
+            motion[blocks],
+            peck[blocks] * scale[blocks],
+        )
+        legs += [(moved[hole], *leg) for hole, *leg in cycle_legs]
+    leg_points = np.zeros((0, 3))
+    leg_motion = np.zeros(0, dtype=np.uint8)
+    if legs:
+        owner, order, points, candidate_motion, valid = _stack_legs(legs)
+        keep = np.flatnonzero(valid)
+        keep = keep[np.lexsort((order[keep], owner[keep]))]
+        counts[expanded] = np.bincount(owner[keep], minlength=len(move_blocks))[expanded]
+        leg_points, leg_motion = points[keep], candidate_motion[keep]
+
+    move_of_segment = np.repeat(np.arange(len(move_blocks)), counts)
+    block_of_segment = move_blocks[move_of_segment]
+    segment_targets = np.empty((len(block_of_segment), 3))
+    segment_ends = np.cumsum(counts) - 1
+    plain = ~is_arc & ~expanded
+    segment_targets[segment_ends[plain]] = targets[plain]
+    if len(arc_points):
+        arc_segments = np.repeat(is_arc, counts)
+        segment_targets[arc_segments] = arc_points
+    segment_motion = motion[block_of_segment].astype(np.uint8)
+    if len(leg_points):
+        leg_segments = np.repeat(expanded, counts)
+        segment_targets[leg_segments] = leg_points
+        segment_motion[leg_segments] = leg_motion
+
+    move_feed = feed[move_blocks] * scale[move_blocks]
+    feed_mode = modal_values["feed_mode"][move_blocks]
+    per_revolution = feed_mode == FEED_PER_REVOLUTION
+    move_feed[per_revolution] *= spindle[move_blocks][per_revolution]
+    inverse_time = feed_mode == FEED_INVERSE_TIME
+    if inverse_time.any():
+        segment_previous = np.vstack([start, segment_targets[:-1]])
+        segment_lengths = np.linalg.norm(segment_targets - segment_previous, axis=1)
+        move_lengths = np.bincount(
+            move_of_segment, weights=segment_lengths, minlength=len(move_blocks)
+        )
+        move_feed[inverse_time] = (feed[move_blocks] * move_lengths)[inverse_time]
+
+    toolpath = Toolpath.from_moves(
+        start,
+        segment_targets,
+        move_feed[move_of_segment],
+        segment_motion,
+        block_lines[block_of_segment],
+        rapid_feed=rapid_feed,
+    )
+    return InterpretedProgram(
+        toolpath=toolpath,
+        block_lines=block_lines,
+        modal={
+            name: ModalRuns.from_values(values, block_lines)
+            for name, values in modal_values.items()
+        },
+        unsupported_lines=block_lines[unsupported],
+    )
+
+
+def build_toolpath(
+    words: np.ndarray,
+    start: np.ndarray | None = None,
+    rapid_feed: float = DEFAULT_RAPID_FEED,
+    chord_tolerance: float = DEFAULT_CHORD_TOLERANCE,
+) -> Toolpath:
+    """Resolve a tokenized program and return only its toolpath.
+
+    Example:
+        toolpath = build_toolpath(tokenize(text))
+    """
+
+    return interpret(
+        words, start=start, rapid_feed=rapid_feed, chord_tolerance=chord_tolerance
+    ).toolpath
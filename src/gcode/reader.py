@@ -0,0 +1,254 @@
+"""Memory-mapped G-code source with a lazily decoded line index."""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import stat
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+INDEX_SCAN_BYTES = 64 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+SEARCH_CHUNK_SIZE = 1024 * 1024
+
+_NEWLINE = 0x0A
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def _line_ends(buffer: Buffer, size: int) -> np.ndarray:
+    """Byte offset of the end of every line, excluding the newline itself.
+
+    The scan runs over fixed windows so the temporary comparison mask
+    never exceeds ``INDEX_SCAN_BYTES`` regardless of the file size.
+    """
+
+    dtype = np.uint32 if size < np.iinfo(np.uint32).max else np.uint64
+    parts: List[np.ndarray] = []
+    for start in range(0, size, INDEX_SCAN_BYTES):
+        count = min(INDEX_SCAN_BYTES, size - start)
+        window = np.frombuffer(buffer, dtype=np.uint8, count=count, offset=start)
+        found = np.flatnonzero(window == _NEWLINE)
+        parts.append((found + start).astype(dtype))
+        del window
+    if size and buffer[size - 1] != _NEWLINE:
+        parts.append(np.array([size], dtype=dtype))
+    if not parts:
+        return np.zeros(0, dtype=dtype)
+    return np.concatenate(parts)
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def replace_file(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write ``chunks`` to a temporary file beside ``path``, then swap it in.
+
+    The target is never truncated in place, so a ``GCodeFile`` that still
+    maps the old file keeps reading the old bytes through a valid index
+    until it is closed. A failed write leaves the target untouched.
+
+    Raises:
+        OSError: If the file cannot be written or replaced, e.g. on Windows
+            while the target is still mapped.
+    """
+
+    path = Path(path)
+    handle, temporary = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(handle, "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        # mkstemp creates the file private to the user; keep the target's mode.
+        mode = path.stat().st_mode if path.exists() else 0o666 & ~_umask()
+        os.chmod(temporary, stat.S_IMODE(mode))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class GCodeFile:
+    """Read-only program source addressed by line number.
+
+    The file is memory-mapped and indexed by one vectorized newline scan,
+    so opening costs a few bytes per line instead of a decoded copy of the
+    whole program. Lines are decoded only when requested.
+
+    Example:
+        with GCodeFile.open(path) as source:
+            print(len(source), source.line(0))
+    """
+
+    def __init__(
+        self, buffer: Buffer, handle: Optional[BinaryIO] = None, path: Optional[Path] = None
+    ) -> None:
+        self._buffer = buffer
+        self._handle = handle
+        self._path = path
+        self._size = len(buffer)
+        self._ends = _line_ends(buffer, self._size)
+
+    @classmethod
+    def open(cls, path: Path) -> GCodeFile:
+        """Memory-map ``path`` and index its lines.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+
+        handle = open(path, "rb")
+        try:
+            if not handle.seek(0, 2):
+                handle.close()
+                return cls(b"", path=Path(path))
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(buffer, handle, Path(path))
+        except (OSError, ValueError):
+            handle.close()
+            raise
+
+    @classmethod
+    def from_text(cls, text: str) -> GCodeFile:
+        """Index an in-memory program, e.g. the editor contents."""
+
+        return cls(text.encode("utf-8"))
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __enter__(self) -> GCodeFile:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Optional[Path]:
+        """File the source was opened from, None for in-memory programs."""
+
+        return self._path
+
+    @property
+    def size(self) -> int:
+        """Source size in bytes."""
+
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the line index in bytes."""
+
+        return int(self._ends.nbytes)
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._buffer = b""
+
+    def line_span(self, index: int) -> tuple[int, int]:
+        """Return the ``(start, end)`` byte range of a line without its newline."""
+
+        if not 0 <= index < len(self._ends):
+            raise IndexError(f"Line {index} out of range.")
+        start = int(self._ends[index - 1]) + 1 if index else 0
+        return start, int(self._ends[index])
+
+    def line_bytes(self, index: int) -> bytes:
+        start, end = self.line_span(index)
+        data = self._buffer[start:end]
+        return data[:-1] if data.endswith(b"\r") else data
+
+    def line(self, index: int) -> str:
+        """Decode one source line; invalid UTF-8 is replaced, not raised."""
+
+        return self.line_bytes(index).decode("utf-8", errors="replace")
+
+    def lines(self, start: int, stop: int) -> List[str]:
+        """Decode the lines in ``[start, stop)``, clamped to the program."""
+
+        return [self.line(index) for index in range(max(start, 0), min(stop, len(self)))]
+
+    def line_at_offset(self, offset: int) -> int:
+        """Return the line containing byte ``offset``."""
+
+        return int(np.searchsorted(self._ends, offset, side="left"))
+
+    def find(
+        self,
+        text: str,
+        start: int = 0,
+        cancelled: Optional[Callable[[], bool]] = None,
+        chunk_size: int = SEARCH_CHUNK_SIZE,
+    ) -> Optional[int]:
+        """Find ``text`` case-insensitively, wrapping around the end.
+
+        The source is scanned in overlapping windows so a match spanning a
+        window boundary is still found and ``cancelled`` is polled between
+        windows.
+
+        Args:
+            text: Text to look for.
+            start: Byte offset where the search begins.
+            cancelled: Optional check that aborts the search when True.
+            chunk_size: Window size in bytes.
+
+        Returns:
+            Byte offset of the next match, or None if there is none.
+        """
+
+        needle = text.encode("utf-8")
+        if not needle or self._size < len(needle):
+            return None
+        pattern = re.compile(re.escape(needle), re.IGNORECASE)
+        start = min(max(start, 0), self._size)
+        for low, high in ((start, self._size), (0, min(start + len(needle) - 1, self._size))):
+            for window in range(low, high, chunk_size):
+                if cancelled is not None and cancelled():
+                    return None
+                stop = min(window + chunk_size + len(needle) - 1, high)
+                match = pattern.search(self._buffer[window:stop])
+                if match:
+                    return window + match.start()
+        return None
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the raw source in chunks of at most ``chunk_size`` bytes.
+
+        Chunks are copies, so the mapping can be closed while a consumer
+        still holds one.
+        """
+
+        for start in range(0, self._size, chunk_size):
+            yield self._buffer[start : start + chunk_size]
+
+    def text(self) -> str:
+        """Decode the whole program; only meant for sources small enough to edit."""
+
+        return self._buffer[: self._size].decode("utf-8", errors="replace")
+
+    def save(self, path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Write the source bytes to ``path`` without decoding them.
+
+        Saving onto the mapped file itself is a no-op: the bytes are already
+        there. Other targets are written through ``replace_file``.
+        """
+
+        if self.is_file(path):
+            return
+        replace_file(path, self.iter_chunks(chunk_size))
+
+    def is_file(self, path: Path) -> bool:
+        """True if this source maps ``path``."""
+
+        return self._path is not None and Path(path).resolve() == self._path.resolve()
@@ -0,0 +1,213 @@
+"""Incremental G-code tokenizer producing compact word records."""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+Source = Union[str, bytes, Iterable[bytes]]
+
+WORD_DTYPE = np.dtype(
+    [
+        ("letter", np.uint8),
+        ("value", np.float64),
+        ("line", np.uint32),
+        ("offset", np.uint64),
+    ]
+)
+
+_TOKEN_PATTERN = re.compile(
+    rb"\([^)\n]*\)?"
+    rb"|;[^\n]*"
+    rb"|(\n)"
+    rb"|([A-Za-z])[ \t]*([+-]?(?:\d+\.?\d*|\.\d+))"
+)
+
+_RawWord = Tuple[int, float, int, int]
+
+
+class Word(NamedTuple):
+    """Single G-code word.
+
+    Attributes:
+        letter: Upper-case address letter, e.g. "G" or "X".
+        value: Numeric value of the word.
+        line: Zero-based source line index.
+        offset: Byte offset of the word in the source.
+
+    Example:
+        Word(letter="X", value=10.0, line=3, offset=42)
+    """
+
+    letter: str
+    value: float
+    line: int
+    offset: int
+
+
+def code_key(value: float) -> int:
+    """Return an integer key for a G/M code value.
+
+    Codes with a decimal part such as G43.4 map to 434, plain codes such as
+    G1 map to 10, so modal lookups never compare floats directly.
+
+    Args:
+        value: Numeric value of a G or M word.
+
+    Returns:
+        Code multiplied by ten and rounded to the nearest integer.
+
+    Example:
+        assert code_key(43.4) == 434
+    """
+
+    return int(round(value * 10.0))
+
+
+class GCodeTokenizer:
+    """Incremental tokenizer that accepts the program in arbitrary chunks.
+
+    Chunks may split a block anywhere; incomplete trailing text is held
+    back until the next newline arrives or ``close`` is called. Parenthesis
+    comments and ``;`` comments are skipped, words may be written without
+    separators (``G1X10.5Y-.5``) and ``N`` numbers are reported as words.
+
+    Example:
+        tokenizer = GCodeTokenizer()
+        for chunk in chunks:
+            words.extend(tokenizer.feed(chunk))
+        words.extend(tokenizer.close())
+    """
+
+    def __init__(self) -> None:
+        self._pending = b""
+        self._pending_offset = 0
+        self._line = 0
+
+    @property
+    def lines_consumed(self) -> int:
+        """Number of complete source lines tokenized so far."""
+
+        return self._line
+
+    def feed(self, chunk: bytes) -> List[_RawWord]:
+        """Tokenize the complete lines available after appending ``chunk``.
+
+        Args:
+            chunk: Next slice of the raw program bytes.
+
+        Returns:
+            Raw word tuples ``(letter_code, value, line, offset)``.
+        """
+
+        data = self._pending + bytes(chunk)
+        base = self._pending_offset
+        cut = data.rfind(b"\n") + 1
+        self._pending = data[cut:]
+        self._pending_offset = base + cut
+        if not cut:
+            return []
+        return self._scan(data[:cut], base)
+
+    def close(self) -> List[_RawWord]:
+        """Flush the trailing line that has no terminating newline."""
+
+        data = self._pending
+        base = self._pending_offset
+        self._pending = b""
+        self._pending_offset += len(data)
+        if not data:
+            return []
+        words = self._scan(data, base)
+        self._line += 1
+        return words
+
+    def _scan(self, data: bytes, base: int) -> List[_RawWord]:
+        words: List[_RawWord] = []
+        append = words.append
+        line = self._line
+        for match in _TOKEN_PATTERN.finditer(data):
+            group = match.lastindex
+            if group is None:
+                continue
+            if group == 1:
+                line += 1
+                continue
+            append((match.group(2)[0] & 0xDF, float(match.group(3)), line, base + match.start()))
+        self._line = line
+        return words
+
+
+def _iter_chunks(source: Source) -> Iterator[bytes]:
+    if isinstance(source, str):
+        yield source.encode("utf-8")
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source)
+    else:
+        yield from source
+
+
+def _iter_raw(source: Source) -> Iterator[_RawWord]:
+    tokenizer = GCodeTokenizer()
+    for chunk in _iter_chunks(source):
+        yield from tokenizer.feed(chunk)
+    yield from tokenizer.close()
+
+
+def iter_words(source: Source) -> Iterator[Word]:
+    """Yield the words of a program one at a time.
+
+    Args:
+        source: Program text, raw bytes or an iterable of byte chunks.
+
+    Yields:
+        Parsed words in source order.
+
+    Example:
+        for word in iter_words("G1 X10 (cut) Y5"):
+            print(word.letter, word.value)
+    """
+
+    for letter, value, line, offset in _iter_raw(source):
+        yield Word(chr(letter), value, line, offset)
+
+
+def tokenize(source: Source) -> np.ndarray:
+    """Parse a whole program into a compact structured word table.
+
+    Args:
+        source: Program text, raw bytes or an iterable of byte chunks.
+
+    Returns:
+        Structured array with ``WORD_DTYPE`` in source order.
+
+    Example:
+        words = tokenize("G0 X1\\nG1 Y2")
+        x_values = words["value"][words["letter"] == ord("X")]
+    """
+
+    return np.fromiter(_iter_raw(source), dtype=WORD_DTYPE)
+
+
+def block_starts(words: np.ndarray) -> np.ndarray:
+    """Return the index of the first word of every block.
+
+    A block is the set of words sharing one source line. Lines with no
+    words (blank lines, comment-only lines) do not produce blocks.
+
+    Args:
+        words: Word table produced by ``tokenize``.
+
+    Returns:
+        Integer array of block start indices into ``words``.
+
+    Example:
+        starts = block_starts(words)
+        first_block = words[starts[0]:starts[1]]
+    """
+
+    lines = words["line"]
+    if not len(lines):
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.r_[True, lines[1:] != lines[:-1]])
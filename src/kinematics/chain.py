@@ -0,0 +1,313 @@
+"""Data-driven kinematic chains with rotary table and head axes.
+
+A ``KinematicChain`` compiles a ``KinematicConfig`` once into per-axis
+arrays and evaluates forward and inverse kinematics for whole arrays of
+poses. Joint arrays hold X/Y/Z in millimeters followed by the rotary axes in
+configuration order, in degrees.
+
+The returned transform is ``T_wcs_from_tcp``: WCS is fixed to the
+workpiece on the innermost table axis and equals MCS when every table angle
+is zero, so a machine without table axes reports TCP poses in MCS exactly
+like ``kinematics.three_axis.forward_kinematics``.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.state import ROTARY_HEAD, ROTARY_TABLE, KinematicConfig
+from diagnostics.profiling import SPAN_FK, profiled
+
+_SINGULAR = 1e-9
+_REACH_TOLERANCE = 1e-9
+_Z_AXIS = np.array([0.0, 0.0, 1.0])
+
+
+def _skew(direction: np.ndarray) -> np.ndarray:
+    x, y, z = direction
+    return np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+
+
+def _rotations(direction: np.ndarray, radians: np.ndarray) -> np.ndarray:
+    """(N, 3, 3) rotations about a unit direction by Rodrigues' formula."""
+
+    cross = _skew(direction)
+    sin = np.sin(radians)[:, None, None]
+    cos = np.cos(radians)[:, None, None]
+    return np.eye(3) + sin * cross + (1.0 - cos) * (cross @ cross)
+
+
+def _apply(rotation: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    return np.einsum("nij,nj->ni", rotation, vectors)
+
+
+def _rotate_onto(direction: np.ndarray, source: np.ndarray, target: np.ndarray):
+    """Angles turning ``source`` onto ``target`` about ``direction`` (subproblem 1).
+
+    Returns:
+        ``(radians, singular)``; singular rows have a source or target on
+        the axis, where any angle works.
+    """
+
+    source = source - np.outer(source @ direction, direction)
+    target = target - np.outer(target @ direction, direction)
+    sine = np.cross(source, target) @ direction
+    cosine = np.einsum("ni,ni->n", source, target)
+    singular = (np.linalg.norm(source, axis=1) < _SINGULAR) | (
+        np.linalg.norm(target, axis=1) < _SINGULAR
+    )
+    return np.arctan2(sine, cosine), singular
+
+
+def _wrap_near(degrees: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    return reference + (degrees - reference + 180.0) % 360.0 - 180.0
+
+
+class KinematicChain:
+    """Vectorized forward and inverse kinematics compiled from a config.
+
+    Table axes are listed from the machine base to the workpiece and head
+    axes from the spindle carrier to the tool:
+
+        T_mcs_from_tcp = Trans(X, Y, Z) @ Head_1 @ ... @ Trans(0, 0, -tool_length)
+        T_wcs_from_tcp = inv(Table_1 @ ... @ Table_k) @ T_mcs_from_tcp
+
+    Inverse kinematics solves orientation in closed form for up to two
+    rotary axes (Paden-Kahan subproblems 1 and 2), then the linear axes.
+
+    Raises:
+        ValueError: If two rotary axes are parallel, which leaves the tool
+            orientation under-determined.
+
+    Example:
+        chain = KinematicChain(config)
+        transforms = chain.forward(joints, tool_length_offset=25.0)
+        joints = chain.inverse(points, axes, tool_length_offset=25.0)
+    """
+
+    def __init__(self, config: KinematicConfig) -> None:
+        self._config = config
+        axes = config.rotary_axes
+        self._names = ("X", "Y", "Z") + tuple(axis.name for axis in axes)
+        self._table = [
+            (3 + index, np.array(axis.direction), np.array(axis.pivot))
+            for index, axis in enumerate(axes)
+            if axis.location == ROTARY_TABLE
+        ]
+        self._head = [
+            (3 + index, np.array(axis.direction), np.array(axis.pivot))
+            for index, axis in enumerate(axes)
+            if axis.location == ROTARY_HEAD
+        ]
+        self._minimum = np.array([axis.minimum for axis in axes])
+        self._maximum = np.array([axis.maximum for axis in axes])
+        # The tool axis in WCS is the product of these rotations applied to
+        # +Z: the table axes inverted and innermost first, then the head axes.
+        table = [(column, direction, -1.0) for column, direction, _ in self._table[::-1]]
+        head = [(column, direction, 1.0) for column, direction, _ in self._head]
+        self._orientation = table + head
+        if len(self._orientation) == 2:
+            first, second = self._orientation[0][1], self._orientation[1][1]
+            if np.linalg.norm(np.cross(first, second)) < 1e-6:
+                raise ValueError("Two parallel rotary axes cannot orient the tool.")
+
+    @property
+    def config(self) -> KinematicConfig:
+        return self._config
+
+    @property
+    def axis_names(self) -> Tuple[str, ...]:
+        """Joint column names: X, Y, Z, then the rotary axes."""
+
+        return self._names
+
+    def _joints(self, joints: np.ndarray) -> np.ndarray:
+        joints = np.atleast_2d(np.asarray(joints, dtype=np.float64))
+        if joints.ndim != 2 or joints.shape[1] != len(self._names):
+            raise ValueError(f"Joints must be an (N, {len(self._names)}) array.")
+        return joints
+
+    def _chain(self, joints: np.ndarray, chain: list) -> Tuple[np.ndarray, np.ndarray]:
+        """Compose rigid rotations about pivots into (N, 3, 3) and (N, 3)."""
+
+        count = len(joints)
+        rotation = np.broadcast_to(np.eye(3), (count, 3, 3))
+        translation = np.zeros((count, 3))
+        for column, direction, pivot in chain:
+            step = _rotations(direction, np.radians(joints[:, column]))
+            translation = translation + _apply(rotation, pivot - step @ pivot)
+            rotation = rotation @ step
+        return rotation, translation
+
+    def _evaluate(self, joints: np.ndarray, tool_length_offset) -> Tuple[np.ndarray, ...]:
+        """Return ``(rotation, translation, table_rotation)`` of T_wcs_from_tcp.
+
+        ``table_rotation`` is the rotation of T_mcs_from_wcs, or None
+        without table axes.
+        """
+
+        offset = np.broadcast_to(np.asarray(tool_length_offset, dtype=np.float64), len(joints))
+        if self._head:
+            rotation, translation = self._chain(joints, self._head)
+            translation = translation + joints[:, :3] - rotation[:, :, 2] * offset[:, None]
+        else:
+            rotation = np.broadcast_to(np.eye(3), (len(joints), 3, 3))
+            translation = joints[:, :3].copy()
+            translation[:, 2] -= offset
+        if not self._table:
+            return rotation, translation, None
+        table_rotation, table_translation = self._chain(joints, self._table)
+        inverse = np.swapaxes(table_rotation, 1, 2)
+        rotation = inverse @ rotation
+        translation = _apply(inverse, translation - table_translation)
+        return rotation, translation, table_rotation
+
+    @profiled(SPAN_FK)
+    def forward(self, joints: np.ndarray, tool_length_offset=0.0) -> np.ndarray:
+        """Compute (N, 4, 4) T_wcs_from_tcp transforms.
+
+        Args:
+            joints: (N, 3 + R) joint positions, see ``axis_names``.
+            tool_length_offset: Scalar or (N,) tool length in millimeters.
+
+        Returns:
+            Homogeneous transforms, one per joint row.
+        """
+
+        rotation, translation, _ = self._evaluate(self._joints(joints), tool_length_offset)
+        transforms = np.zeros((len(translation), 4, 4))
+        transforms[:, :3, :3] = rotation
+        transforms[:, :3, 3] = translation
+        transforms[:, 3, 3] = 1.0
+        return transforms
+
+    def tcp_positions(self, joints: np.ndarray, tool_length_offset=0.0) -> np.ndarray:
+        """(N, 3) TCP positions in WCS without building the transforms."""
+
+        return self._evaluate(self._joints(joints), tool_length_offset)[1]
+
+    def tool_axes(self, joints: np.ndarray) -> np.ndarray:
+        """(N, 3) unit tool axes in WCS, pointing from the tip to the spindle."""
+
+        return np.array(self._evaluate(self._joints(joints), 0.0)[0][:, :, 2])
+
+    @profiled(SPAN_FK)
+    def inverse(
+        self,
+        positions: np.ndarray,
+        tool_axes: Optional[np.ndarray] = None,
+        tool_length_offset=0.0,
+        seed: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Solve joint positions for TCP-programmed (G43.4 / TCPM) poses.
+
+        Of the two orientation solutions, each pose takes the one inside the
+        travel limits that is closest to ``seed``; axes without limits are
+        then unwrapped along the path so the angles stay continuous. Where
+        the tool lies on a rotary axis that axis keeps its seed angle.
+
+        Args:
+            positions: (N, 3) TCP positions in WCS.
+            tool_axes: (N, 3) tool directions in WCS, defaults to +Z.
+            tool_length_offset: Scalar or (N,) tool length in millimeters.
+            seed: (R,) or (N, R) preferred rotary angles in degrees,
+                defaults to zero.
+
+        Returns:
+            (N, 3 + R) joint positions, see ``axis_names``.
+
+        Raises:
+            ValueError: If a tool axis cannot be reached or the chain has
+                more than two rotary axes.
+        """
+
+        positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+        count = len(positions)
+        if tool_axes is None:
+            targets = np.broadcast_to(_Z_AXIS, (count, 3))
+        else:
+            targets = np.atleast_2d(np.asarray(tool_axes, dtype=np.float64))
+            targets = targets / np.linalg.norm(targets, axis=1, keepdims=True)
+        rotary = len(self._names) - 3
+        seed = np.zeros(rotary) if seed is None else np.asarray(seed, dtype=np.float64)
+        seed = np.broadcast_to(seed, (count, rotary))
+
+        joints = np.zeros((count, len(self._names)))
+        joints[:, 3:] = self._orient(targets, seed)
+        rotation, translation, table_rotation = self._evaluate(joints, tool_length_offset)
+        linear = positions - translation
+        if table_rotation is not None:
+            linear = _apply(table_rotation, linear)
+        joints[:, :3] = linear
+        return joints
+
+    def _orient(self, targets: np.ndarray, seed: np.ndarray) -> np.ndarray:
+        """Rotary angles in degrees turning +Z onto ``targets``."""
+
+        count = len(targets)
+        source = np.broadcast_to(_Z_AXIS, (count, 3))
+        if not self._orientation:
+            return np.zeros((count, 0))
+        if len(self._orientation) > 2:
+            raise ValueError("Inverse kinematics supports at most two rotary axes.")
+        columns = [column - 3 for column, _, _ in self._orientation]
+        signs = np.array([sign for _, _, sign in self._orientation])
+        directions = [direction for _, direction, _ in self._orientation]
+
+        if len(directions) == 1:
+            (direction,) = directions
+            if np.any(np.abs(targets @ direction - direction[2]) > 1e-6):
+                raise ValueError("Some tool axes are not reachable by the rotary axis.")
+            radians, singular = _rotate_onto(direction, source, targets)
+            candidates = np.degrees(radians)[None, :, None]
+            singulars = singular[None, :, None]
+        else:
+            candidates, singulars = self._subproblem_two(directions, source, targets)
+
+        # Candidates are in product order; map them to configuration order.
+        angles = np.empty(candidates.shape)
+        angles[..., columns] = candidates * signs
+        singular = np.zeros(candidates.shape, dtype=bool)
+        singular[..., columns] = singulars
+        angles = np.where(singular, seed, _wrap_near(angles, seed))
+
+        outside = (angles < self._minimum) | (angles > self._maximum)
+        cost = np.abs(angles - seed).sum(axis=2) + np.where(outside.any(axis=2), np.inf, 0.0)
+        chosen = angles[np.argmin(cost, axis=0), np.arange(count)]
+        unlimited = np.isinf(self._minimum) & np.isinf(self._maximum)
+        if count > 1 and unlimited.any():
+            chosen[:, unlimited] = np.unwrap(chosen[:, unlimited], period=360.0, axis=0)
+        return chosen
+
+    @staticmethod
+    def _subproblem_two(directions, source: np.ndarray, targets: np.ndarray):
+        """Both solutions of exp(w1 a) exp(w2 b) source = target, in degrees.
+
+        Returns:
+            ``(angles, singular)`` shaped (2, N, 2) in product order.
+
+        Raises:
+            ValueError: If a target cannot be reached.
+        """
+
+        first, second = directions
+        dot = first @ second
+        cross = np.cross(first, second)
+        denominator = dot * dot - 1.0
+        alpha = (dot * (source @ second) - targets @ first) / denominator
+        beta = (dot * (targets @ first) - source @ second) / denominator
+        gamma_squared = (1.0 - alpha**2 - beta**2 - 2.0 * alpha * beta * dot) / (cross @ cross)
+        if np.any(gamma_squared < -_REACH_TOLERANCE):
+            raise ValueError("Some tool axes are not reachable by the rotary axes.")
+        gamma = np.sqrt(np.clip(gamma_squared, 0.0, None))
+
+        angles = np.empty((2, len(targets), 2))
+        singular = np.empty((2, len(targets), 2), dtype=bool)
+        for branch, sign in enumerate((1.0, -1.0)):
+            middle = (
+                alpha[:, None] * first + beta[:, None] * second + (sign * gamma)[:, None] * cross
+            )
+            angles[branch, :, 0], singular[branch, :, 0] = _rotate_onto(first, middle, targets)
+            angles[branch, :, 1], singular[branch, :, 1] = _rotate_onto(second, source, middle)
+        return np.degrees(angles), singular
@@ -4,7 +4,8 @@ from __future__ import annotations
 import numpy as np
 
 from core.pose import Pose
-from core.state import KinematicConfig, MachineState
+from core.state import MACHINE_STATE_DTYPE, KinematicConfig, MachineState
+from diagnostics.profiling import SPAN_FK, profiled
 
 
 def _translation(x: float, y: float, z: float) -> np.ndarray:
@@ -50,3 +51,65 @@ def forward_kinematics(state: MachineState, config: KinematicConfig) -> Pose:
     T_spindle_from_tcp = _translation(0.0, 0.0, -state.tool_length_offset)
     T_mcs_from_tcp = T_mcs_from_spindle @ T_spindle_from_tcp
     return Pose(T_mcs_from_tcp)
+
+
+def _state_columns(states: np.ndarray) -> tuple:
+    """Return the X/Y/Z/tool-length columns of a structured state array.
+
+    Raises:
+        ValueError: If ``states`` lacks one of the ``MACHINE_STATE_DTYPE`` fields.
+    """
+
+    states = np.asarray(states)
+    names = states.dtype.names or ()
+    missing = [name for name in MACHINE_STATE_DTYPE.names if name not in names]
+    if missing:
+        raise ValueError(f"States are missing fields: {', '.join(missing)}")
+    return tuple(
+        np.asarray(states[name], dtype=np.float64).reshape(-1)
+        for name in MACHINE_STATE_DTYPE.names
+    )
+
+
+@profiled(SPAN_FK)
+def forward_kinematics_batch(states: np.ndarray, config: KinematicConfig) -> np.ndarray:
+    """Compute T_mcs_from_tcp for every state of a structured array at once.
+
+    Results are bitwise identical to calling ``forward_kinematics`` per
+    state; see ``core.state.machine_states`` to pack plain axis arrays.
+
+    Args:
+        states: (N,) array with the ``MACHINE_STATE_DTYPE`` fields.
+        config: Kinematic configuration (unused in Sprint 1).
+
+    Returns:
+        (N, 4, 4) homogeneous transforms.
+
+    Example:
+        transforms = forward_kinematics_batch(machine_states(xs, ys, zs, 10.0), config)
+    """
+
+    transforms = np.zeros((len(np.atleast_1d(states)), 4, 4))
+    transforms[:, [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+    transforms[:, :3, 3] = tcp_positions(states, config)
+    return transforms
+
+
+@profiled(SPAN_FK)
+def tcp_positions(states: np.ndarray, config: KinematicConfig) -> np.ndarray:
+    """Compute only the (N, 3) TCP positions in MCS for a structured state array.
+
+    This is the translation column of ``forward_kinematics_batch`` without
+    building the transforms.
+
+    Example:
+        points = tcp_positions(machine_states(xs, ys, zs, 10.0), config)
+    """
+
+    _ = config
+    x, y, z, tool_length_offset = _state_columns(states)
+    positions = np.empty((len(x), 3))
+    positions[:, 0] = x
+    positions[:, 1] = y
+    np.subtract(z, tool_length_offset, out=positions[:, 2])
+    return positions
@@ -0,0 +1 @@
+"""Qt-free stock models and cutter geometry for material removal."""
@@ -0,0 +1,200 @@
+"""Z-map stock model cut by sweeping cutter profiles along a toolpath."""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from .stock import TILE_CELLS, StockModel, tile_range
+from .tools import CutterProfile, lower_envelope
+
+
+def _slope(heights: np.ndarray, axis: int, spacing: float) -> np.ndarray:
+    """Central-difference slope along ``axis``, zero for a single cell."""
+
+    if heights.shape[axis] < 2:
+        return np.zeros_like(heights)
+    return np.gradient(heights, spacing, axis=axis)
+
+
+def _grid_triangles(grid: np.ndarray) -> np.ndarray:
+    """Two counter-clockwise triangles per quad of an (H, W, C) vertex grid."""
+
+    a, b = grid[:-1, :-1], grid[:-1, 1:]
+    c, d = grid[1:, 1:], grid[1:, :-1]
+    return np.stack([a, b, c, a, c, d], axis=2).reshape(-1, grid.shape[2])
+
+
+def _wall(top: np.ndarray, bottom: float, normal: Tuple[float, float, float]) -> np.ndarray:
+    """Vertical strip from a (N, 3) boundary polyline down to ``bottom``, facing ``normal``."""
+
+    strip = np.empty((2, len(top), 6), dtype=np.float32)
+    strip[:, :, :3] = top
+    strip[1, :, 2] = bottom
+    strip[:, :, 3:] = normal
+    if len(top) > 1:
+        edge = top[-1] - top[0]
+        facing = np.cross(edge, (0.0, 0.0, -1.0)) @ np.asarray(normal)
+        if facing < 0:
+            strip = strip[:, ::-1]
+    return _grid_triangles(strip)
+
+
+class Heightfield(StockModel):
+    """Stock block stored as one top surface height per XY grid cell.
+
+    Cutting a segment evaluates ``lower_envelope`` of the cutter over the
+    cells in the segment's bounding window with array operations.
+
+    Removed volume is accumulated as cells are lowered, and every touched
+    tile of ``TILE_CELLS`` x ``TILE_CELLS`` cells is flagged dirty until a
+    renderer collects it with ``take_dirty_tiles``.
+
+    Attributes:
+        heights: (rows, cols) float32 top surface Z per cell; row ``i`` and
+            column ``j`` cover ``y = low[1] + (i + 0.5) * cell`` and
+            ``x = low[0] + (j + 0.5) * cell``.
+
+    Example:
+        stock = Heightfield.from_stock(200.0, 100.0, 50.0, resolution=0.25)
+        stock.cut_toolpath(toolpath, CutterProfile(TOOL_FLAT, 10.0))
+        print(stock.removed_volume / 1000.0, "cm3")
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray, resolution: float) -> None:
+        super().__init__(low, high, resolution)
+        self._xs = self._cell_centers(0)
+        self._ys = self._cell_centers(1)
+        rows, cols = len(self._ys), len(self._xs)
+        self.heights = np.empty((rows, cols), dtype=np.float32)
+        self._dirty = np.zeros((-(-rows // TILE_CELLS), -(-cols // TILE_CELLS)), dtype=bool)
+        self.reset()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.heights.shape
+
+    @property
+    def tile_shape(self) -> Tuple[int, int]:
+        """Number of tile rows and columns."""
+
+        return self._dirty.shape
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.heights.nbytes + self._dirty.nbytes)
+
+    def cell_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the float32 X coordinates of columns and Y coordinates of rows."""
+
+        return self._xs, self._ys
+
+    def reset(self) -> None:
+        """Restore the uncut block and mark every tile dirty."""
+
+        self.heights.fill(self._high[2])
+        self._dirty.fill(True)
+        self._removed = 0.0
+
+    def take_dirty_tiles(self) -> np.ndarray:
+        """Return and clear the (K, 2) ``(tile_row, tile_col)`` indices changed since last call."""
+
+        tiles = np.argwhere(self._dirty)
+        self._dirty.fill(False)
+        return tiles
+
+    def tile_slices(self, tile_row: int, tile_col: int) -> Tuple[slice, slice]:
+        """Row and column slices of ``heights`` covered by a tile."""
+
+        row = tile_row * TILE_CELLS
+        col = tile_col * TILE_CELLS
+        return slice(row, row + TILE_CELLS), slice(col, col + TILE_CELLS)
+
+    def tile_mesh(self, tile_row: int, tile_col: int) -> np.ndarray:
+        """Return (N, 6) float32 triangle positions and normals of one tile.
+
+        Vertices sit on cell centers, with the outermost ones moved onto the
+        stock boundary, and each tile reaches one cell into its neighbours so
+        adjacent tiles share their seam. Normals come from central
+        differences, so they match across seams too. Tiles on the stock
+        boundary add the side walls down to the stock bottom.
+        """
+
+        rows, cols = self.heights.shape
+        r0, c0 = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+        r1, c1 = min(r0 + TILE_CELLS + 1, rows), min(c0 + TILE_CELLS + 1, cols)
+        xs = self._edge_coordinates(self._xs, 0)[c0:c1]
+        ys = self._edge_coordinates(self._ys, 1)[r0:r1]
+        height, width = r1 - r0, c1 - c0
+        pr0, pc0 = max(r0 - 1, 0), max(c0 - 1, 0)
+        padded = self.heights[pr0 : min(r1 + 1, rows), pc0 : min(c1 + 1, cols)]
+        crop = (slice(r0 - pr0, r0 - pr0 + height), slice(c0 - pc0, c0 - pc0 + width))
+
+        grid = np.empty((height, width, 6), dtype=np.float32)
+        grid[..., 0] = xs[None, :]
+        grid[..., 1] = ys[:, None]
+        grid[..., 2] = self.heights[r0:r1, c0:c1]
+        grid[..., 3] = -_slope(padded, 1, self._cell)[crop]
+        grid[..., 4] = -_slope(padded, 0, self._cell)[crop]
+        grid[..., 5] = 1.0
+        grid[..., 3:] /= np.linalg.norm(grid[..., 3:], axis=-1, keepdims=True)
+        parts = [_grid_triangles(grid)]
+        bottom = np.float32(self._low[2])
+        if r0 == 0:
+            parts.append(_wall(grid[0, :, :3], bottom, (0.0, -1.0, 0.0)))
+        if r1 == rows:
+            parts.append(_wall(grid[-1, :, :3], bottom, (0.0, 1.0, 0.0)))
+        if c0 == 0:
+            parts.append(_wall(grid[:, 0, :3], bottom, (-1.0, 0.0, 0.0)))
+        if c1 == cols:
+            parts.append(_wall(grid[:, -1, :3], bottom, (1.0, 0.0, 0.0)))
+        return np.concatenate(parts)
+
+    def _edge_coordinates(self, centers: np.ndarray, axis: int) -> np.ndarray:
+        """Cell centers with the first and last moved onto the stock boundary."""
+
+        edges = centers.copy()
+        edges[0] = self._low[axis]
+        edges[-1] = self._high[axis]
+        return edges
+
+    def cut_segment(self, start: np.ndarray, end: np.ndarray, cutter: CutterProfile) -> float:
+        """Sweep ``cutter`` with its tip moving from ``start`` to ``end``.
+
+        Args:
+            start: (3,) TCP position in MCS at the start of the move.
+            end: (3,) TCP position in MCS at the end of the move.
+            cutter: Cutter profile.
+
+        Returns:
+            Volume removed by this move in mm³.
+        """
+
+        ax, ay, az = (float(value) for value in start)
+        bx, by, bz = (float(value) for value in end)
+        lowest = min(az, bz)
+        if lowest >= self._high[2]:
+            return 0.0
+        radius = cutter.radius
+        rows, cols = self.heights.shape
+        c0, c1 = self._cell_range(0, min(ax, bx) - radius, max(ax, bx) + radius, cols)
+        r0, r1 = self._cell_range(1, min(ay, by) - radius, max(ay, by) + radius, rows)
+        if c0 >= c1 or r0 >= r1:
+            return 0.0
+        window = self.heights[r0:r1, c0:c1]
+        if lowest >= window.max():
+            return 0.0
+
+        rx = self._xs[c0:c1] - np.float32(ax)
+        ry = (self._ys[r0:r1] - np.float32(ay))[:, None]
+        reach = lower_envelope(cutter, rx, ry, (bx - ax, by - ay, bz - az), az)
+        np.maximum(reach, np.float32(self._low[2]), out=reach)
+
+        depth = window - reach
+        np.maximum(depth, 0.0, out=depth)
+        removed = float(depth.sum(dtype=np.float64)) * self._cell * self._cell
+        if removed > 0.0:
+            np.minimum(window, reach, out=window)
+            self._dirty[tile_range(r0, r1), tile_range(c0, c1)] = True
+            self._removed += removed
+        return removed
@@ -0,0 +1,191 @@
+"""Stock block placement and the cutting interface shared by stock models."""
+from __future__ import annotations
+
+import abc
+import math
+import time
+from typing import Mapping, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from core.toolpath import Toolpath
+
+from .tools import CutterProfile
+
+ZERO_TOP_CENTER = "Top Center"
+ZERO_TOP_LEFT = "Top Left"
+ZERO_BOTTOM_CENTER = "Bottom Center"
+ZERO_POINTS = (ZERO_TOP_CENTER, ZERO_TOP_LEFT, ZERO_BOTTOM_CENTER)
+
+DEFAULT_RESOLUTION = 0.5
+TILE_CELLS = 64
+
+StockType = TypeVar("StockType", bound="StockModel")
+
+
+def stock_bounds(
+    width: float, height: float, depth: float, zero_point: str = ZERO_TOP_CENTER
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the ``(low, high)`` corners of a stock block in MCS.
+
+    Width runs along X, height along Y and depth along Z. The zero point
+    names the stock point that sits at the program origin.
+
+    Raises:
+        ValueError: If the zero point is unknown or a dimension is not
+            positive.
+    """
+
+    if min(width, height, depth) <= 0:
+        raise ValueError("Stock dimensions must be positive.")
+    size = np.array([width, height, depth], dtype=np.float64)
+    if zero_point == ZERO_TOP_CENTER:
+        low = np.array([-width / 2.0, -height / 2.0, -depth])
+    elif zero_point == ZERO_TOP_LEFT:
+        low = np.array([0.0, -height, -depth])
+    elif zero_point == ZERO_BOTTOM_CENTER:
+        low = np.array([-width / 2.0, -height / 2.0, 0.0])
+    else:
+        raise ValueError(f"Unknown zero point '{zero_point}'.")
+    return low, low + size
+
+
+def tile_range(first: int, stop: int) -> slice:
+    """Tiles covering the cell range ``[first, stop)``."""
+
+    return slice(first // TILE_CELLS, (stop - 1) // TILE_CELLS + 1)
+
+
+class StockModel(abc.ABC):
+    """Axis-aligned stock block sampled on a regular grid of ``resolution`` mm.
+
+    Subclasses store the material and implement ``cut_segment``, ``reset``,
+    ``take_dirty_tiles`` and ``tile_mesh``; toolpath playback and creation
+    from the workpiece setup are shared. A tile is addressed by the row of
+    ``take_dirty_tiles`` that names it, and ``tile_mesh(*tile)`` returns its
+    (N, 6) float32 triangle positions and normals.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray, resolution: float) -> None:
+        if resolution <= 0:
+            raise ValueError("Resolution must be positive.")
+        self._low = np.asarray(low, dtype=np.float64)
+        self._high = np.asarray(high, dtype=np.float64)
+        self._cell = float(resolution)
+        self._removed = 0.0
+
+    @classmethod
+    def from_stock(
+        cls: type[StockType],
+        width: float,
+        height: float,
+        depth: float,
+        zero_point: str = ZERO_TOP_CENTER,
+        resolution: float = DEFAULT_RESOLUTION,
+    ) -> StockType:
+        """Create an uncut stock block; see ``stock_bounds`` for the axes."""
+
+        low, high = stock_bounds(width, height, depth, zero_point)
+        return cls(low, high, resolution)
+
+    @classmethod
+    def from_workpiece_parameters(
+        cls: type[StockType], params: Mapping[str, object]
+    ) -> StockType:
+        """Build the stock from ``WorkpieceTab.get_workpiece_parameters`` output."""
+
+        return cls.from_stock(
+            float(params["width"]),
+            float(params["height"]),
+            float(params["depth"]),
+            str(params.get("zero_point", ZERO_TOP_CENTER)),
+            float(params.get("resolution", DEFAULT_RESOLUTION)),
+        )
+
+    @property
+    def cell(self) -> float:
+        """Cell edge length in mm."""
+
+        return self._cell
+
+    @property
+    def low(self) -> np.ndarray:
+        """(3,) minimum corner of the stock in MCS."""
+
+        return self._low
+
+    @property
+    def high(self) -> np.ndarray:
+        """(3,) maximum corner of the uncut stock in MCS."""
+
+        return self._high
+
+    @property
+    def removed_volume(self) -> float:
+        """Material removed since the last reset in mm³."""
+
+        return self._removed
+
+    def _cell_centers(self, axis: int) -> np.ndarray:
+        count = max(int(round((self._high[axis] - self._low[axis]) / self._cell)), 1)
+        return (self._low[axis] + (np.arange(count) + 0.5) * self._cell).astype(np.float32)
+
+    def _cell_range(self, axis: int, low: float, high: float, count: int) -> Tuple[int, int]:
+        """Cells along ``axis`` whose extent overlaps ``[low, high]``, clamped."""
+
+        inverse = 1.0 / self._cell
+        first = max(math.floor((low - self._low[axis]) * inverse), 0)
+        stop = min(math.ceil((high - self._low[axis]) * inverse), count)
+        return first, stop
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Restore the uncut block and mark every tile dirty."""
+
+    @abc.abstractmethod
+    def take_dirty_tiles(self) -> np.ndarray:
+        """Return and clear the indices of the tiles changed since the last call."""
+
+    @abc.abstractmethod
+    def tile_mesh(self, *tile: int) -> np.ndarray:
+        """Return (N, 6) float32 triangle positions and normals of one tile."""
+
+    @abc.abstractmethod
+    def cut_segment(self, start: np.ndarray, end: np.ndarray, cutter: CutterProfile) -> float:
+        """Sweep ``cutter`` from ``start`` to ``end`` and return the removed volume in mm³."""
+
+    def cut_toolpath(
+        self,
+        toolpath: Toolpath,
+        cutter: CutterProfile,
+        start: int = 0,
+        stop: Optional[int] = None,
+        budget_seconds: Optional[float] = None,
+    ) -> int:
+        """Cut the segments ``[start, stop)`` of a toolpath in order.
+
+        Rapid moves cut like feed moves: a rapid through the stock is a
+        crash the simulation should show, not hide.
+
+        Args:
+            toolpath: Toolpath whose points are TCP positions in MCS.
+            cutter: Cutter profile.
+            start: First segment to cut.
+            stop: End of the range, defaults to all segments.
+            budget_seconds: Optional time limit; cutting stops after the
+                first segment that exceeds it so callers can resume later.
+
+        Returns:
+            Index of the first segment that was not cut.
+        """
+
+        stop = len(toolpath) if stop is None else min(stop, len(toolpath))
+        points = toolpath.points
+        deadline = None if budget_seconds is None else time.perf_counter() + budget_seconds
+        segment = start
+        while segment < stop:
+            self.cut_segment(points[segment], points[segment + 1], cutter)
+            segment += 1
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return segment
@@ -0,0 +1,150 @@
+"""Rotationally symmetric cutter profiles for material removal."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+
+TOOL_FLAT = "Flat Endmill"
+TOOL_BALL = "Ball Endmill"
+TOOL_DRILL = "Drill"
+TOOL_CHAMFER = "Chamfer"
+TOOL_TYPES = (TOOL_FLAT, TOOL_BALL, TOOL_DRILL, TOOL_CHAMFER)
+
+POINT_ANGLES = {TOOL_DRILL: 118.0, TOOL_CHAMFER: 90.0}
+
+
+@dataclass(frozen=True)
+class CutterProfile:
+    """Cutter silhouette as height above the tool tip over radial distance.
+
+    The tool tip is the lowest point of the cutter and coincides with the
+    TCP. ``offset`` gives, for a point at radial distance ``r`` from the
+    tool axis, how far above the tip the cutting surface is.
+
+    Attributes:
+        kind: One of ``TOOL_TYPES``.
+        diameter: Cutting diameter in mm.
+        point_angle: Included tip angle in degrees for drills and chamfer
+            mills, None for the ``POINT_ANGLES`` default. Ignored for
+            flat and ball cutters.
+
+    Example:
+        cutter = CutterProfile(TOOL_BALL, diameter=6.0)
+        heights = cutter.offset(np.array([0.0, 1.0, 2.0]) ** 2)
+    """
+
+    kind: str
+    diameter: float
+    point_angle: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in TOOL_TYPES:
+            raise ValueError(f"Unknown tool type '{self.kind}'.")
+        if self.diameter <= 0:
+            raise ValueError("Tool diameter must be positive.")
+        if self.point_angle is not None and not 0 < self.point_angle < 180:
+            raise ValueError("Point angle must be between 0 and 180 degrees.")
+
+    @classmethod
+    def from_tool_parameters(cls, params: Mapping[str, float | str]) -> CutterProfile:
+        """Build a profile from ``ToolTab.get_tool_parameters`` output."""
+
+        return cls(str(params["type"]), float(params["diameter"]))
+
+    @property
+    def radius(self) -> float:
+        return self.diameter / 2.0
+
+    def offset(self, distance_squared: np.ndarray) -> np.ndarray:
+        """Cutting surface height above the tip, inf outside the cutter.
+
+        Args:
+            distance_squared: Squared radial distances from the tool axis.
+                Squares are taken so callers skip a square root for flat
+                cutters.
+
+        Returns:
+            Array of the same shape and dtype as the input.
+        """
+
+        distance_squared = np.asarray(distance_squared)
+        radius_squared = self.radius**2
+        inside = distance_squared <= radius_squared
+        if self.kind == TOOL_FLAT:
+            height = np.zeros_like(distance_squared)
+        elif self.kind == TOOL_BALL:
+            height = self.radius - np.sqrt(np.maximum(radius_squared - distance_squared, 0))
+        else:
+            angle = self.point_angle or POINT_ANGLES[self.kind]
+            slope = 1.0 / math.tan(math.radians(angle / 2.0))
+            height = np.sqrt(distance_squared) * distance_squared.dtype.type(slope)
+        return np.where(inside, height, distance_squared.dtype.type(np.inf))
+
+    def radius_at(self, height: np.ndarray) -> np.ndarray:
+        """Cutter radius at ``height`` above the tip, NaN below the tip.
+
+        This is the inverse of ``offset``: the cross section of the cutter
+        at a given height is a disc of this radius.
+        """
+
+        height = np.asarray(height)
+        radius = height.dtype.type(self.radius)
+        if self.kind == TOOL_FLAT:
+            section = np.full_like(height, radius)
+        elif self.kind == TOOL_BALL:
+            rise = np.minimum(height, radius)
+            section = np.sqrt(np.maximum(rise * (2 * radius - rise), 0))
+        else:
+            angle = self.point_angle or POINT_ANGLES[self.kind]
+            slope = math.tan(math.radians(angle / 2.0))
+            section = np.minimum(height * height.dtype.type(slope), radius)
+        return np.where(height >= 0, section, height.dtype.type(np.nan))
+
+
+def lower_envelope(
+    cutter: CutterProfile,
+    rx: np.ndarray,
+    ry: np.ndarray,
+    delta: Tuple[float, float, float],
+    start_z: float,
+) -> np.ndarray:
+    """Lowest height the cutter reaches over grid cells while moving along a segment.
+
+    For every cell the closest point on the XY projection of the segment
+    gives the tool position, and the profile at that distance gives the
+    height the tool reaches. Ramps also stamp their lower end so the
+    envelope never sits above the deepest tool position.
+
+    Args:
+        cutter: Cutter profile.
+        rx: (W,) float32 cell X minus the segment start X.
+        ry: (H, 1) float32 cell Y minus the segment start Y.
+        delta: Segment end minus start.
+        start_z: Tip Z at the segment start.
+
+    Returns:
+        (H, W) float32 tip-relative surface heights, inf where the cutter
+        never passes over a cell.
+    """
+
+    dx, dy, dz = (float(value) for value in delta)
+    lowest = np.float32(min(start_z, start_z + dz))
+    length_squared = dx * dx + dy * dy
+    if length_squared <= 1e-12:
+        return cutter.offset(rx * rx + ry * ry) + lowest
+    along = rx * np.float32(dx / length_squared) + ry * np.float32(dy / length_squared)
+    np.clip(along, 0.0, 1.0, out=along)
+    ex = rx - along * np.float32(dx)
+    ey = ry - along * np.float32(dy)
+    reach = cutter.offset(ex * ex + ey * ey)
+    if not dz:
+        reach += np.float32(start_z)
+        return reach
+    reach += along * np.float32(dz)
+    reach += np.float32(start_z)
+    lx, ly = (rx, ry) if dz > 0 else (rx - np.float32(dx), ry - np.float32(dy))
+    np.minimum(reach, cutter.offset(lx * lx + ly * ly) + lowest, out=reach)
+    return reach
@@ -0,0 +1,322 @@
+"""Tri-dexel stock model: material intervals along rays in X, Y and Z."""
+from __future__ import annotations
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from .stock import TILE_CELLS, StockModel, tile_range
+from .tools import CutterProfile, lower_envelope
+
+AXIS_X, AXIS_Y, AXIS_Z = 0, 1, 2
+
+# Row and column axes of the ray grid of every ray direction. Z rays use the
+# heightfield layout (rows along Y, columns along X).
+RAY_GRID_AXES = {AXIS_X: (AXIS_Z, AXIS_Y), AXIS_Y: (AXIS_Z, AXIS_X), AXIS_Z: (AXIS_Y, AXIS_X)}
+
+INITIAL_INTERVALS = 2
+
+_QUAD_CORNERS = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]], dtype=np.float32)
+_QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3])
+
+
+def capsule_span(
+    start: Tuple[float, float],
+    delta: Tuple[float, float],
+    radius: np.ndarray,
+    offset: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Intersect rays along ``u`` with discs of ``radius`` swept along a segment.
+
+    The sweep is convex, so each ray at ``v = offset`` meets it in one
+    interval. Its upper end maximizes ``u(t) + sqrt(r² - (offset - v(t))²)``
+    over the segment parameter ``t``; the function is concave, so the
+    maximum is the stationary point clipped to the valid ``t`` range.
+
+    Args:
+        start: Segment start ``(u, v)``.
+        delta: Segment end minus start.
+        radius: Disc radius, broadcast against ``offset``; NaN means no disc.
+        offset: Ray positions along ``v``.
+
+    Returns:
+        ``(low, high)`` arrays along ``u``; ``low`` is inf where a ray
+        misses the sweep.
+    """
+
+    au, av = start
+    du, dv = delta
+    gap = offset - np.float32(av)
+    if abs(dv) > 1e-9:
+        first = (gap - radius) * np.float32(1.0 / dv)
+        last = (gap + radius) * np.float32(1.0 / dv)
+        t_low = np.clip(np.minimum(first, last), 0.0, 1.0)
+        t_high = np.clip(np.maximum(first, last), 0.0, 1.0)
+        missed = (np.minimum(first, last) > 1.0) | (np.maximum(first, last) < 0.0)
+        turn = radius * np.float32(math.copysign(abs(du), du * dv) / math.hypot(du, dv))
+        t_max = np.clip((gap + turn) * np.float32(1.0 / dv), t_low, t_high)
+        t_min = np.clip((gap - turn) * np.float32(1.0 / dv), t_low, t_high)
+    else:
+        zeros = np.zeros(np.broadcast(gap, radius).shape, dtype=np.float32)
+        t_low, t_high = zeros, zeros + 1.0
+        t_max, t_min = (t_high, t_low) if du >= 0 else (t_low, t_high)
+        missed = ~(np.abs(gap) <= radius)
+
+    def half_chord(t: np.ndarray) -> np.ndarray:
+        across = gap - t * np.float32(dv)
+        return np.sqrt(np.maximum(radius * radius - across * across, 0.0))
+
+    def along(t: np.ndarray) -> np.ndarray:
+        return np.float32(au) + t * np.float32(du)
+
+    high = np.maximum.reduce(
+        [along(t) + half_chord(t) for t in (t_low, t_high, t_max)]
+    )
+    low = np.minimum.reduce(
+        [along(t) - half_chord(t) for t in (t_low, t_high, t_min)]
+    )
+    missed |= np.isnan(low)
+    low[missed] = np.inf
+    high[missed] = np.inf
+    return low, high
+
+
+def _lengths(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Interval lengths, 0 for unused slots."""
+
+    return np.subtract(ends, starts, out=np.zeros_like(ends), where=starts < ends)
+
+
+class TriDexel(StockModel):
+    """Stock stored as material intervals along three orthogonal ray grids.
+
+    Every ray keeps a short sorted list of ``[enter, exit)`` material
+    intervals, so walls are exact along the rays that cross them instead of
+    quantized to the cell size, and pockets opening sideways stay
+    representable. Memory grows with the three faces of the grid, i.e. with
+    the square of the resolution like a heightfield, not with its cube like
+    a voxel grid.
+
+    Cutting subtracts the swept cutter from every ray. Z rays use the
+    heightfield ``lower_envelope``; X and Y rays intersect horizontal
+    cross-sections of the cutter swept along the segment. Ramps are split
+    into pieces of at most one cell of height, each evaluated at its
+    higher end, plus the exact cutter at the lower end.
+
+    Removed volume is integrated along the Z rays. Touched tiles are kept
+    per ray grid; ``tile_mesh`` turns a tile into one quad per interval end.
+
+    Example:
+        stock = TriDexel.from_stock(200.0, 100.0, 50.0, resolution=0.5)
+        stock.cut_toolpath(toolpath, CutterProfile(TOOL_BALL, 6.0))
+        for axis, row, col in stock.take_dirty_tiles():
+            vertices = stock.tile_mesh(axis, row, col)
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray, resolution: float) -> None:
+        super().__init__(low, high, resolution)
+        self._centers = [self._cell_centers(axis) for axis in range(3)]
+        self._start: List[np.ndarray] = []
+        self._end: List[np.ndarray] = []
+        self._dirty: List[np.ndarray] = []
+        for axis in range(3):
+            rows, cols = (len(self._centers[grid]) for grid in RAY_GRID_AXES[axis])
+            self._start.append(np.empty((rows, cols, INITIAL_INTERVALS), dtype=np.float32))
+            self._end.append(np.empty((rows, cols, INITIAL_INTERVALS), dtype=np.float32))
+            tiles = (-(-rows // TILE_CELLS), -(-cols // TILE_CELLS))
+            self._dirty.append(np.zeros(tiles, dtype=bool))
+        self.reset()
+
+    @property
+    def nbytes(self) -> int:
+        arrays = self._start + self._end + self._dirty
+        return int(sum(array.nbytes for array in arrays))
+
+    def intervals(self, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(enter, exit)`` arrays of shape (rows, cols, K) for a ray grid.
+
+        Unused slots hold inf in both arrays; used slots are sorted.
+        """
+
+        return self._start[axis], self._end[axis]
+
+    def ray_centers(self, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Coordinates of the ray grid rows and columns of ``axis``."""
+
+        row_axis, col_axis = RAY_GRID_AXES[axis]
+        return self._centers[row_axis], self._centers[col_axis]
+
+    def reset(self) -> None:
+        """Restore the uncut block and mark every tile dirty."""
+
+        for axis in range(3):
+            rows, cols, _ = self._start[axis].shape
+            self._start[axis] = np.full((rows, cols, INITIAL_INTERVALS), np.inf, np.float32)
+            self._end[axis] = np.full((rows, cols, INITIAL_INTERVALS), np.inf, np.float32)
+            self._start[axis][..., 0] = self._low[axis]
+            self._end[axis][..., 0] = self._high[axis]
+            self._dirty[axis].fill(True)
+        self._removed = 0.0
+
+    def take_dirty_tiles(self) -> np.ndarray:
+        """Return and clear the (K, 3) ``(axis, tile_row, tile_col)`` dirty tiles."""
+
+        tiles = []
+        for axis, dirty in enumerate(self._dirty):
+            found = np.argwhere(dirty)
+            tiles.append(np.column_stack([np.full(len(found), axis), found]))
+            dirty.fill(False)
+        return np.concatenate(tiles).astype(np.intp)
+
+    def tile_mesh(self, axis: int, tile_row: int, tile_col: int) -> np.ndarray:
+        """Return (N, 6) float32 triangle positions and normals of one tile.
+
+        Every interval end becomes a cell-sized quad facing out of the
+        material along the ray; drawn together, the quads of the three ray
+        grids cover the stock surface.
+        """
+
+        row_axis, col_axis = RAY_GRID_AXES[axis]
+        rows = slice(tile_row * TILE_CELLS, (tile_row + 1) * TILE_CELLS)
+        cols = slice(tile_col * TILE_CELLS, (tile_col + 1) * TILE_CELLS)
+        starts = self._start[axis][rows, cols]
+        ends = self._end[axis][rows, cols]
+        row_index, col_index, slot = np.nonzero(starts < ends)
+        row_values = self._centers[row_axis][rows][row_index]
+        col_values = self._centers[col_axis][cols][col_index]
+        handed = np.cross(np.eye(3)[row_axis], np.eye(3)[col_axis])[axis]
+
+        cells = (row_index, col_index, slot)
+        faces = ((starts[cells], -1.0), (ends[cells], 1.0))
+        parts = []
+        for values, sign in faces:
+            corners = _QUAD_CORNERS if sign * handed > 0 else _QUAD_CORNERS[::-1]
+            corners = corners[_QUAD_TRIANGLES] * np.float32(self._cell)
+            vertices = np.zeros((len(values), len(corners), 6), dtype=np.float32)
+            vertices[..., axis] = values[:, None]
+            vertices[..., row_axis] = row_values[:, None] + corners[:, 0]
+            vertices[..., col_axis] = col_values[:, None] + corners[:, 1]
+            vertices[..., 3 + axis] = sign
+            parts.append(vertices.reshape(-1, 6))
+        return np.concatenate(parts)
+
+    def cut_segment(self, start: np.ndarray, end: np.ndarray, cutter: CutterProfile) -> float:
+        """Subtract ``cutter`` swept from ``start`` to ``end`` from all three ray grids.
+
+        Returns:
+            Volume removed by this move in mm³.
+        """
+
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        if min(start[2], end[2]) >= self._high[2]:
+            return 0.0
+        removed = self._cut_z_rays(start, end, cutter)
+        for low_end, high_end, level in self._horizontal_pieces(start, end):
+            for axis in (AXIS_X, AXIS_Y):
+                self._cut_side_rays(axis, low_end, high_end, level, cutter)
+        self._removed += removed
+        return removed
+
+    def _horizontal_pieces(self, start: np.ndarray, end: np.ndarray):
+        """Yield ``(start_xy, end_xy, tip_z)`` pieces approximating the move from above."""
+
+        lower = start if start[2] <= end[2] else end
+        if start[2] != end[2] or np.hypot(*(end[:2] - start[:2])) <= 1e-9:
+            yield lower[:2], lower[:2], float(lower[2])
+            if np.hypot(*(end[:2] - start[:2])) <= 1e-9:
+                return
+        pieces = max(int(math.ceil(abs(end[2] - start[2]) / self._cell)), 1)
+        fractions = np.linspace(0.0, 1.0, pieces + 1)
+        path = start + fractions[:, None] * (end - start)
+        for first, last in zip(path[:-1], path[1:]):
+            yield first[:2], last[:2], float(max(first[2], last[2]))
+
+    def _cut_z_rays(self, start: np.ndarray, end: np.ndarray, cutter: CutterProfile) -> float:
+        low = np.minimum(start, end) - cutter.radius
+        high = np.maximum(start, end) + cutter.radius
+        xs, ys = self._centers[AXIS_X], self._centers[AXIS_Y]
+        c0, c1 = self._cell_range(AXIS_X, low[0], high[0], len(xs))
+        r0, r1 = self._cell_range(AXIS_Y, low[1], high[1], len(ys))
+        if c0 >= c1 or r0 >= r1:
+            return 0.0
+        rx = xs[c0:c1] - np.float32(start[0])
+        ry = (ys[r0:r1] - np.float32(start[1]))[:, None]
+        reach = lower_envelope(cutter, rx, ry, tuple(end - start), float(start[2]))
+        removed = self._subtract(AXIS_Z, (r0, r1, c0, c1), reach, np.full_like(reach, np.inf))
+        return removed * self._cell * self._cell
+
+    def _cut_side_rays(
+        self,
+        axis: int,
+        first: np.ndarray,
+        last: np.ndarray,
+        level: float,
+        cutter: CutterProfile,
+    ) -> None:
+        across = AXIS_Y if axis == AXIS_X else AXIS_X
+        zs, offsets = self._centers[AXIS_Z], self._centers[across]
+        radius = cutter.radius
+        r0, r1 = self._cell_range(AXIS_Z, level, self._high[2], len(zs))
+        low, high = min(first[across], last[across]), max(first[across], last[across])
+        c0, c1 = self._cell_range(across, low - radius, high + radius, len(offsets))
+        if c0 >= c1 or r0 >= r1:
+            return
+        section = cutter.radius_at(zs[r0:r1] - np.float32(level))[:, None]
+        enter, leave = capsule_span(
+            (first[axis], first[across]),
+            (last[axis] - first[axis], last[across] - first[across]),
+            section,
+            offsets[c0:c1][None, :],
+        )
+        self._subtract(axis, (r0, r1, c0, c1), enter, leave)
+
+    def _subtract(
+        self, axis: int, window: Tuple[int, int, int, int], low: np.ndarray, high: np.ndarray
+    ) -> float:
+        """Remove ``[low, high)`` from the rays of a grid window.
+
+        Rays where ``low`` is inf are left alone. Intervals split by a cut
+        grow the slot count of the whole grid when a ray runs out of slots.
+
+        Returns:
+            Total interval length removed, in mm.
+        """
+
+        r0, r1, c0, c1 = window
+        starts = self._start[axis][r0:r1, c0:c1]
+        ends = self._end[axis][r0:r1, c0:c1]
+        low = low[..., None]
+        high = high[..., None]
+        touched = (starts < high) & (ends > low) & (starts < ends)
+        if not touched.any():
+            return 0.0
+
+        before = _lengths(starts, ends).sum(dtype=np.float64)
+        left_end = np.minimum(ends, low)
+        right_start = np.maximum(starts, high)
+        pieces_start = np.concatenate([starts, right_start], axis=-1)
+        pieces_end = np.concatenate([left_end, ends], axis=-1)
+        valid = pieces_start < pieces_end
+        after = _lengths(pieces_start, pieces_end).sum(dtype=np.float64)
+        pieces_start[~valid] = np.inf
+        pieces_end[~valid] = np.inf
+        order = np.argsort(pieces_start, axis=-1, kind="stable")
+        pieces_start = np.take_along_axis(pieces_start, order, axis=-1)
+        pieces_end = np.take_along_axis(pieces_end, order, axis=-1)
+
+        slots = self._start[axis].shape[2]
+        needed = int(valid.sum(axis=-1).max())
+        if needed > slots:
+            self._grow(axis, needed)
+        self._start[axis][r0:r1, c0:c1] = pieces_start[..., : max(needed, slots)]
+        self._end[axis][r0:r1, c0:c1] = pieces_end[..., : max(needed, slots)]
+        self._dirty[axis][tile_range(r0, r1), tile_range(c0, c1)] = True
+        return float(before - after)
+
+    def _grow(self, axis: int, slots: int) -> None:
+        for arrays in (self._start, self._end):
+            grid = arrays[axis]
+            extra = np.full(grid.shape[:2] + (slots - grid.shape[2],), np.inf, np.float32)
+            arrays[axis] = np.concatenate([grid, extra], axis=-1)
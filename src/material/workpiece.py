@@ -0,0 +1,29 @@
+"""Stock model selection for the workpiece setup."""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Type
+
+from .heightfield import Heightfield
+from .stock import StockModel
+from .tridexel import TriDexel
+
+STOCK_HEIGHTFIELD = "Heightfield"
+STOCK_TRIDEXEL = "Tri-dexel"
+STOCK_MODELS: Dict[str, Type[StockModel]] = {
+    STOCK_HEIGHTFIELD: Heightfield,
+    STOCK_TRIDEXEL: TriDexel,
+}
+
+
+def create_stock(params: Mapping[str, object]) -> StockModel:
+    """Build the stock model named by ``params["model"]`` from the workpiece setup.
+
+    Raises:
+        ValueError: If the model is unknown or the dimensions are invalid.
+    """
+
+    name = str(params.get("model", STOCK_HEIGHTFIELD))
+    model = STOCK_MODELS.get(name)
+    if model is None:
+        raise ValueError(f"Unknown stock model '{name}'.")
+    return model.from_workpiece_parameters(params)
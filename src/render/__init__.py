@@ -0,0 +1 @@
+"""Qt-free geometry and buffer layouts for the OpenGL viewport."""
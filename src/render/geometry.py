@@ -0,0 +1,173 @@
+"""Static machine and grid geometry packed for vertex buffer upload."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+MOTION_GROUPS = ("base", "gantry", "carriage", "spindle")
+
+VERTEX_COMPONENTS = 9
+VERTEX_STRIDE = VERTEX_COMPONENTS * 4
+NORMAL_OFFSET = 3 * 4
+COLOR_OFFSET = 6 * 4
+
+_BOX_CORNERS = np.array(
+    [
+        [-1, -1, 0],
+        [1, -1, 0],
+        [1, 1, 0],
+        [-1, 1, 0],
+        [-1, -1, 1],
+        [1, -1, 1],
+        [1, 1, 1],
+        [-1, 1, 1],
+    ],
+    dtype=np.float32,
+)
+_BOX_FACES = np.array(
+    [
+        [0, 3, 2, 1],
+        [4, 5, 6, 7],
+        [0, 1, 5, 4],
+        [2, 3, 7, 6],
+        [0, 4, 7, 3],
+        [1, 2, 6, 5],
+    ]
+)
+_BOX_NORMALS = np.array(
+    [[0, 0, -1], [0, 0, 1], [0, -1, 0], [0, 1, 0], [-1, 0, 0], [1, 0, 0]],
+    dtype=np.float32,
+)
+_QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3])
+
+
+@dataclass(frozen=True)
+class MachineComponent:
+    """Box-shaped machine part.
+
+    Attributes:
+        name: Component name, e.g. "bridge".
+        group: Motion group from ``MOTION_GROUPS`` the part moves with.
+        size: Width (X), depth (Y) and height (Z) in mm.
+        origin: Center of the bottom face in the group frame, in mm.
+        color: RGB color in the 0..1 range.
+
+    Example:
+        MachineComponent("column", "gantry", (120, 120, 300), (-300, 0, 60), (0.35, 0.36, 0.4))
+    """
+
+    name: str
+    group: str
+    size: Tuple[float, float, float]
+    origin: Tuple[float, float, float]
+    color: Tuple[float, float, float]
+
+
+GANTRY_MILL = (
+    MachineComponent("base", "base", (800, 500, 60), (0, 0, 0), (0.3, 0.32, 0.36)),
+    MachineComponent("left_column", "gantry", (120, 120, 300), (-300, 0, 60), (0.35, 0.36, 0.4)),
+    MachineComponent("right_column", "gantry", (120, 120, 300), (300, 0, 60), (0.35, 0.36, 0.4)),
+    MachineComponent("bridge", "gantry", (720, 140, 80), (0, 0, 340), (0.4, 0.42, 0.46)),
+    MachineComponent("carriage", "carriage", (200, 160, 80), (0, 0, 380), (0.25, 0.5, 0.7)),
+    MachineComponent("head", "carriage", (180, 140, 60), (0, 0, 460), (0.25, 0.6, 0.6)),
+    MachineComponent("spindle", "spindle", (60, 60, 180), (0, 0, 460), (0.8, 0.4, 0.3)),
+)
+
+
+@dataclass(frozen=True, eq=False)
+class MachineMesh:
+    """Interleaved triangle vertices grouped by motion group.
+
+    Attributes:
+        vertices: (N, 9) float32 rows of position, normal and color.
+        ranges: ``group -> (first, count)`` vertex ranges, contiguous per group.
+
+    Example:
+        mesh = build_machine_mesh(GANTRY_MILL)
+        first, count = mesh.ranges["spindle"]
+    """
+
+    vertices: np.ndarray
+    ranges: Dict[str, Tuple[int, int]]
+
+
+def box_triangles(size: Sequence[float], origin: Sequence[float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+    """Return (36, 6) float32 positions and normals of a box.
+
+    Args:
+        size: Width (X), depth (Y) and height (Z).
+        origin: Center of the bottom face.
+
+    Returns:
+        Triangle list vertices with outward normals, counter-clockwise.
+    """
+
+    scale = np.array([size[0] / 2.0, size[1] / 2.0, size[2]], dtype=np.float32)
+    corners = _BOX_CORNERS * scale + np.asarray(origin, dtype=np.float32)
+    positions = corners[_BOX_FACES[:, _QUAD_TRIANGLES]].reshape(-1, 3)
+    normals = np.repeat(_BOX_NORMALS, len(_QUAD_TRIANGLES), axis=0)
+    return np.hstack([positions, normals])
+
+
+def build_machine_mesh(components: Iterable[MachineComponent]) -> MachineMesh:
+    """Pack components into one vertex array ordered by motion group.
+
+    Args:
+        components: Machine parts; each group becomes one contiguous range.
+
+    Returns:
+        MachineMesh ready for a single buffer upload.
+
+    Raises:
+        ValueError: If a component names an unknown motion group.
+    """
+
+    components = list(components)
+    for component in components:
+        if component.group not in MOTION_GROUPS:
+            raise ValueError(f"Unknown motion group '{component.group}'.")
+    parts = []
+    ranges: Dict[str, Tuple[int, int]] = {}
+    first = 0
+    for group in MOTION_GROUPS:
+        members = [component for component in components if component.group == group]
+        for component in members:
+            triangles = box_triangles(component.size, component.origin)
+            color = np.broadcast_to(np.asarray(component.color, np.float32), (len(triangles), 3))
+            parts.append(np.hstack([triangles, color]))
+        count = 36 * len(members)
+        ranges[group] = (first, count)
+        first += count
+    if not parts:
+        return MachineMesh(np.zeros((0, VERTEX_COMPONENTS), np.float32), ranges)
+    return MachineMesh(np.ascontiguousarray(np.vstack(parts), dtype=np.float32), ranges)
+
+
+def group_offsets(x: float, y: float, z: float) -> Dict[str, Tuple[float, float, float]]:
+    """Translation of every motion group for the given axis positions.
+
+    The gantry travels in Y, the carriage in X on the gantry and the
+    spindle is offset by ``-z`` on the carriage.
+    """
+
+    return {
+        "base": (0.0, 0.0, 0.0),
+        "gantry": (0.0, y, 0.0),
+        "carriage": (x, y, 0.0),
+        "spindle": (x, y, -z),
+    }
+
+
+def grid_lines(extent: float = 500.0, spacing: float = 50.0) -> np.ndarray:
+    """Return (M, 3) float32 endpoints of a square XY grid drawn as GL_LINES."""
+
+    ticks = np.arange(-extent, extent + spacing / 2.0, spacing, dtype=np.float32)
+    count = len(ticks)
+    lines = np.zeros((2 * count, 2, 3), np.float32)
+    lines[:count, :, 0] = ticks[:, None]
+    lines[:count, :, 1] = (-extent, extent)
+    lines[count:, :, 0] = (-extent, extent)
+    lines[count:, :, 1] = ticks[:, None]
+    return lines.reshape(-1, 3)
@@ -0,0 +1,74 @@
+"""Incremental stock surface meshing for the viewport."""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from material.stock import StockModel
+
+STOCK_COLOR = (0.72, 0.74, 0.78)
+STOCK_VERTEX_STRIDE = 6 * 4
+STOCK_NORMAL_OFFSET = 3 * 4
+
+TileKey = Tuple[int, ...]
+
+
+class StockMesher:
+    """Re-mesh only the stock tiles touched by cuts, within a time budget.
+
+    Dirty tiles are collected from the stock into an ordered pending set,
+    so a tile cut again before it was meshed is meshed once. Each update
+    meshes pending tiles until the budget is spent and leaves the rest for
+    the next frame; at least one tile is meshed per update so a small
+    budget still makes progress.
+
+    Example:
+        mesher = StockMesher(stock)
+        for key, vertices in mesher.update(budget_seconds=0.004):
+            upload(key, vertices)
+    """
+
+    def __init__(self, stock: StockModel) -> None:
+        self._stock = stock
+        self._pending: Dict[TileKey, None] = {}
+
+    @property
+    def stock(self) -> StockModel:
+        return self._stock
+
+    @property
+    def pending(self) -> int:
+        """Number of tiles waiting to be meshed."""
+
+        return len(self._pending)
+
+    def collect(self) -> None:
+        for tile in self._stock.take_dirty_tiles():
+            self._pending[tuple(int(index) for index in tile)] = None
+
+    def invalidate(self, keys: List[TileKey]) -> None:
+        """Queue tiles again, e.g. after their buffers were lost."""
+
+        for key in keys:
+            self._pending[key] = None
+
+    def update(self, budget_seconds: float) -> List[Tuple[TileKey, np.ndarray]]:
+        """Mesh pending tiles until ``budget_seconds`` have passed.
+
+        Returns:
+            ``(tile, vertices)`` pairs of (N, 6) float32 triangle positions
+            and normals; an empty array means the tile holds no surface.
+        """
+
+        self.collect()
+        deadline = time.perf_counter() + budget_seconds
+        meshed = []
+        while self._pending:
+            key = next(iter(self._pending))
+            del self._pending[key]
+            meshed.append((key, np.ascontiguousarray(self._stock.tile_mesh(*key))))
+            if time.perf_counter() >= deadline:
+                break
+        return meshed
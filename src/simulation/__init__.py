@@ -0,0 +1 @@
+"""Simulation engine: clock, timing and playback state."""
@@ -0,0 +1,262 @@
+"""Headless batch simulation of G-code programs for CI and nightly checks.
+
+Runs the same Qt-free pipeline as the application: compile, cycle time,
+travel limits through the kinematic chain, and material removal. Files are
+simulated in parallel worker processes and reported as JSON.
+
+Example:
+    python main.py simulate parts/*.nc --config machine.json --output report.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.state import KinematicConfig
+from diagnostics.profiling import SPAN_REMOVAL, span
+from gcode.reader import GCodeFile
+from kinematics.chain import KinematicChain
+from material.tools import CutterProfile
+from material.workpiece import create_stock
+
+from .cache import ProgramCache, cache_key, source_digest
+from .cycle_time import MachineLimits
+from .machine import (
+    DEFAULT_AXES,
+    DEFAULT_TOOL,
+    DEFAULT_WORKPIECE,
+    AxisConfig,
+    InputValidator,
+    ValidationError,
+)
+from .pipeline import compile_file, compile_gcode
+
+
+@dataclass(frozen=True)
+class BatchSetup:
+    """Machine, tool and stock shared by every program of a batch.
+
+    Attributes:
+        axes: Axis configuration as in the machine tab.
+        tool: Tool parameters as in the tool tab.
+        workpiece: Workpiece parameters as in the workpiece tab.
+        cut: Whether to simulate material removal.
+        use_cache: Whether to read and write ``ProgramCache`` entries.
+
+    Example:
+        setup = BatchSetup.from_file(Path("machine.json"))
+    """
+
+    axes: Tuple[AxisConfig, ...] = DEFAULT_AXES
+    tool: Optional[Mapping[str, Any]] = None
+    workpiece: Optional[Mapping[str, Any]] = None
+    cut: bool = True
+    use_cache: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tool", {**DEFAULT_TOOL, **(self.tool or {})})
+        object.__setattr__(self, "workpiece", {**DEFAULT_WORKPIECE, **(self.workpiece or {})})
+
+    @classmethod
+    def from_file(cls, path: Optional[Path], **options: bool) -> BatchSetup:
+        """Read a JSON setup with optional ``axes``, ``tool`` and ``workpiece`` keys.
+
+        Missing keys keep the application defaults.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If it is not valid JSON.
+        """
+
+        if path is None:
+            return cls(**options)
+        values = json.loads(Path(path).read_text(encoding="utf-8"))
+        axes = tuple(AxisConfig.from_mapping(axis) for axis in values.get("axes", ()))
+        return cls(
+            axes=axes or DEFAULT_AXES,
+            tool=values.get("tool"),
+            workpiece=values.get("workpiece"),
+            **options,
+        )
+
+    def validate(self) -> None:
+        """Raise ``ValidationError`` for setups the application would reject."""
+
+        for axis in self.axes:
+            InputValidator.validate_axis_limits(axis.minimum, axis.maximum)
+        InputValidator.validate_tool_parameters(
+            {name: float(self.tool[name]) for name in ("diameter", "length", "cutting_length")}
+        )
+
+
+def travel_violations(
+    points: np.ndarray, lines: np.ndarray, setup: BatchSetup
+) -> Dict[str, Dict[str, float]]:
+    """Report active axes whose travel limits the toolpath exceeds.
+
+    TCP points are turned into joint positions by the kinematic chain of
+    the axis configuration, with the tool length offset of the setup.
+
+    Returns:
+        ``{axis: {"count", "first_line", "minimum", "maximum"}}`` for every
+        violated axis; ``first_line`` is one-based.
+    """
+
+    chain = KinematicChain(KinematicConfig.from_axis_config(setup.axes))
+    joints = chain.inverse(points, tool_length_offset=float(setup.tool["length"]))
+    limits = {axis.name: axis for axis in setup.axes if axis.active}
+    violations = {}
+    for column, name in enumerate(chain.axis_names):
+        axis = limits.get(name)
+        if axis is None:
+            continue
+        values = joints[:, column]
+        outside = (values < axis.minimum) | (values > axis.maximum)
+        if not outside.any():
+            continue
+        first = int(np.argmax(outside))
+        violations[name] = {
+            "count": int(outside.sum()),
+            "first_line": int(lines[max(first - 1, 0)]) + 1 if len(lines) else 0,
+            "minimum": float(values.min()),
+            "maximum": float(values.max()),
+        }
+    return violations
+
+
+def _unsupported(lines: np.ndarray) -> Dict[str, int]:
+    """Count of blocks the interpreter could not simulate, ``first_line`` one-based."""
+
+    return {"count": len(lines), "first_line": int(lines[0]) + 1 if len(lines) else 0}
+
+
+def simulate_file(path: Path, setup: BatchSetup) -> Dict[str, Any]:
+    """Simulate one program and return its JSON-serializable report.
+
+    Errors are reported in the ``error`` field instead of raised so one
+    broken program does not stop a batch.
+    """
+
+    report: Dict[str, Any] = {"path": str(path)}
+    try:
+        setup.validate()
+        limits = MachineLimits.from_axis_config(setup.axes)
+        began = time.perf_counter()
+        if setup.use_cache:
+            cache = ProgramCache.beside(path)
+            with GCodeFile.open(path) as source:
+                key = cache_key(source_digest(source), limits)
+                compiled = cache.load(key)
+                if compiled is None:
+                    compiled = compile_gcode(source.iter_chunks(), source.size, limits)
+                    cache.store(key, compiled)
+        else:
+            compiled = compile_file(path, limits)
+        compile_seconds = time.perf_counter() - began
+        toolpath = compiled.toolpath
+        segments = len(toolpath)
+        report.update(
+            segments=segments,
+            lines=compiled.line_count,
+            cycle_time=toolpath.total_time,
+            path_length=toolpath.total_length,
+            unsupported=_unsupported(compiled.program.unsupported_lines),
+            violations=travel_violations(toolpath.points, toolpath.line, setup),
+        )
+
+        cut_seconds = 0.0
+        if setup.cut:
+            stock = create_stock(setup.workpiece)
+            began = time.perf_counter()
+            with span(SPAN_REMOVAL):
+                stock.cut_toolpath(toolpath, CutterProfile.from_tool_parameters(setup.tool))
+            cut_seconds = time.perf_counter() - began
+            report["removed_volume"] = stock.removed_volume
+        report["timings"] = {"compile": compile_seconds, "cut": cut_seconds}
+        report["segments_per_second"] = {
+            "compile": segments / compile_seconds if compile_seconds else 0.0,
+            "cut": segments / cut_seconds if cut_seconds else 0.0,
+        }
+    except (OSError, ValueError, ValidationError, MemoryError) as exc:
+        report["error"] = str(exc)
+    return report
+
+
+def run_batch(
+    paths: Sequence[Path], setup: BatchSetup, workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Simulate programs in a process pool, returning reports in input order."""
+
+    if workers == 1 or len(paths) <= 1:
+        return [simulate_file(path, setup) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(simulate_file, paths, [setup] * len(paths)))
+
+
+def _summary(report: Dict[str, Any]) -> str:
+    if "error" in report:
+        return f"{report['path']}: error: {report['error']}"
+    rates = report["segments_per_second"]
+    violated = ", ".join(sorted(report["violations"])) or "none"
+    return (
+        f"{report['path']}: {report['segments']:,} segments, cycle {report['cycle_time']:.1f} s, "
+        f"compile {rates['compile']:,.0f} seg/s, cut {rates['cut']:,.0f} seg/s, "
+        f"limit violations: {violated}"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point.
+
+    Returns:
+        0 if every program simulated within the travel limits, 1 if any
+        failed or violated a limit, 2 for an unusable setup file.
+    """
+
+    parser = argparse.ArgumentParser(prog="simulate", description=__doc__.splitlines()[0])
+    parser.add_argument("programs", type=Path, nargs="+")
+    parser.add_argument("--config", type=Path, help="JSON with axes, tool and workpiece.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-cut", action="store_true", help="Skip material removal.")
+    parser.add_argument("--cache", action="store_true", help="Use the compiled program cache.")
+    args = parser.parse_args(argv)
+
+    try:
+        setup = BatchSetup.from_file(args.config, cut=not args.no_cut, use_cache=args.cache)
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"simulate: cannot read {args.config}: {exc}", file=sys.stderr)
+        return 2
+
+    began = time.perf_counter()
+    reports = run_batch(args.programs, setup, args.workers)
+    elapsed = time.perf_counter() - began
+    for report in reports:
+        print(_summary(report), file=sys.stderr)
+    segments = sum(report.get("segments", 0) for report in reports)
+    print(
+        f"{len(reports)} programs, {segments:,} segments in {elapsed:.2f} s "
+        f"({segments / elapsed if elapsed else 0.0:,.0f} segments/s)",
+        file=sys.stderr,
+    )
+
+    document = json.dumps({"reports": reports, "elapsed": elapsed}, indent=2)
+    if args.output is None:
+        print(document)
+    else:
+        args.output.write_text(document, encoding="utf-8")
+    failed = any("error" in report or report["violations"] for report in reports)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+"""Persistent cache of compiled programs as memory-mappable arrays.
+
+Each entry is a directory of ``.npy`` files plus ``meta.json``, named by a
+key that hashes the program content, ``COMPILER_VERSION`` and the machine
+configuration the program was compiled for. Loading maps every array
+read-only with ``np.load(mmap_mode="r")``, so reopening a large job costs a
+few file opens instead of the whole pipeline.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from core.toolpath import Toolpath
+from core.toolpath_lod import ToolpathLod
+from gcode.interpreter import InterpretedProgram, ModalRuns
+from gcode.reader import GCodeFile
+
+from .pipeline import (
+    COMPILER_VERSION,
+    STAGE_DIGEST,
+    CancelCheck,
+    CompiledProgram,
+    LoadCancelled,
+    ProgressCallback,
+)
+
+CACHE_DIRNAME = ".toolpath-cache"
+CACHE_FORMAT = 1
+DEFAULT_CACHE_BYTES = 2 * 1024**3
+
+_META = "meta.json"
+_TOOLPATH_FIELDS = ("points", "feed", "motion", "line", "cum_length", "cum_time")
+_LOD_FIELDS = ("vertices", "source_index", "level_first", "level_count", "cell_size")
+_MODAL_FIELDS = ("block", "line", "value")
+
+
+def source_digest(
+    source: GCodeFile,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None,
+) -> str:
+    """Return the BLAKE2b hex digest of a program's bytes.
+
+    Hashing reads the whole file, so it reports ``STAGE_DIGEST`` progress
+    and polls ``cancelled`` once per chunk like ``compile_gcode``.
+
+    Raises:
+        LoadCancelled: If ``cancelled`` returns True.
+    """
+
+    digest = hashlib.blake2b(digest_size=20)
+    hashed = 0
+    for chunk in source.iter_chunks():
+        if cancelled is not None and cancelled():
+            raise LoadCancelled()
+        digest.update(chunk)
+        hashed += len(chunk)
+        if progress is not None:
+            progress(STAGE_DIGEST, hashed, source.size)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str, *config: object) -> str:
+    """Combine a content digest with the compiler version and configuration.
+
+    Args:
+        digest: Program content digest from ``source_digest``.
+        config: Objects whose ``repr`` describes everything the compiled
+            result depends on, e.g. ``MachineLimits`` and ``KinematicConfig``.
+
+    Returns:
+        Hex key naming the cache entry.
+    """
+
+    key = hashlib.blake2b(digest_size=20)
+    key.update(f"{CACHE_FORMAT}:{COMPILER_VERSION}:{digest}".encode())
+    for item in config:
+        key.update(repr(item).encode())
+    return key.hexdigest()
+
+
+def _arrays(compiled: CompiledProgram) -> Dict[str, np.ndarray]:
+    toolpath = compiled.toolpath
+    arrays = {f"toolpath_{name}": getattr(toolpath, name) for name in _TOOLPATH_FIELDS}
+    arrays["program_cum_time"] = compiled.program.toolpath.cum_time
+    arrays["program_block_lines"] = compiled.program.block_lines
+    arrays["program_unsupported_lines"] = compiled.program.unsupported_lines
+    for group, runs in compiled.program.modal.items():
+        for name in _MODAL_FIELDS:
+            arrays[f"modal_{group}_{name}"] = getattr(runs, name)
+    for name in _LOD_FIELDS:
+        arrays[f"preview_{name}"] = getattr(compiled.preview, name)
+    return arrays
+
+
+class ProgramCache:
+    """Directory of compiled programs with size-bounded LRU eviction.
+
+    An entry's modification time records its last use; storing an entry
+    evicts the least recently used ones until the directory fits in
+    ``max_bytes``. Entries are written to a temporary directory and renamed
+    into place, so a crash never leaves a half-written entry behind.
+
+    Example:
+        cache = ProgramCache.beside(path)
+        key = cache_key(source_digest(source), limits)
+        compiled = cache.load(key)
+        if compiled is None:
+            compiled = compile_gcode(source.iter_chunks(), source.size, limits)
+            cache.store(key, compiled)
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+
+    @classmethod
+    def beside(cls, program: Path, max_bytes: int = DEFAULT_CACHE_BYTES) -> ProgramCache:
+        """Cache kept in ``CACHE_DIRNAME`` next to the program file."""
+
+        return cls(Path(program).parent / CACHE_DIRNAME, max_bytes)
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def entries(self) -> Iterable[Path]:
+        if not self._directory.is_dir():
+            return []
+        return [path for path in self._directory.iterdir() if (path / _META).is_file()]
+
+    @staticmethod
+    def entry_bytes(entry: Path) -> int:
+        return sum(path.stat().st_size for path in entry.iterdir())
+
+    def load(self, key: str) -> Optional[CompiledProgram]:
+        """Map a cached program read-only, or return None on a miss.
+
+        Unreadable or outdated entries count as misses.
+        """
+
+        entry = self._directory / key
+        try:
+            meta = json.loads((entry / _META).read_text())
+            if meta.get("format") != CACHE_FORMAT:
+                return None
+            arrays = {
+                name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]
+            }
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        toolpath = Toolpath(*(arrays[f"toolpath_{name}"] for name in _TOOLPATH_FIELDS))
+        modal = {
+            group: ModalRuns(*(arrays[f"modal_{group}_{name}"] for name in _MODAL_FIELDS))
+            for group in meta["modal"]
+        }
+        program = InterpretedProgram(
+            toolpath=Toolpath(
+                toolpath.points,
+                toolpath.feed,
+                toolpath.motion,
+                toolpath.line,
+                toolpath.cum_length,
+                arrays["program_cum_time"],
+            ),
+            block_lines=arrays["program_block_lines"],
+            modal=modal,
+            unsupported_lines=arrays["program_unsupported_lines"],
+        )
+        preview = ToolpathLod(*(arrays[f"preview_{name}"] for name in _LOD_FIELDS))
+        return CompiledProgram(
+            program=program,
+            toolpath=toolpath,
+            preview=preview,
+            source_bytes=int(meta["source_bytes"]),
+            line_count=int(meta["line_count"]),
+        )
+
+    def store(self, key: str, compiled: CompiledProgram) -> bool:
+        """Write a compiled program and evict old entries.
+
+        Returns:
+            False if the cache directory cannot be written, e.g. next to a
+            program on read-only media; the program itself is unaffected.
+        """
+
+        arrays = _arrays(compiled)
+        meta = {
+            "format": CACHE_FORMAT,
+            "compiler": COMPILER_VERSION,
+            "source_bytes": compiled.source_bytes,
+            "line_count": compiled.line_count,
+            "modal": list(compiled.program.modal),
+            "arrays": list(arrays),
+            "created": time.time(),
+        }
+        staging = self._directory / f".{key}.{uuid.uuid4().hex}"
+        try:
+            staging.mkdir(parents=True)
+            for name, array in arrays.items():
+                np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+            (staging / _META).write_text(json.dumps(meta))
+            entry = self._directory / key
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = []
+        for entry in self.entries():
+            try:
+                entries.append((entry.stat().st_mtime, entry, self.entry_bytes(entry)))
+            except OSError:
+                continue
+        total = sum(size for _, _, size in entries)
+        for _, entry, size in sorted(entries, key=lambda item: item[0]):
+            if total <= self._max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
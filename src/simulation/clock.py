@@ -0,0 +1,106 @@
+"""Machine-time simulation clock for toolpath playback."""
+from __future__ import annotations
+
+import numpy as np
+
+from core.toolpath import Toolpath
+
+
+class SimulationClock:
+    """Advance machine time by wall-clock deltas and locate the tool.
+
+    Playback cost per frame is a binary search over ``Toolpath.cum_time``
+    plus one interpolation, independent of how many segments a frame
+    covers.
+
+    Example:
+        clock = SimulationClock(toolpath, speed=10.0)
+        clock.advance(0.016)
+        position = clock.position()
+    """
+
+    def __init__(self, toolpath: Toolpath, speed: float = 1.0) -> None:
+        self._toolpath = toolpath
+        self._speed = speed
+        self._machine_time = 0.0
+
+    @property
+    def toolpath(self) -> Toolpath:
+        return self._toolpath
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("Simulation speed must be positive.")
+        self._speed = float(value)
+
+    @property
+    def machine_time(self) -> float:
+        """Elapsed machine time in seconds."""
+
+        return self._machine_time
+
+    @property
+    def duration(self) -> float:
+        """Total machine time of the program in seconds."""
+
+        return self._toolpath.total_time
+
+    @property
+    def finished(self) -> bool:
+        return self._machine_time >= self.duration
+
+    def advance(self, wall_seconds: float) -> float:
+        """Advance by ``wall_seconds`` of real time scaled by the speed factor.
+
+        Args:
+            wall_seconds: Wall-clock time elapsed since the previous frame.
+
+        Returns:
+            New machine time in seconds, clamped to the program duration.
+        """
+
+        return self.seek(self._machine_time + max(wall_seconds, 0.0) * self._speed)
+
+    def seek(self, machine_time: float) -> float:
+        """Jump to ``machine_time`` seconds, clamped to the program duration."""
+
+        self._machine_time = min(max(float(machine_time), 0.0), self.duration)
+        return self._machine_time
+
+    def locate(self) -> tuple[int, float]:
+        """Return the active segment and the fraction of it already executed.
+
+        Returns:
+            Tuple ``(segment, fraction)``. Once the program has finished the
+            segment equals the segment count and the fraction is 0.
+        """
+
+        cum_time = self._toolpath.cum_time
+        count = len(cum_time)
+        if not count or self.finished:
+            return count, 0.0
+        segment = int(np.searchsorted(cum_time, self._machine_time, side="right"))
+        segment_start = float(cum_time[segment - 1]) if segment else 0.0
+        duration = float(cum_time[segment]) - segment_start
+        if duration <= 0.0:
+            return segment, 1.0
+        return segment, (self._machine_time - segment_start) / duration
+
+    def completed_segments(self) -> int:
+        """Number of segments fully executed at the current machine time."""
+
+        return self.locate()[0]
+
+    def position(self) -> np.ndarray:
+        """Interpolated (3,) tool position at the current machine time."""
+
+        segment, fraction = self.locate()
+        points = self._toolpath.points
+        if segment >= len(points) - 1:
+            return points[-1].copy()
+        return points[segment] + (points[segment + 1] - points[segment]) * fraction
@@ -0,0 +1,197 @@
+"""Feed- and acceleration-aware cycle time estimation.
+
+The estimator plans a look-ahead velocity profile over the whole toolpath
+with vectorized passes only:
+
+1. Per-segment cruise speed and acceleration are limited by the per-axis
+   rapid rates and accelerations projected onto the segment direction.
+2. Junction speeds follow the junction-deviation model used by common
+   motion controllers.
+3. The forward (acceleration) and backward (deceleration) look-ahead
+   passes are min-plus recurrences on squared speed, which reduce to a
+   cumulative sum plus ``np.minimum.accumulate``.
+4. Each segment then gets a trapezoidal profile; acceleration phases are
+   stretched by the S-curve jerk limit.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from core.toolpath import MOTION_RAPID, Toolpath
+
+_AXES = ("X", "Y", "Z")
+_STRAIGHT_JUNCTION = 1.0 - 1e-9
+
+
+@dataclass(frozen=True)
+class MachineLimits:
+    """Per-axis motion limits used for cycle time planning.
+
+    Attributes:
+        max_velocity: X/Y/Z rapid rates in mm/min.
+        max_acceleration: X/Y/Z accelerations in mm/s^2.
+        max_jerk: X/Y/Z jerk limits in mm/s^3.
+        junction_deviation: Allowed path deviation at corners in mm.
+
+    Example:
+        limits = MachineLimits(max_velocity=(15000.0, 15000.0, 8000.0))
+    """
+
+    max_velocity: Sequence[float] = (10000.0, 10000.0, 10000.0)
+    max_acceleration: Sequence[float] = (1000.0, 1000.0, 1000.0)
+    max_jerk: Sequence[float] = (20000.0, 20000.0, 20000.0)
+    junction_deviation: float = 0.01
+
+    @classmethod
+    def from_axis_config(cls, axes: Iterable) -> MachineLimits:
+        """Build limits from ``AxisConfig``-like objects for X, Y and Z.
+
+        Axes that are missing or inactive keep the default limits.
+
+        Args:
+            axes: Objects exposing ``name``, ``active``, ``max_velocity``,
+                ``max_acceleration`` and ``max_jerk``.
+
+        Returns:
+            MachineLimits for the linear axes.
+        """
+
+        defaults = cls()
+        velocity = list(defaults.max_velocity)
+        acceleration = list(defaults.max_acceleration)
+        jerk = list(defaults.max_jerk)
+        for axis in axes:
+            if axis.name in _AXES and axis.active:
+                index = _AXES.index(axis.name)
+                velocity[index] = axis.max_velocity
+                acceleration[index] = axis.max_acceleration
+                jerk[index] = axis.max_jerk
+        return cls(tuple(velocity), tuple(acceleration), tuple(jerk))
+
+
+@dataclass(frozen=True, eq=False)
+class CycleTimeEstimate:
+    """Planned segment timing.
+
+    Attributes:
+        segment_times: (N,) segment durations in seconds.
+        cum_time: (N,) machine time at the end of every segment.
+        junction_speeds: (N + 1,) planned speed at every vertex in mm/s.
+
+    Example:
+        estimate = estimate_cycle_time(toolpath)
+        toolpath = toolpath.with_segment_times(estimate.segment_times)
+    """
+
+    segment_times: np.ndarray
+    cum_time: np.ndarray
+    junction_speeds: np.ndarray
+
+    @property
+    def total_time(self) -> float:
+        return float(self.cum_time[-1]) if len(self.cum_time) else 0.0
+
+
+def _directional_limit(limits: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    """Project per-axis limits onto unit directions (minimum over axes)."""
+
+    magnitude = np.abs(direction)
+    projected = np.divide(
+        limits, magnitude, out=np.full_like(magnitude, np.inf), where=magnitude > 0
+    )
+    return projected.min(axis=1)
+
+
+def _phase_times(delta_v: np.ndarray, accel: np.ndarray, jerk: np.ndarray) -> np.ndarray:
+    """Duration of an S-curve speed change of ``delta_v``."""
+
+    delta_v = np.maximum(delta_v, 0.0)
+    full = delta_v / accel + accel / jerk
+    short = 2.0 * np.sqrt(delta_v / jerk)
+    return np.where(delta_v >= accel * accel / jerk, full, short)
+
+
+def _look_ahead(junction_sq: np.ndarray, reach_sq: np.ndarray) -> np.ndarray:
+    """Limit squared junction speeds by forward and backward reachability.
+
+    ``reach_sq[i] = 2 * a_i * L_i`` is the squared-speed change segment ``i``
+    allows. Both passes solve ``w[k+1] = min(J[k+1], w[k] + reach[k])``.
+    """
+
+    forward_sum = np.concatenate(([0.0], np.cumsum(reach_sq)))
+    forward = forward_sum + np.minimum.accumulate(junction_sq - forward_sum)
+    backward_sum = forward_sum[-1] - forward_sum
+    backward = backward_sum + np.minimum.accumulate((junction_sq - backward_sum)[::-1])[::-1]
+    return np.maximum(np.minimum(forward, backward), 0.0)
+
+
+def estimate_cycle_time(
+    toolpath: Toolpath, limits: MachineLimits | None = None
+) -> CycleTimeEstimate:
+    """Estimate per-segment machining time for a whole toolpath.
+
+    Feed moves run at their programmed F word, rapids at the fastest speed
+    the axis rapid rates allow along the move. Feed moves without a
+    programmed feed fall back to the axis limits. Zero-length segments take
+    no time and do not interrupt the velocity profile.
+
+    Args:
+        toolpath: Resolved toolpath.
+        limits: Machine limits, defaults to ``MachineLimits()``.
+
+    Returns:
+        CycleTimeEstimate with per-segment and cumulative times.
+
+    Example:
+        estimate = estimate_cycle_time(toolpath, MachineLimits.from_axis_config(axes))
+        print(estimate.total_time)
+    """
+
+    limits = limits or MachineLimits()
+    count = len(toolpath)
+    segment_times = np.zeros(count)
+    vertex_speeds = np.zeros(count + 1)
+
+    delta = np.diff(toolpath.points, axis=0)
+    lengths = np.linalg.norm(delta, axis=1)
+    moving = np.flatnonzero(lengths > 0.0)
+    if not len(moving):
+        return CycleTimeEstimate(segment_times, np.cumsum(segment_times), vertex_speeds)
+
+    length = lengths[moving]
+    direction = delta[moving] / length[:, None]
+    axis_speed = _directional_limit(np.asarray(limits.max_velocity) / 60.0, direction)
+    accel = _directional_limit(np.asarray(limits.max_acceleration, dtype=float), direction)
+    jerk = _directional_limit(np.asarray(limits.max_jerk, dtype=float), direction)
+    feed = toolpath.feed[moving] / 60.0
+    rapid = toolpath.motion[moving] == MOTION_RAPID
+    cruise = np.where(rapid | (feed <= 0.0), axis_speed, np.minimum(feed, axis_speed))
+
+    cos_theta = -np.einsum("ij,ij->i", direction[:-1], direction[1:])
+    sin_half = np.sqrt(np.clip(0.5 * (1.0 - cos_theta), 0.0, 1.0))
+    corner_accel = np.minimum(accel[:-1], accel[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corner_sq = corner_accel * limits.junction_deviation * sin_half / (1.0 - sin_half)
+    corner_sq = np.where(cos_theta > _STRAIGHT_JUNCTION, 0.0, corner_sq)
+    corner_sq = np.where(cos_theta < -_STRAIGHT_JUNCTION, np.inf, corner_sq)
+    junction_sq = np.concatenate(
+        ([0.0], np.minimum(corner_sq, np.minimum(cruise[:-1], cruise[1:]) ** 2), [0.0])
+    )
+    junction_sq = _look_ahead(junction_sq, 2.0 * accel * length)
+
+    entry = np.sqrt(junction_sq[:-1])
+    exit_ = np.sqrt(junction_sq[1:])
+    peak_sq = 0.5 * (2.0 * accel * length + junction_sq[:-1] + junction_sq[1:])
+    peak = np.sqrt(np.minimum(cruise * cruise, peak_sq))
+    accel_time = _phase_times(peak - entry, accel, jerk)
+    decel_time = _phase_times(peak - exit_, accel, jerk)
+    ramp_distance = 0.5 * (entry + peak) * accel_time + 0.5 * (exit_ + peak) * decel_time
+    cruise_time = np.maximum(length - ramp_distance, 0.0) / peak
+
+    segment_times[moving] = accel_time + cruise_time + decel_time
+    vertex_speeds[moving] = entry
+    vertex_speeds[moving + 1] = exit_
+    return CycleTimeEstimate(segment_times, np.cumsum(segment_times), vertex_speeds)
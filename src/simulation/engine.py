@@ -0,0 +1,397 @@
+"""Qt-free simulation engine with a plain callback observer API.
+
+``SimulationEngine`` owns the machine setup, the compiled program, the
+simulation clock and the stock. It never schedules itself: a driver calls
+``tick`` (or ``step`` with an explicit interval) while ``running`` is True,
+e.g. a ``QTimer`` in the UI or a plain loop in batch runs and benchmarks.
+
+Observers subscribe to events named after the controller signals and are
+called synchronously with the same arguments.
+
+Example:
+    engine = SimulationEngine()
+    engine.subscribe(EVENT_MACHINE_STATE, lambda state: print(state.completed_segments))
+    engine.load_gcode_text(text)
+    engine.start()
+    while engine.running:
+        engine.step(0.016)
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.toolpath import Toolpath
+from core.toolpath_lod import ToolpathLod
+from diagnostics.profiling import SPAN_REMOVAL, SPAN_STEP, profiled, span
+from gcode.interpreter import InterpretedProgram
+from gcode.reader import GCodeFile
+from material.stock import StockModel
+from material.tools import TOOL_FLAT, CutterProfile
+from material.workpiece import create_stock
+
+from .clock import SimulationClock
+from .cycle_time import MachineLimits, estimate_cycle_time
+from .machine import AxisConfig, InputValidator, ValidationError
+from .pipeline import CompiledProgram, compile_gcode
+
+CUT_BUDGET_SECONDS = 0.008
+
+EVENT_STARTED = "simulation_started"
+EVENT_PAUSED = "simulation_paused"
+EVENT_STOPPED = "simulation_stopped"
+EVENT_MACHINE_STATE = "machine_state_changed"
+EVENT_ERROR = "error_occurred"
+EVENT_WORKPIECE = "workpiece_updated"
+EVENT_TOOL = "tool_changed"
+EVENT_GCODE_LOADED = "gcode_loaded"
+EVENT_CYCLE_TIME = "cycle_time_estimated"
+EVENT_MATERIAL_REMOVED = "material_removed"
+ENGINE_EVENTS = (
+    EVENT_STARTED,
+    EVENT_PAUSED,
+    EVENT_STOPPED,
+    EVENT_MACHINE_STATE,
+    EVENT_ERROR,
+    EVENT_WORKPIECE,
+    EVENT_TOOL,
+    EVENT_GCODE_LOADED,
+    EVENT_CYCLE_TIME,
+    EVENT_MATERIAL_REMOVED,
+)
+
+Observer = Callable[..., None]
+
+
+@dataclass(frozen=True, slots=True)
+class MachineSnapshot:
+    """Axis positions and playback progress at one instant.
+
+    Attributes:
+        axes: Names of the active axes, e.g. ``("X", "Y", "Z")``.
+        positions: Axis positions in the order of ``axes``.
+        completed_segments: Segments fully executed by the clock.
+        total_segments: Segments of the loaded program.
+        line: Zero-based source line being executed, -1 without a program.
+        remaining_time: Machine seconds left in the program.
+
+    Example:
+        engine.subscribe(EVENT_MACHINE_STATE, lambda state: print(dict(state.items())))
+    """
+
+    axes: Tuple[str, ...]
+    positions: Tuple[float, ...]
+    completed_segments: int = 0
+    total_segments: int = 0
+    line: int = -1
+    remaining_time: float = 0.0
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        return zip(self.axes, self.positions)
+
+    def position(self, axis: str, default: float = 0.0) -> float:
+        try:
+            return self.positions[self.axes.index(axis)]
+        except ValueError:
+            return default
+
+
+class SimulationEngine:
+    """Machine setup, program playback and material removal without Qt.
+
+    Events and their arguments:
+
+    - ``simulation_started``, ``simulation_paused``, ``simulation_stopped``,
+      ``workpiece_updated``, ``tool_changed``: none.
+    - ``machine_state_changed``: ``MachineSnapshot`` after every step, stop
+      and axis change.
+    - ``error_occurred``: title and message.
+    - ``gcode_loaded``: block count.
+    - ``cycle_time_estimated``: planned cycle time in seconds.
+    - ``material_removed``: removed volume in mm³.
+    """
+
+    def __init__(self) -> None:
+        self._observers: Dict[str, List[Observer]] = {name: [] for name in ENGINE_EVENTS}
+        self._axis_config: List[AxisConfig] = []
+        self._tool_params: Dict[str, float | str] = {}
+        self._workpiece_params: Dict[str, float | str] = {}
+        self._stock: Optional[StockModel] = None
+        self._cutter = CutterProfile(TOOL_FLAT, 10.0)
+        self._cut_segments = 0
+        self._source = GCodeFile.from_text("")
+        self._program: Optional[InterpretedProgram] = None
+        self._toolpath = Toolpath.empty()
+        self._preview = ToolpathLod.empty()
+        self._axis_positions: Dict[str, float] = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self._clock = SimulationClock(self._toolpath)
+        self._running = False
+        self._last_tick = 0.0
+        self._steps = 0
+
+    def subscribe(self, event: str, observer: Observer) -> None:
+        """Call ``observer`` with the event arguments whenever ``event`` fires.
+
+        Raises:
+            KeyError: If ``event`` is not one of ``ENGINE_EVENTS``.
+        """
+
+        self._observers[event].append(observer)
+
+    def unsubscribe(self, event: str, observer: Observer) -> None:
+        self._observers[event].remove(observer)
+
+    def _emit(self, event: str, *args) -> None:
+        for observer in self._observers[event]:
+            observer(*args)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def step_count(self) -> int:
+        """Steps taken since the engine was created, for step rate metrics."""
+
+        return self._steps
+
+    def apply_axis_configuration(self, config: List[AxisConfig]) -> None:
+        try:
+            for axis in config:
+                InputValidator.validate_axis_limits(axis.minimum, axis.maximum)
+            self._axis_config = config
+            self._emit_machine_state()
+            if len(self._toolpath):
+                self.analyze_cycle_time()
+        except ValidationError as exc:
+            self._emit(EVENT_ERROR, "Validation", str(exc))
+
+    def set_axis_position(self, axis: str, value: float) -> None:
+        if axis in self._axis_positions:
+            self._axis_positions[axis] = value
+            self._emit_machine_state()
+
+    def apply_tool_parameters(self, params: Dict[str, float | str]) -> None:
+        try:
+            InputValidator.validate_tool_parameters(
+                {
+                    "diameter": float(params["diameter"]),
+                    "length": float(params["length"]),
+                    "cutting_length": float(params["cutting_length"]),
+                }
+            )
+            cutter = CutterProfile.from_tool_parameters(params)
+        except (ValidationError, ValueError) as exc:
+            self._emit(EVENT_ERROR, "Validation", str(exc))
+            return
+        self._tool_params = params
+        self._cutter = cutter
+        self._emit(EVENT_TOOL)
+
+    def create_workpiece(self, params: Dict[str, float | str]) -> None:
+        """Replace the stock with an uncut block sized from the workpiece setup."""
+
+        try:
+            stock = create_stock(params)
+        except ValueError as exc:
+            self._emit(EVENT_ERROR, "Validation", str(exc))
+            return
+        self._workpiece_params = params
+        self._stock = stock
+        self._cut_segments = 0
+        self._emit(EVENT_WORKPIECE)
+        self._emit(EVENT_MATERIAL_REMOVED, 0.0)
+
+    def load_gcode_text(self, text: str) -> None:
+        source = GCodeFile.from_text(text)
+        compiled = compile_gcode(source.iter_chunks(), source.size, self.machine_limits())
+        self.set_program(source, compiled)
+
+    def set_program(self, source: GCodeFile, compiled: CompiledProgram) -> None:
+        """Adopt a compiled program and the source it was built from.
+
+        The previous source is closed; the engine owns ``source`` from now on.
+        """
+
+        self._source.close()
+        self._source = source
+        self._program = compiled.program
+        self._toolpath = compiled.toolpath
+        self._preview = compiled.preview
+        self._clock = SimulationClock(self._toolpath, self._clock.speed)
+        self._reset_stock()
+        self._emit(EVENT_GCODE_LOADED, self._program.block_count)
+        self._emit(EVENT_CYCLE_TIME, self._toolpath.total_time)
+        unsupported = self._program.unsupported_lines
+        if len(unsupported):
+            self._emit(
+                EVENT_ERROR,
+                "G-code",
+                f"{len(unsupported)} unsupported blocks were not simulated, "
+                f"the first on line {int(unsupported[0]) + 1}.",
+            )
+
+    def close(self) -> None:
+        self._running = False
+        self._source.close()
+
+    def analyze_cycle_time(self) -> None:
+        completed = self._clock.completed_segments()
+        self._set_toolpath(self._toolpath)
+        if completed:
+            self._clock.seek(self._toolpath.cum_time[completed - 1])
+        self._emit(EVENT_CYCLE_TIME, self._toolpath.total_time)
+
+    def cycle_time(self) -> float:
+        return self._toolpath.total_time
+
+    def remaining_time(self) -> float:
+        return self._clock.duration - self._clock.machine_time
+
+    def machine_limits(self) -> MachineLimits:
+        return MachineLimits.from_axis_config(self._axis_config)
+
+    def _set_toolpath(self, toolpath: Toolpath) -> None:
+        estimate = estimate_cycle_time(toolpath, self.machine_limits())
+        self._toolpath = toolpath.with_segment_times(estimate.segment_times)
+        self._clock = SimulationClock(self._toolpath, self._clock.speed)
+
+    def start(self, speed: float = 1.0) -> None:
+        if not len(self._toolpath):
+            self._emit(EVENT_ERROR, "Simulation", "Load G-code before starting.")
+            return
+        self.set_speed(speed)
+        if not self._running:
+            self._running = True
+            self._last_tick = time.perf_counter()
+            self._emit(EVENT_STARTED)
+
+    def set_speed(self, speed: float) -> None:
+        try:
+            self._clock.speed = speed
+        except ValueError as exc:
+            self._emit(EVENT_ERROR, "Simulation", str(exc))
+
+    def pause(self) -> None:
+        if self._running:
+            self._running = False
+            self._emit(EVENT_PAUSED)
+
+    def stop(self) -> None:
+        self._running = False
+        self._clock.seek(0.0)
+        self._emit(EVENT_STOPPED)
+        self._emit_machine_state()
+
+    def tick(self) -> None:
+        """Advance by the wall time since the previous tick."""
+
+        now = time.perf_counter()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        self.step(elapsed)
+
+    @profiled(SPAN_STEP)
+    def step(self, elapsed: float) -> None:
+        """Advance the simulation by ``elapsed`` wall seconds and cut behind it.
+
+        Once the clock has finished, further steps only let cutting catch up
+        and stop the simulation when it has.
+        """
+
+        self._steps += 1
+        if self._clock.finished:
+            if not self._cut_material():
+                self.stop()
+            return
+        self._clock.advance(elapsed)
+        x, y, z = self._clock.position()
+        self._axis_positions.update({"X": float(x), "Y": float(y), "Z": float(z)})
+        self._emit_machine_state()
+        self._cut_material()
+
+    def seek(self, machine_time: float) -> None:
+        self._clock.seek(machine_time)
+
+    def _cut_material(self) -> bool:
+        """Cut the segments executed since the last frame within the frame budget.
+
+        Returns:
+            True while cutting lags behind the clock.
+        """
+
+        if self._stock is None:
+            return False
+        completed = self._clock.completed_segments()
+        if completed < self._cut_segments:
+            self._reset_stock()
+        if self._cut_segments < completed:
+            with span(SPAN_REMOVAL):
+                self._cut_segments = self._stock.cut_toolpath(
+                    self._toolpath,
+                    self._cutter,
+                    self._cut_segments,
+                    completed,
+                    CUT_BUDGET_SECONDS,
+                )
+            self._emit(EVENT_MATERIAL_REMOVED, self._stock.removed_volume)
+        return self._cut_segments < completed
+
+    def _reset_stock(self) -> None:
+        self._cut_segments = 0
+        if self._stock is not None:
+            self._stock.reset()
+            self._emit(EVENT_MATERIAL_REMOVED, 0.0)
+
+    def _emit_machine_state(self) -> None:
+        positions = dict(self._axis_positions)
+        for axis in self._axis_config:
+            if not axis.active:
+                positions.pop(axis.name, None)
+            else:
+                positions.setdefault(axis.name, 0.0)
+        if not positions:
+            positions = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self._emit(EVENT_MACHINE_STATE, self.snapshot(positions))
+
+    def snapshot(self, positions: Optional[Dict[str, float]] = None) -> MachineSnapshot:
+        """Current state; ``positions`` defaults to every known axis."""
+
+        positions = self._axis_positions if positions is None else positions
+        return MachineSnapshot(
+            tuple(positions),
+            tuple(positions.values()),
+            self._clock.completed_segments(),
+            len(self._toolpath),
+            self.current_line(),
+            self.remaining_time(),
+        )
+
+    def gcode_source(self) -> GCodeFile:
+        return self._source
+
+    def current_line(self) -> int:
+        """Zero-based source line of the segment being executed, -1 if none."""
+
+        count = len(self._toolpath)
+        if not count:
+            return -1
+        return int(self._toolpath.line[min(self._clock.completed_segments(), count - 1)])
+
+    def completed_segments(self) -> int:
+        return self._clock.completed_segments()
+
+    def cut_segments(self) -> int:
+        """Segments already cut into the stock; lags ``completed_segments`` under load."""
+
+        return self._cut_segments
+
+    def toolpath(self) -> Toolpath:
+        return self._toolpath
+
+    def toolpath_preview(self) -> ToolpathLod:
+        return self._preview
+
+    def stock(self) -> Optional[StockModel]:
+        return self._stock
@@ -0,0 +1,68 @@
+"""Qt-free machine setup: axis configuration, defaults and input validation."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Tuple
+
+
+@dataclass
+class AxisConfig:
+    """Axis configuration as defined by the UI."""
+
+    name: str
+    axis_type: str
+    minimum: float
+    maximum: float
+    active: bool
+    max_velocity: float = 10000.0
+    max_acceleration: float = 1000.0
+    max_jerk: float = 20000.0
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, object]) -> AxisConfig:
+        """Build an axis from a mapping of its field names, e.g. parsed JSON."""
+
+        known = {name: values[name] for name in cls.__dataclass_fields__ if name in values}
+        return cls(**known)
+
+
+class ValidationError(Exception):
+    """Validation error for user input."""
+
+
+class InputValidator:
+    """Shared validation helpers for UI input."""
+
+    @staticmethod
+    def validate_axis_limits(min_val: float, max_val: float) -> None:
+        if min_val >= max_val:
+            raise ValidationError("Minimum value must be less than maximum.")
+
+    @staticmethod
+    def validate_tool_parameters(params: Dict[str, float]) -> None:
+        if params["diameter"] <= 0:
+            raise ValidationError("Tool diameter must be positive.")
+        if params["length"] < params["cutting_length"]:
+            raise ValidationError("Tool length must exceed cutting length.")
+
+
+DEFAULT_AXES: Tuple[AxisConfig, ...] = (
+    AxisConfig("X", "Linear", -250.0, 250.0, True),
+    AxisConfig("Y", "Linear", -200.0, 200.0, True),
+    AxisConfig("Z", "Linear", 0.0, 300.0, True),
+    AxisConfig("A", "Rotary", -180.0, 180.0, False),
+)
+DEFAULT_TOOL: Dict[str, float | str] = {
+    "type": "Flat Endmill",
+    "diameter": 10.0,
+    "length": 50.0,
+    "cutting_length": 40.0,
+}
+DEFAULT_WORKPIECE: Dict[str, float | str] = {
+    "width": 200.0,
+    "height": 100.0,
+    "depth": 50.0,
+    "zero_point": "Top Center",
+    "resolution": 0.5,
+    "model": "Heightfield",
+}
@@ -0,0 +1,176 @@
+"""Qt-free load pipeline: tokenize, interpret and plan a G-code program."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+from core.toolpath import Toolpath
+from core.toolpath_lod import ToolpathLod
+from diagnostics.profiling import (
+    SPAN_CYCLE_TIME,
+    SPAN_INTERPRET,
+    SPAN_PREVIEW,
+    SPAN_TOKENIZE,
+    span,
+)
+from gcode.interpreter import InterpretedProgram, interpret
+from gcode.reader import GCodeFile
+from gcode.tokenizer import WORD_DTYPE, GCodeTokenizer
+
+from .cycle_time import MachineLimits, estimate_cycle_time
+
+# Bump whenever tokenizing, interpretation, arc segmentation, planning or the
+# preview change their output, so cached programs are compiled again.
+COMPILER_VERSION = 2
+
+STAGE_DIGEST = "Checking cache"
+STAGE_TOKENIZE = "Parsing"
+STAGE_INTERPRET = "Interpreting"
+STAGE_ANALYZE = "Analyzing"
+STAGE_PREVIEW = "Preparing preview"
+
+ProgressCallback = Callable[[str, int, int], None]
+CancelCheck = Callable[[], bool]
+
+
+class LoadCancelled(Exception):
+    """Raised when a load is cancelled between pipeline steps."""
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledProgram:
+    """Result of the load pipeline.
+
+    Attributes:
+        program: Interpreter output with modal history.
+        toolpath: Toolpath with planned segment times.
+        preview: Level-of-detail polyline for the viewport.
+        source_bytes: Size of the source program in bytes.
+        line_count: Number of source lines.
+
+    Example:
+        compiled = compile_gcode(source.iter_chunks(), source.size)
+    """
+
+    program: InterpretedProgram
+    toolpath: Toolpath
+    preview: ToolpathLod
+    source_bytes: int
+    line_count: int
+
+
+def compile_gcode(
+    chunks: Iterable[bytes],
+    total_bytes: int,
+    limits: Optional[MachineLimits] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None,
+) -> CompiledProgram:
+    """Run the full load pipeline over a chunked program source.
+
+    Progress is reported once per chunk while tokenizing and once per
+    later stage, so callers can forward it to a UI without flooding it.
+
+    Args:
+        chunks: Program source as byte chunks.
+        total_bytes: Source size used for progress reporting.
+        limits: Machine limits for cycle time planning.
+        progress: Optional ``callback(stage, done, total)``.
+        cancelled: Optional check polled between chunks and stages.
+
+    Returns:
+        CompiledProgram with interpreted and time-planned toolpath.
+
+    Raises:
+        LoadCancelled: If ``cancelled`` returns True.
+
+    Example:
+        compiled = compile_gcode([text.encode()], len(text))
+    """
+
+    def report(stage: str, done: int, total: int) -> None:
+        if cancelled is not None and cancelled():
+            raise LoadCancelled()
+        if progress is not None:
+            progress(stage, done, total)
+
+    tokenizer = GCodeTokenizer()
+    tables = []
+    consumed = 0
+    for chunk in chunks:
+        with span(SPAN_TOKENIZE):
+            tables.append(np.array(tokenizer.feed(chunk), dtype=WORD_DTYPE))
+        consumed += len(chunk)
+        report(STAGE_TOKENIZE, consumed, total_bytes)
+    with span(SPAN_TOKENIZE):
+        tables.append(np.array(tokenizer.close(), dtype=WORD_DTYPE))
+        words = np.concatenate(tables)
+    del tables
+
+    report(STAGE_INTERPRET, 0, 1)
+    with span(SPAN_INTERPRET):
+        program = interpret(words)
+    del words
+
+    report(STAGE_ANALYZE, 0, 1)
+    with span(SPAN_CYCLE_TIME):
+        estimate = estimate_cycle_time(program.toolpath, limits)
+
+    report(STAGE_PREVIEW, 0, 1)
+    with span(SPAN_PREVIEW):
+        preview = ToolpathLod.build(program.toolpath)
+    report(STAGE_PREVIEW, 1, 1)
+    return CompiledProgram(
+        program=program,
+        toolpath=program.toolpath.with_segment_times(estimate.segment_times),
+        preview=preview,
+        source_bytes=consumed,
+        line_count=tokenizer.lines_consumed,
+    )
+
+
+def compile_file(
+    path: Path,
+    limits: Optional[MachineLimits] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None,
+) -> CompiledProgram:
+    """Compile a G-code file read through a memory-mapped ``GCodeFile``.
+
+    Args:
+        path: Program file.
+        limits: Machine limits for cycle time planning.
+        progress: Optional ``callback(stage, done, total)``.
+        cancelled: Optional check polled between chunks and stages.
+
+    Returns:
+        CompiledProgram with interpreted and time-planned toolpath.
+
+    Raises:
+        OSError: If the file cannot be read.
+        LoadCancelled: If ``cancelled`` returns True.
+    """
+
+    with GCodeFile.open(path) as source:
+        return compile_gcode(source.iter_chunks(), source.size, limits, progress, cancelled)
+
+
+def compile_file_job(path: Path, limits: Optional[MachineLimits], messages: Any) -> None:
+    """Process entry point posting ``compile_file`` progress to a queue.
+
+    Messages are tuples: ``("progress", stage, done, total)``,
+    ``("finished", compiled)`` or ``("failed", message)``.
+    """
+
+    def progress(stage: str, done: int, total: int) -> None:
+        messages.put(("progress", stage, done, total))
+
+    try:
+        compiled = compile_file(path, limits, progress)
+    except (OSError, ValueError, MemoryError) as exc:
+        messages.put(("failed", str(exc)))
+        return
+    messages.put(("finished", compiled))
@@ -0,0 +1,50 @@
+import numpy as np
+
+from benchmarks.programs import PROGRAMS, generate, write_program
+from benchmarks.suite import compare_results, run_case
+from simulation.pipeline import compile_gcode
+
+
+def test_generated_programs_are_deterministic_and_fit_the_workpiece():
+    """Every kind writes exactly the requested lines, repeatably, inside the default stock."""
+
+    for kind in PROGRAMS:
+        data = b"".join(generate(kind, 5000, seed=3))
+        assert data == b"".join(generate(kind, 5000, seed=3))
+        assert data != b"".join(generate(kind, 5000, seed=4))
+        compiled = compile_gcode([data], len(data))
+        assert compiled.line_count == 5000 and data.count(b"\n") == 5000
+        points = compiled.toolpath.points
+        assert np.all(np.abs(points[:, 0]) <= 100.0) and np.all(np.abs(points[:, 1]) <= 50.0)
+        assert points[:, 2].min() < 0.0
+
+
+def test_case_times_every_stage_and_compare_flags_slowdowns(tmp_path):
+    """A case reports each headless stage; only slowdowns beyond the threshold are flagged."""
+
+    path = tmp_path / "arcs.nc"
+    write_program(path, "arcs", 500)
+    case = run_case(path, cut_limit=100)
+    assert case["cut_segments"] == 100 and case["segments"] > 500
+    assert set(case["stages"]) == {
+        "load",
+        "parse",
+        "interpret",
+        "cycle_time",
+        "preview",
+        "kinematics",
+        "removal",
+        "mesh",
+    }
+
+    baseline = {"cases": {"arcs/500": {"stages": {"parse": 0.100, "load": 0.001}}}}
+    current = {
+        "cases": {
+            "arcs/500": {"stages": {"parse": 0.125, "load": 0.010}},
+            "raster/500": {"stages": {"parse": 1.0}},
+        }
+    }
+    regressions = compare_results(baseline, current, threshold=0.2)
+    assert [(item.case, item.stage) for item in regressions] == [("arcs/500", "parse")]
+    assert np.isclose(regressions[0].ratio, 1.25)
+    assert not compare_results(baseline, current, threshold=0.3)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from core.pose import Pose
+
+
+def _rotation_z(angle: float) -> np.ndarray:
+    cos, sin = np.cos(angle), np.sin(angle)
+    return np.array([[cos, -sin, 0.0], [sin, cos, 0.0], [0.0, 0.0, 1.0]])
+
+
+def test_cached_quantities_match_the_matrix():
+    """Cached TCP position, tool axis, GL matrix and inverse agree with the transform."""
+
+    matrix = np.eye(4)
+    matrix[:3, :3] = _rotation_z(0.3)
+    matrix[:3, 3] = [10.0, -5.0, 2.5]
+    pose = Pose(matrix)
+
+    assert np.array_equal(pose.tcp_position, pose.transform_point(np.array([0, 0, 0, 1]))[:3])
+    assert np.array_equal(pose.tool_axis, [0.0, 0.0, 1.0])
+    assert pose.tcp_position is pose.tcp_position
+    assert not pose.tcp_position.flags.writeable
+    assert pose.gl_matrix.dtype == np.float32
+    assert np.allclose(pose.gl_matrix.reshape(4, 4).T, matrix)
+    assert np.allclose(pose.T_tcp_from_mcs @ matrix, np.eye(4))
+
+    loaded = []
+    pose.apply_to_gl(loaded.append)
+    assert loaded[0] is pose.gl_matrix
+
+
+def test_transform_points_matches_transform_point():
+    """Batched transforms accept Cartesian and homogeneous points."""
+
+    matrix = np.eye(4)
+    matrix[:3, :3] = _rotation_z(-1.1)
+    matrix[:3, 3] = [1.0, 2.0, 3.0]
+    pose = Pose(matrix)
+    points = np.random.default_rng(0).uniform(-50.0, 50.0, (100, 3))
+    homogeneous = np.column_stack([points, np.ones(len(points))])
+
+    expected = np.array([pose.transform_point(point) for point in homogeneous])
+    assert np.allclose(pose.transform_points(homogeneous), expected)
+    assert np.allclose(pose.transform_points(points), expected[:, :3])
+    with pytest.raises(ValueError):
+        pose.transform_points(points[:, :2])
@@ -0,0 +1,56 @@
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, MOTION_RAPID, Toolpath
+from core.toolpath_lod import FEED_COLOR, RAPID_COLOR, ToolpathLod
+
+
+def _spiral(count: int) -> Toolpath:
+    angle = np.linspace(0.0, 20.0 * np.pi, count)
+    targets = np.column_stack([50.0 * np.cos(angle), 50.0 * np.sin(angle), -angle / 10.0])
+    motion = np.full(count, MOTION_LINEAR, dtype=np.uint8)
+    motion[count // 2 : count // 2 + 10] = MOTION_RAPID
+    return Toolpath.from_moves(
+        np.zeros(3), targets, np.full(count, 1000.0), motion, np.arange(count, dtype=np.uint32)
+    )
+
+
+def test_levels_shrink_and_stay_close_to_the_path():
+    """Coarser levels drop vertices while staying within twice their cell diagonal."""
+
+    toolpath = _spiral(200_000)
+    lod = ToolpathLod.build(toolpath)
+
+    assert lod.level_count[0] == len(toolpath.points)
+    assert np.all(np.diff(lod.level_count) < 0)
+    assert np.all(np.diff(lod.cell_size) > 0)
+    for level in range(1, lod.levels):
+        first, count = lod.level_first[level], lod.level_count[level]
+        kept = lod.source_index[first : first + count].astype(np.int64)
+        assert kept[0] == 0 and kept[-1] == len(toolpath)
+        owner = np.searchsorted(kept, np.arange(len(toolpath.points)), "right") - 1
+        owner = np.clip(owner, 0, count - 2)
+        start, end = toolpath.points[kept[owner]], toolpath.points[kept[owner + 1]]
+        chord = end - start
+        fraction = np.einsum("ij,ij->i", toolpath.points - start, chord)
+        fraction = np.clip(fraction / np.maximum(np.einsum("ij,ij->i", chord, chord), 1e-12), 0, 1)
+        deviation = np.linalg.norm(start + chord * fraction[:, None] - toolpath.points, axis=1)
+        assert deviation.max() <= 2.0 * np.sqrt(3.0) * lod.cell_size[level]
+
+
+def test_motion_boundaries_and_executed_split():
+    """Rapid/feed changes survive decimation and progress maps to a draw range."""
+
+    toolpath = _spiral(200_000)
+    lod = ToolpathLod.build(toolpath)
+    level = lod.levels - 1
+    first, count = lod.level_first[level], lod.level_count[level]
+    kept = lod.source_index[first : first + count]
+    colors = lod.vertices["color"][first : first + count]
+
+    assert {100_000, 100_010}.issubset(set(kept.tolist()))
+    assert np.array_equal(colors[kept == 100_010][0], RAPID_COLOR)
+    assert np.array_equal(colors[kept == 100_000][0], FEED_COLOR)
+    assert lod.executed_vertices(level, 0) == 1
+    assert lod.executed_vertices(level, len(toolpath)) == count
+    assert lod.level_for(0.0) == 0
+    assert lod.level_for(1e6) == lod.levels - 1
@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+
+from core.state import KinematicConfig, MachineState, machine_states
+from core.tracepose import (
+    TraceRecorder,
+    log_tracepose,
+    read_trace,
+    start_tracepose,
+    stop_tracepose,
+    trace_to_jsonl,
+)
+from kinematics.three_axis import forward_kinematics, forward_kinematics_batch
+
+
+def test_recorded_rows_round_trip_through_flushes_and_batches(tmp_path):
+    """Single and batched rows read back in order across buffer flushes."""
+
+    config = KinematicConfig()
+    states = [MachineState(float(i), -2.0 * i, 5.0, 10.0) for i in range(7)]
+    batch = machine_states(np.arange(3.0), 1.0, 2.0, 25.0)
+    path = tmp_path / "run.trace"
+
+    with TraceRecorder(path, capacity=3) as recorder:
+        for state in states:
+            recorder.record(state, forward_kinematics(state, config))
+        recorder.record_batch(batch, forward_kinematics_batch(batch, config))
+        assert len(recorder) == 10
+
+    trace = read_trace(path)
+    assert len(trace) == 10
+    assert np.array_equal(trace["state"][6], [6.0, -12.0, 5.0, 10.0])
+    expected = forward_kinematics(states[6], config).T_mcs_from_tcp
+    assert np.array_equal(trace["T_mcs_from_tcp"][6], expected)
+    assert np.array_equal(trace["T_mcs_from_tcp"][7:], forward_kinematics_batch(batch, config))
+
+
+def test_log_tracepose_writes_active_trace_and_converts_to_jsonl(tmp_path):
+    """log_tracepose appends to a started trace whose JSON lines match the pose."""
+
+    state = MachineState(100.0, 50.0, -20.0, 10.0)
+    start_tracepose(tmp_path / "run.trace")
+    try:
+        log_tracepose(state, forward_kinematics(state, KinematicConfig()))
+    finally:
+        recorder = stop_tracepose()
+
+    assert trace_to_jsonl(recorder.path, tmp_path / "run.jsonl") == 1
+    entry = json.loads((tmp_path / "run.jsonl").read_text())
+    assert entry["state_axes"] == {"X": 100.0, "Y": 50.0, "Z": -20.0}
+    assert entry["tcp_position_mcs"] == [100.0, 50.0, -30.0]
+    assert entry["tool_axis"] == [0.0, 0.0, 1.0]
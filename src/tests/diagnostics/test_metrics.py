@@ -0,0 +1,48 @@
+import csv
+import json
+
+import numpy as np
+
+from diagnostics.metrics import FrameLimiter, FrameTimes, MetricsRecorder
+
+
+def test_frame_window_reports_rate_percentiles_and_histogram():
+    """A full window keeps only the newest frames and summarizes them."""
+
+    frames = FrameTimes(capacity=100)
+    for index in range(150):
+        started = index / 50.0
+        frames.record(started, started + (0.030 if index % 10 == 9 else 0.005))
+
+    assert len(frames) == 100 and np.isclose(frames.fps(), 50.0)
+    p50, p95, p99 = frames.percentiles()
+    assert np.isclose(p50, 5.0) and np.isclose(p99, 30.0) and p50 <= p95 <= p99
+    counts = frames.histogram((0.0, 16.7, float("inf")))
+    assert counts.tolist() == [90, 10]
+    assert np.allclose(frames.durations()[-1], 0.030)
+
+
+def test_limiter_spaces_frames_and_recorder_exports(tmp_path):
+    """The limiter delays early frames; samples round-trip through CSV and JSON."""
+
+    limiter = FrameLimiter(50.0)
+    limiter.mark(1.0)
+    assert np.isclose(limiter.delay(1.005), 0.015) and limiter.delay(1.02) == 0.0
+    limiter.max_fps = 0.0
+    assert limiter.delay(1.0) == 0.0
+
+    frames = FrameTimes()
+    frames.record(0.0, 0.004)
+    frames.record(0.016, 0.020)
+    recorder = MetricsRecorder()
+    recorder.sample(10.0, frames, steps=0, rss=1024)
+    sample = recorder.sample(10.5, frames, steps=30, rss=2048)
+    assert np.isclose(sample.step_rate, 60.0) and np.isclose(sample.time, 0.5)
+
+    recorder.export(tmp_path / "metrics.csv")
+    recorder.export(tmp_path / "metrics.json")
+    with (tmp_path / "metrics.csv").open(newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    document = json.loads((tmp_path / "metrics.json").read_text())
+    assert [row["rss_bytes"] for row in rows] == ["1024", "2048"]
+    assert document["samples"][1]["step_rate"] == sample.step_rate
@@ -0,0 +1,47 @@
+import json
+
+from diagnostics import profiling
+from diagnostics.profiling import SPAN_FK, SPAN_STEP, Profiler, profiled, span
+
+
+@profiled(SPAN_FK)
+def _square(value):
+    return value * value
+
+
+def test_spans_are_recorded_only_while_enabled():
+    """Disabled spans record nothing; enabled ones aggregate per name."""
+
+    profiling.disable()
+    with span(SPAN_STEP):
+        pass
+    assert _square(3) == 9
+
+    profiler = profiling.enable()
+    try:
+        for _ in range(3):
+            with span(SPAN_STEP):
+                _square(2)
+    finally:
+        assert profiling.disable() is profiler
+
+    summary = profiler.summary()
+    assert summary[SPAN_STEP]["count"] == 3 and summary[SPAN_FK]["count"] == 3
+    assert summary[SPAN_STEP]["total_ms"] >= summary[SPAN_FK]["total_ms"]
+
+
+def test_ring_keeps_newest_spans_and_exports_chrome_trace(tmp_path):
+    """A wrapped ring exports the newest spans in order with all-time counts."""
+
+    profiler = Profiler(capacity=4)
+    step = profiler.name_id(SPAN_STEP)
+    for index in range(10):
+        profiler.record(step, 1000 * index, 1000 * index + 500)
+
+    profiler.export_chrome_trace(tmp_path / "trace.json")
+    document = json.loads((tmp_path / "trace.json").read_text())
+    events = document["traceEvents"]
+    assert [event["ph"] for event in events] == ["X"] * 4
+    assert [event["dur"] for event in events] == [0.5] * 4
+    assert [event["ts"] for event in events] == sorted(event["ts"] for event in events)
+    assert document["otherData"]["summary"][SPAN_STEP]["count"] == 10
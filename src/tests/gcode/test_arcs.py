@@ -0,0 +1,56 @@
+import numpy as np
+
+from core.toolpath import MOTION_ARC_CCW, MOTION_ARC_CW
+from gcode.arcs import segment_arcs
+from gcode.interpreter import interpret
+from gcode.tokenizer import tokenize
+
+
+def test_chord_tolerance_and_direction():
+    """Quarter arcs stay within tolerance and turn the requested way."""
+
+    start = np.array([[10.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+    end = np.array([[0.0, 10.0, 0.0], [0.0, 10.0, -5.0]])
+    counts, points = segment_arcs(
+        start,
+        end,
+        plane=np.array([0, 0]),
+        clockwise=np.array([False, True]),
+        offsets=np.array([[-10.0, 0.0, 0.0], [-10.0, 0.0, 0.0]]),
+        tolerance=0.01,
+    )
+
+    ccw = points[: counts[0]]
+    cw = points[counts[0] :]
+    assert np.allclose(np.hypot(points[:, 0], points[:, 1]), 10.0)
+    assert np.all(ccw[:-1, 0] > 0) and np.all(ccw[:-1, 1] > 0)
+    assert counts[1] > 2 * counts[0]
+    assert np.all(np.diff(cw[:, 2]) < 0) and np.isclose(cw[-1, 2], -5.0)
+    half_angle = np.pi / 4 / counts[0]
+    assert 10.0 * (1 - np.cos(half_angle)) <= 0.01
+
+
+def test_radius_form_and_planes_in_program():
+    """R-format arcs and G18/G19 arcs resolve into toolpath segments."""
+
+    program = (
+        "G17 G0 X0 Y0 Z0\n"
+        "G2 X20 Y0 R10 F500\n"
+        "G18 G3 X40 Z0 K0 I10\n"
+        "G19 G2 Y0 Z0 J5\n"
+    )
+    toolpath = interpret(tokenize(program), chord_tolerance=0.05).toolpath
+
+    first_arc = toolpath.end[toolpath.line == 1]
+    assert np.allclose(first_arc[-1], [20, 0, 0])
+    assert np.all(first_arc[:-1, 1] > 0)
+    assert np.allclose(np.hypot(first_arc[:, 0] - 10, first_arc[:, 1]), 10)
+
+    zx_arc = toolpath.end[toolpath.line == 2]
+    assert np.allclose(zx_arc[-1], [40, 0, 0])
+    assert np.all(zx_arc[:-1, 2] > 0)
+
+    full_circle = toolpath.end[toolpath.line == 3]
+    assert np.allclose(np.hypot(full_circle[:, 1] - 5, full_circle[:, 2]), 5)
+    assert np.allclose(full_circle[-1], [40, 0, 0])
+    assert set(toolpath.motion[toolpath.line >= 1].tolist()) == {MOTION_ARC_CW, MOTION_ARC_CCW}
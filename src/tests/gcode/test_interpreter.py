@@ -0,0 +1,129 @@
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, MOTION_RAPID, Toolpath
+from gcode.interpreter import DISTANCE_INCREMENTAL, UNITS_INCH, build_toolpath, interpret
+from gcode.tokenizer import tokenize
+
+
+def test_modal_motion_and_feed_carry_forward():
+    """Axis words, motion mode and feed persist across blocks."""
+
+    program = "N10 G90 G94\nN20 G0 X10 Y5\nN30 G1 Z-2 F600\nN40 X20\nN50 M5\n"
+    toolpath = build_toolpath(tokenize(program))
+
+    assert np.allclose(toolpath.end, [[10, 5, 0], [10, 5, -2], [20, 5, -2]])
+    assert np.allclose(toolpath.start[0], [0, 0, 0])
+    assert toolpath.motion.tolist() == [MOTION_RAPID, MOTION_LINEAR, MOTION_LINEAR]
+    assert toolpath.line.tolist() == [1, 2, 3]
+    assert np.allclose(toolpath.cum_length, [np.hypot(10, 5), np.hypot(10, 5) + 2, np.hypot(10, 5) + 12])
+    assert np.isclose(toolpath.segment_times[2], 10 / 600 * 60)
+
+
+def test_million_segment_memory_budget():
+    """A 1M-segment toolpath stays well under 100 MB."""
+
+    count = 1_000_000
+    toolpath = Toolpath.from_moves(
+        np.zeros(3),
+        np.random.default_rng(0).random((count, 3)),
+        np.full(count, 1000.0),
+        np.ones(count, dtype=np.uint8),
+        np.arange(count),
+    )
+
+    assert len(toolpath) == count
+    assert toolpath.nbytes < 60 * 1024 * 1024
+
+
+def test_incremental_units_and_work_offsets():
+    """G91, G20 and G54-G59 resolve to machine coordinates in one pass."""
+
+    program = (
+        "G21 G90 G54 G0 X10 Y10 Z5\n"
+        "G91 G1 X5 F100\n"
+        "X5 Y-2\n"
+        "G90 G55 X0\n"
+        "G20 G91 Z-1\n"
+        "G53 G90 G0 Z0\n"
+    )
+    result = interpret(
+        tokenize(program), work_offsets={"G54": (100, 50, 0), "G55": (200, 0, 0)}
+    )
+
+    assert np.allclose(
+        result.toolpath.end,
+        [
+            [110, 60, 5],
+            [115, 60, 5],
+            [120, 58, 5],
+            [200, 58, 5],
+            [200, 58, 5 - 25.4],
+            [200, 58, 0],
+        ],
+    )
+    assert np.isclose(result.toolpath.feed[4], 100 * 25.4)
+    assert result.modal["distance"].line.tolist() == [0, 1, 3, 4, 5]
+    state = result.modal_state_at(4)
+    assert state["units"] == UNITS_INCH
+    assert state["distance"] == DISTANCE_INCREMENTAL
+    assert state["work_offset"] == 1
+    assert result.segment_at_line(2) == 3
+
+
+def test_g92_offsets_do_not_move_the_tool():
+    """G92 shifts the coordinate system without a move of its own."""
+
+    program = "G0 X10\nG92 X0\nG1 X5 F100\nG92.2\nG1 X5\nG92.3\nG1 X5\n"
+    toolpath = build_toolpath(tokenize(program))
+
+    assert np.allclose(toolpath.end[:, 0], [10, 15, 5, 15])
+    assert toolpath.line.tolist() == [0, 2, 4, 6]
+
+
+def test_g10_l2_sets_a_work_offset():
+    """G10 L2 changes the offset for the blocks after it and does not move."""
+
+    program = "G0 X10\nG10 L2 P1 X50 Y5\nG0 X0\nG10 L2 P2 X7\nG4 P1\nG0 Y0\n"
+    result = interpret(tokenize(program))
+
+    assert np.allclose(result.toolpath.end, [[10, 0, 0], [50, 0, 0], [50, 5, 0]])
+    assert result.toolpath.line.tolist() == [0, 2, 5]
+    assert len(result.unsupported_lines) == 0
+
+
+def test_g28_returns_home_through_the_intermediate_point():
+    """G28 with axis words rapids to the intermediate point, then homes those axes."""
+
+    program = "G0 X10 Y10 Z5\nG28 Z10\nG1 X20 F100\nG28\n"
+    result = interpret(tokenize(program), home=np.array([1.0, 2.0, 3.0]))
+
+    assert np.allclose(
+        result.toolpath.end,
+        [[10, 10, 5], [10, 10, 10], [10, 10, 3], [20, 10, 3], [1, 2, 3]],
+    )
+    assert result.toolpath.motion.tolist() == [MOTION_RAPID] * 3 + [MOTION_LINEAR, MOTION_RAPID]
+    assert result.toolpath.line.tolist() == [0, 1, 1, 2, 3]
+
+
+def test_drilling_cycles_are_expanded():
+    """G81 in G99 drills every hole and retracts to R; G98 returns to the initial level."""
+
+    program = "G0 Z10\nG99 G81 X5 Z-3 R2 F100\nX10\nG98 G83 X20 Z-4 R2 Q3\nG80\n"
+    toolpath = build_toolpath(tokenize(program))
+
+    assert np.allclose(
+        toolpath.end[:, 2], [10, 10, 2, -3, 2, 2, -3, 2, 2, -1, 2, -0.75, -4, 10]
+    )
+    assert np.allclose(toolpath.end[-1], [20, 0, 10])
+    assert np.allclose(toolpath.end[toolpath.motion == MOTION_LINEAR, 2], [-3, -3, -1, -4])
+    assert toolpath.line.tolist() == [0] + [1] * 4 + [2] * 3 + [3] * 6
+
+
+def test_unsupported_blocks_are_reported():
+    """G87 back boring and G10 L20 produce no motion and are listed by line."""
+
+    program = "G0 Z10\nG87 X5 Z-5 R1\nG80\nG10 L20 P1 X0\nG0 X1\n"
+    result = interpret(tokenize(program))
+
+    assert result.unsupported_lines.tolist() == [1, 3]
+    assert np.allclose(result.toolpath.end, [[0, 0, 10], [1, 0, 10]])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from gcode.reader import GCodeFile, replace_file
+from gcode.tokenizer import tokenize
+
+
+def test_line_index_matches_splitlines(tmp_path):
+    """Lines decode on demand, with CRLF endings and no trailing newline."""
+
+    program = "N10 G90 G94\r\nN20 G01 X1.5\n\n(comment only)\nN30 Y2 ; é\nN40 Z-1"
+    path = tmp_path / "part.nc"
+    path.write_bytes(program.encode("utf-8"))
+
+    with GCodeFile.open(path) as source:
+        assert len(source) == 6
+        assert source.lines(0, 10) == program.splitlines()
+        assert source.line(4) == "N30 Y2 ; é"
+        assert source.path == path
+        words = tokenize(source.iter_chunks(chunk_size=5))
+        lines = [source.line_at_offset(int(offset)) for offset in words["offset"]]
+        assert np.array_equal(lines, words["line"])
+
+
+def test_empty_and_in_memory_sources(tmp_path):
+    """Empty files open without a mapping and text sources save verbatim."""
+
+    empty = tmp_path / "empty.nc"
+    empty.write_bytes(b"")
+    with GCodeFile.open(empty) as source:
+        assert len(source) == 0
+        assert list(source.iter_chunks()) == []
+
+    source = GCodeFile.from_text("G0 X1\nG1 Y2\n")
+    assert len(source) == 2
+    assert source.line(1) == "G1 Y2"
+    copy = tmp_path / "copy.nc"
+    source.save(copy)
+    assert copy.read_text() == "G0 X1\nG1 Y2\n"
+
+
+def test_find_wraps_and_spans_chunks():
+    """Search is case-insensitive, crosses window boundaries and wraps."""
+
+    source = GCodeFile.from_text("G0 X1\nG1 Y2\ng1 z3\n")
+
+    assert source.find("G1") == 6
+    assert source.find("g1", 7) == 12
+    assert source.find("G1", 13) == 6
+    assert source.find("Y2", chunk_size=2) == 9
+    assert source.line_at_offset(source.find("Z3")) == 2
+    assert source.find("G2") is None
+
+
+def test_saving_an_edited_program_over_its_mapped_file(tmp_path):
+    """The open mapping keeps its bytes and index while the file is replaced."""
+
+    path = tmp_path / "part.nc"
+    path.write_bytes(b"G0 X1\nG1 Y2\nG1 Z3\n")
+    path.chmod(0o640)
+    with GCodeFile.open(path) as source:
+        assert source.is_file(path)
+        replace_file(path, [b"G0 X5\n"])
+        assert len(source) == 3 and source.line(2) == "G1 Z3"
+        source.save(path)
+    with GCodeFile.open(path) as saved:
+        assert len(saved) == 1 and saved.line(0) == "G0 X5"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert [item.name for item in tmp_path.iterdir()] == ["part.nc"]
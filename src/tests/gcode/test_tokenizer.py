@@ -0,0 +1,38 @@
+import numpy as np
+
+from gcode.tokenizer import GCodeTokenizer, block_starts, iter_words, tokenize
+
+
+def test_comments_and_compact_words():
+    """Comments are skipped and words without separators are split."""
+
+    words = list(iter_words("N10 G1X10.Y-.5 (move; fast) Z2 ; trailing X99\n"))
+
+    assert [(word.letter, word.value) for word in words] == [
+        ("N", 10.0),
+        ("G", 1.0),
+        ("X", 10.0),
+        ("Y", -0.5),
+        ("Z", 2.0),
+    ]
+    assert all(word.line == 0 for word in words)
+
+
+def test_chunked_feed_matches_whole_program():
+    """Splitting the source mid-block yields identical records."""
+
+    program = b"N10 G90 G94\r\nN20 G01 X1.5\n\n(comment only)\nN30 y2.25 g43.4 h1"
+    whole = tokenize(program)
+
+    tokenizer = GCodeTokenizer()
+    raw = []
+    for index in range(0, len(program), 7):
+        raw.extend(tokenizer.feed(program[index : index + 7]))
+    raw.extend(tokenizer.close())
+    chunked = np.array(raw, dtype=whole.dtype)
+
+    assert np.array_equal(whole, chunked)
+    assert whole["line"].tolist() == [0, 0, 0, 1, 1, 1, 4, 4, 4, 4]
+    assert program[int(whole["offset"][6]) : int(whole["offset"][6]) + 3] == b"N30"
+    assert np.allclose(whole["value"][8], 43.4)
+    assert block_starts(whole).tolist() == [0, 3, 6]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from core.state import ROTARY_HEAD, KinematicConfig, RotaryAxis, machine_states
+from kinematics.chain import KinematicChain
+from kinematics.three_axis import forward_kinematics_batch
+
+_TRUNNION = KinematicConfig(
+    (
+        RotaryAxis("A", direction=(1.0, 0.0, 0.0), pivot=(0.0, 0.0, -50.0), minimum=-120.0),
+        RotaryAxis("C", pivot=(10.0, 5.0, 0.0)),
+    )
+)
+_MIXED = KinematicConfig(
+    (
+        RotaryAxis("C", pivot=(20.0, 0.0, 0.0)),
+        RotaryAxis("B", ROTARY_HEAD, direction=(0.0, 1.0, 1.0), pivot=(0.0, 0.0, -100.0)),
+    )
+)
+
+
+def test_without_rotary_axes_matches_three_axis():
+    """An empty chain reproduces the three-axis transforms exactly."""
+
+    rng = np.random.default_rng(0)
+    linear = rng.uniform(-200.0, 200.0, (500, 3))
+    offsets = rng.uniform(0.0, 100.0, 500)
+    chain = KinematicChain(KinematicConfig())
+
+    expected = forward_kinematics_batch(machine_states(*linear.T, offsets), KinematicConfig())
+    assert chain.axis_names == ("X", "Y", "Z")
+    assert np.array_equal(chain.forward(linear, offsets), expected)
+
+
+def test_table_rotation_moves_the_tcp_in_the_workpiece_frame():
+    """Turning C by 90 degrees about its pivot turns the TCP the other way in WCS."""
+
+    chain = KinematicChain(KinematicConfig((RotaryAxis("C", pivot=(10.0, 0.0, 0.0)),)))
+    transform = chain.forward([[20.0, 0.0, 5.0, 90.0]], tool_length_offset=5.0)[0]
+
+    assert np.allclose(transform[:3, 3], [10.0, -10.0, 0.0])
+    assert np.allclose(transform[:3, 2], [0.0, 0.0, 1.0])
+
+
+@pytest.mark.parametrize("config", [_TRUNNION, _MIXED])
+def test_inverse_round_trips_forward(config):
+    """Inverse kinematics reproduces tool poses, and the seeded joints themselves."""
+
+    rng = np.random.default_rng(1)
+    count = 1000
+    joints = np.column_stack(
+        [rng.uniform(-200.0, 200.0, (count, 3)), rng.uniform(-100.0, 30.0, (count, 2))]
+    )
+    chain = KinematicChain(config)
+    transforms = chain.forward(joints, tool_length_offset=40.0)
+
+    solved = chain.inverse(transforms[:, :3, 3], transforms[:, :3, 2], tool_length_offset=40.0)
+    # Two rotary axes fix the tool axis, not the spin about it.
+    pose = chain.forward(solved, tool_length_offset=40.0)[:, :3, 2:]
+    assert np.allclose(pose, transforms[:, :3, 2:], atol=1e-9)
+    seeded = chain.inverse(
+        transforms[:, :3, 3], transforms[:, :3, 2], tool_length_offset=40.0, seed=joints[:, 3:]
+    )
+    assert np.allclose(seeded, joints, atol=1e-8)
+
+
+def test_unreachable_orientation_and_parallel_axes_are_rejected():
+    """A single A axis cannot tilt about Y, and parallel axes cannot orient the tool."""
+
+    chain = KinematicChain(KinematicConfig((RotaryAxis("A", direction=(1.0, 0.0, 0.0)),)))
+    with pytest.raises(ValueError):
+        chain.inverse([[0.0, 0.0, 0.0]], [[1.0, 0.0, 1.0]])
+    with pytest.raises(ValueError):
+        KinematicChain(KinematicConfig((RotaryAxis("C"), RotaryAxis("C2", ROTARY_HEAD))))
@@ -1,7 +1,7 @@
 import numpy as np
 
-from core.state import KinematicConfig, MachineState
-from kinematics.three_axis import forward_kinematics
+from core.state import KinematicConfig, MachineState, machine_states
+from kinematics.three_axis import forward_kinematics, forward_kinematics_batch, tcp_positions
 
 
 def test_tool_length_offset():
@@ -28,3 +28,22 @@ def test_xyz_movement():
 
     expected = np.array([100, 50, -30, 1])
     assert np.allclose(tcp_position, expected, atol=0.01)
+
+
+def test_batch_matches_scalar_path():
+    """Batched transforms and TCP positions equal the per-state results exactly."""
+
+    rng = np.random.default_rng(3)
+    xs, ys, zs, offsets = rng.uniform(-500.0, 500.0, (4, 1000))
+    states = machine_states(xs, ys, zs, offsets)
+    config = KinematicConfig()
+
+    transforms = forward_kinematics_batch(states, config)
+    positions = tcp_positions(states, config)
+
+    for index in range(len(states)):
+        state = MachineState(xs[index], ys[index], zs[index], offsets[index])
+        pose = forward_kinematics(state, config)
+        assert np.array_equal(transforms[index], pose.T_mcs_from_tcp)
+    assert np.array_equal(positions, transforms[:, :3, 3])
+    assert np.array_equal(tcp_positions(machine_states(xs, ys, zs, 10.0), config)[:, 2], zs - 10.0)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from core.toolpath import MOTION_LINEAR, MOTION_RAPID, Toolpath
+from material.heightfield import TILE_CELLS, Heightfield
+from material.stock import StockModel
+from material.tools import TOOL_BALL, TOOL_FLAT, CutterProfile
+
+
+def test_flat_slot_removes_expected_volume_and_marks_tiles():
+    """A straight slot removes a rectangle plus two half discs, only in touched tiles."""
+
+    stock = Heightfield.from_stock(100.0, 100.0, 20.0, resolution=0.1)
+    stock.take_dirty_tiles()
+    cutter = CutterProfile(TOOL_FLAT, 10.0)
+
+    start = np.array([-20.0, -30.0, -2.0])
+    end = np.array([20.0, -30.0, -2.0])
+    removed = stock.cut_segment(start, end, cutter)
+    expected = (40.0 * 10.0 + np.pi * 25.0) * 2.0
+
+    assert np.isclose(removed, expected, rtol=0.01)
+    assert np.isclose(stock.removed_volume, removed)
+    assert stock.heights.min() == -2.0
+    tiles = stock.take_dirty_tiles()
+    assert len(tiles) and np.all(tiles[:, 0] * TILE_CELLS * stock.cell < 35.0)
+    assert not len(stock.take_dirty_tiles())
+
+    assert stock.cut_segment(start + [0, 0, 1], end + [0, 0, 1], cutter) == 0.0
+
+
+def test_ball_plunge_leaves_spherical_dimple():
+    """The surface under a ball cutter follows its sphere, clamped at the stock bottom."""
+
+    stock = Heightfield.from_stock(20.0, 20.0, 1.5, resolution=0.05)
+    cutter = CutterProfile(TOOL_BALL, 8.0)
+    points = np.array([[0.0, 0.0, 10.0], [0.0, 0.0, 10.0], [0.0, 0.0, -2.0]])
+    toolpath = Toolpath.from_moves(
+        points[0],
+        points[1:],
+        np.full(2, 500.0),
+        np.array([MOTION_RAPID, MOTION_LINEAR], dtype=np.uint8),
+        np.arange(2, dtype=np.uint32),
+    )
+
+    assert stock.cut_toolpath(toolpath, cutter) == 2
+    xs, ys = stock.cell_centers()
+    distance = np.minimum(np.hypot(xs[None, :], ys[:, None]), 4.0)
+    expected = np.clip(2.0 - np.sqrt(16.0 - distance**2), -1.5, 0.0)
+    assert np.allclose(stock.heights, expected, atol=1e-4)
+    assert stock.heights.min() == -1.5
+    cap = np.pi * 2.0**2 * (3 * 4.0 - 2.0) / 3.0
+    floor = np.pi * 0.5**2 * (3 * 4.0 - 0.5) / 3.0
+    assert np.isclose(stock.removed_volume, cap - floor, rtol=0.01)
+
+
+def test_stock_model_requires_the_material_interface():
+    """The base class cannot be instantiated without the storage methods."""
+
+    with pytest.raises(TypeError):
+        StockModel.from_stock(10.0, 10.0, 5.0)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from material.heightfield import Heightfield
+from material.tools import TOOL_FLAT, CutterProfile
+from material.tridexel import AXIS_X, AXIS_Y, AXIS_Z, TriDexel, capsule_span
+from material.workpiece import STOCK_TRIDEXEL, create_stock
+
+
+def test_capsule_span_matches_sampled_discs():
+    """Ray intervals equal the union of discs sampled densely along the segment."""
+
+    offsets = np.linspace(-6.0, 6.0, 49, dtype=np.float32)[None, :]
+    radius = np.array([[2.5]], dtype=np.float32)
+    t = np.linspace(0.0, 1.0, 20001)
+    segments = (((1.0, -1.0), (4.0, 3.0)), ((0.0, 0.5), (-3.0, 0.0)), ((2.0, 2.0), (0.0, -4.0)))
+    for start, delta in segments:
+        low, high = capsule_span(start, delta, radius, offsets)
+        u = start[0] + t * delta[0]
+        v = start[1] + t * delta[1]
+        for column, offset in enumerate(offsets[0]):
+            chord = radius[0, 0] ** 2 - (offset - v) ** 2
+            inside = chord >= 0
+            if not inside.any():
+                assert np.isinf(low[0, column])
+                continue
+            half = np.sqrt(chord[inside])
+            assert np.isclose(low[0, column], (u[inside] - half).min(), atol=1e-3)
+            assert np.isclose(high[0, column], (u[inside] + half).max(), atol=1e-3)
+
+
+def test_slot_walls_are_exact_along_side_rays():
+    """Side rays place slot walls off the grid exactly; volume matches the heightfield."""
+
+    params = {"width": 60.0, "height": 40.0, "depth": 10.0, "resolution": 0.5}
+    stock = create_stock({**params, "model": STOCK_TRIDEXEL})
+    heightfield = Heightfield.from_workpiece_parameters(params)
+    cutter = CutterProfile(TOOL_FLAT, 6.0)
+    start = np.array([-10.1, 0.3, -3.0])
+    end = np.array([12.2, 0.3, -3.0])
+
+    assert isinstance(stock, TriDexel)
+    removed = stock.cut_segment(start, end, cutter)
+    assert np.isclose(removed, heightfield.cut_segment(start, end, cutter))
+
+    enter, leave = stock.intervals(AXIS_Y)
+    zs, xs = stock.ray_centers(AXIS_Y)
+    row = int(np.argmin(np.abs(zs + 1.0)))
+    column = int(np.argmin(np.abs(xs)))
+    assert np.allclose([leave[row, column, 0], enter[row, column, 1]], [-2.7, 3.3], atol=1e-5)
+    assert np.allclose([enter[row, column, 0], leave[row, column, 1]], [-20.0, 20.0])
+
+    enter, leave = stock.intervals(AXIS_X)
+    zs, ys = stock.ray_centers(AXIS_X)
+    column = int(np.argmin(np.abs(ys - 0.3)))
+    assert np.isclose(leave[row, column, 0], -10.1 - np.sqrt(9.0 - (ys[column] - 0.3) ** 2))
+
+    tiles = stock.take_dirty_tiles()
+    assert set(tiles[:, 0]) == {AXIS_X, AXIS_Y, AXIS_Z}
+    mesh = np.concatenate([stock.tile_mesh(*tile) for tile in tiles])
+    assert mesh.shape[1] == 6 and len(mesh) % 6 == 0
@@ -0,0 +1,34 @@
+import numpy as np
+
+from render.geometry import GANTRY_MILL, box_triangles, build_machine_mesh, grid_lines
+
+
+def test_box_triangles_face_outward():
+    """Every triangle winds counter-clockwise around its outward normal."""
+
+    box = box_triangles((4.0, 2.0, 3.0), origin=(1.0, 1.0, 0.0))
+    corners = box[:, :3].reshape(-1, 3, 3)
+    normals = box[::3, 3:]
+    winding = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    assert box.shape == (36, 6)
+    assert np.all(np.einsum("ij,ij->i", winding, normals) > 0)
+    assert np.allclose(box[:, :3].min(axis=0), [-1.0, 0.0, 0.0])
+    assert np.allclose(box[:, :3].max(axis=0), [3.0, 2.0, 3.0])
+
+
+def test_machine_mesh_groups_are_contiguous():
+    """Parts are packed per motion group so each group is one draw call."""
+
+    mesh = build_machine_mesh(reversed(GANTRY_MILL))
+
+    assert mesh.vertices.shape == (36 * len(GANTRY_MILL), 9)
+    assert mesh.ranges == {
+        "base": (0, 36),
+        "gantry": (36, 108),
+        "carriage": (144, 72),
+        "spindle": (216, 36),
+    }
+    spindle = mesh.vertices[216:252]
+    assert np.allclose(spindle[:, 6:], (0.8, 0.4, 0.3))
+    assert grid_lines().shape == (84, 3)
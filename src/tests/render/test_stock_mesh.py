@@ -0,0 +1,47 @@
+import numpy as np
+
+from material.heightfield import Heightfield
+from material.tools import TOOL_FLAT, CutterProfile
+from render.stock_mesh import StockMesher
+
+
+def _mesh_all(mesher: StockMesher) -> dict:
+    meshes = {}
+    while True:
+        meshed = mesher.update(budget_seconds=1.0)
+        if not meshed:
+            return meshes
+        meshes.update(meshed)
+
+
+def test_only_cut_tiles_are_meshed_again():
+    """After the initial mesh, a cut re-meshes just the tiles it touched."""
+
+    stock = Heightfield.from_stock(100.0, 80.0, 20.0, resolution=0.5)
+    mesher = StockMesher(stock)
+    initial = _mesh_all(mesher)
+    assert len(initial) == np.prod(stock.tile_shape)
+    assert mesher.pending == 0 and not mesher.update(budget_seconds=1.0)
+
+    stock.cut_segment(np.array([-45.0, -35.0, -2.0]), np.array([-40.0, -35.0, -2.0]),
+                      CutterProfile(TOOL_FLAT, 4.0))
+    remeshed = _mesh_all(mesher)
+    assert list(remeshed) == [(0, 0)]
+    vertices = remeshed[(0, 0)]
+    assert vertices.dtype == np.float32 and vertices.shape[1] == 6
+    assert np.isclose(vertices[:, 2].min(), -20.0) and np.isclose(vertices[:, 2].max(), 0.0)
+    assert np.any(np.isclose(vertices[:, 2], -2.0))
+    normals = vertices[:, 3:]
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-5)
+
+
+def test_zero_budget_meshes_one_tile_per_update():
+    """A spent budget still makes progress one tile at a time and defers the rest."""
+
+    stock = Heightfield.from_stock(200.0, 200.0, 10.0, resolution=1.0)
+    mesher = StockMesher(stock)
+    assert len(mesher.update(budget_seconds=0.0)) == 1
+    assert mesher.pending == np.prod(stock.tile_shape) - 1
+
+    mesher.invalidate([(0, 0)])
+    assert mesher.pending == np.prod(stock.tile_shape)
@@ -0,0 +1,43 @@
+import json
+
+from simulation.batch import BatchSetup, main, simulate_file
+from simulation.machine import AxisConfig
+
+_SLOT = "G21 G90\nG0 X-40 Y0 Z5\nG1 Z-2 F500\nG1 X40 F2000\nG0 Z5\n"
+
+
+def test_report_covers_cycle_time_limits_and_removed_volume(tmp_path):
+    """A slot past the X limit is reported with its first line and removed volume."""
+
+    program = tmp_path / "slot.nc"
+    program.write_text(_SLOT)
+    axes = (
+        AxisConfig("X", "Linear", -250.0, 30.0, True),
+        AxisConfig("Y", "Linear", -200.0, 200.0, True),
+        AxisConfig("Z", "Linear", 0.0, 300.0, True),
+    )
+    setup = BatchSetup(axes=axes, workpiece={"resolution": 0.25})
+
+    report = simulate_file(program, setup)
+
+    assert report["segments"] == 4 and report["cycle_time"] > 0.0
+    assert report["violations"]["X"]["first_line"] == 4
+    assert report["violations"]["X"]["maximum"] == 40.0
+    assert set(report["violations"]) == {"X"}
+    # 80 mm slot, 10 mm flat cutter, 2 mm deep, plus the two half discs.
+    assert abs(report["removed_volume"] - (80.0 * 10.0 + 25.0 * 3.14159) * 2.0) < 20.0
+    json.dumps(report)
+
+
+def test_cli_writes_reports_and_flags_errors(tmp_path):
+    """The CLI reports every program and fails on unreadable ones."""
+
+    program = tmp_path / "slot.nc"
+    program.write_text(_SLOT)
+    output = tmp_path / "report.json"
+
+    status = main([str(program), str(tmp_path / "missing.nc"), "--output", str(output)])
+
+    reports = json.loads(output.read_text())["reports"]
+    assert status == 1
+    assert reports[0]["violations"] == {} and "error" in reports[1]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from gcode.reader import GCodeFile
+from simulation.cache import ProgramCache, cache_key, source_digest
+from simulation.cycle_time import MachineLimits
+from simulation.pipeline import STAGE_DIGEST, LoadCancelled, compile_gcode
+
+_PROGRAM = "G21 G90 G17\nG0 X0 Y0 Z5\nG1 Z-1 F600\nG2 X20 Y0 I10 J0\nG91 G1 X5\nG90 G0 Z5\n"
+
+
+def test_round_trip_maps_identical_arrays(tmp_path):
+    """A stored program loads back memory-mapped with equal arrays and modal state."""
+
+    source = GCodeFile.from_text(_PROGRAM)
+    limits = MachineLimits()
+    compiled = compile_gcode(source.iter_chunks(), source.size, limits)
+    cache = ProgramCache(tmp_path / "cache")
+    key = cache_key(source_digest(source), limits)
+
+    assert cache.load(key) is None
+    assert cache.store(key, compiled)
+    cached = cache.load(key)
+
+    assert isinstance(cached.toolpath.points, np.memmap)
+    assert not cached.toolpath.points.flags.writeable
+    for name in ("points", "motion", "line", "cum_time"):
+        assert np.array_equal(getattr(cached.toolpath, name), getattr(compiled.toolpath, name))
+    assert np.array_equal(cached.program.toolpath.cum_time, compiled.program.toolpath.cum_time)
+    assert np.array_equal(cached.preview.vertices, compiled.preview.vertices)
+    assert cached.program.modal_state_at(4) == compiled.program.modal_state_at(4)
+    assert (cached.line_count, cached.source_bytes) == (compiled.line_count, compiled.source_bytes)
+
+    other = cache_key(source_digest(source), MachineLimits(junction_deviation=0.05))
+    assert other != key and cache.load(other) is None
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    """Storing past the size limit removes the entries used longest ago."""
+
+    source = GCodeFile.from_text(_PROGRAM)
+    compiled = compile_gcode(source.iter_chunks(), source.size)
+    cache = ProgramCache(tmp_path)
+    cache.store("first", compiled)
+    size = cache.entry_bytes(tmp_path / "first")
+    # Room for two entries; sizes differ by a few bytes of metadata.
+    cache = ProgramCache(tmp_path, max_bytes=2 * size + size // 2)
+    cache.store("second", compiled)
+    assert cache.load("first") is not None
+
+    cache.store("third", compiled)
+
+    assert sorted(entry.name for entry in cache.entries()) == ["first", "third"]
+
+
+def test_digest_reports_progress_and_can_be_cancelled():
+    """Hashing reports its progress per chunk and stops when cancelled."""
+
+    source = GCodeFile.from_text(_PROGRAM)
+    reports = []
+    digest = source_digest(source, lambda *report: reports.append(report))
+
+    assert digest == source_digest(source)
+    assert reports[-1] == (STAGE_DIGEST, source.size, source.size)
+    with pytest.raises(LoadCancelled):
+        source_digest(source, cancelled=lambda: True)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, Toolpath
+from simulation.clock import SimulationClock
+
+
+def _toolpath() -> Toolpath:
+    targets = np.array([[10.0, 0.0, 0.0], [10.0, 500.0, 0.0]])
+    return Toolpath.from_moves(
+        np.zeros(3),
+        targets,
+        np.array([600.0, 6000.0]),
+        np.full(2, MOTION_LINEAR, dtype=np.uint8),
+        np.array([0, 1]),
+    )
+
+
+def test_machine_time_scales_with_speed():
+    """Wall time is scaled by the speed factor and clamped to the program."""
+
+    clock = SimulationClock(_toolpath(), speed=2.0)
+
+    assert np.isclose(clock.duration, 1.0 + 5.0)
+    clock.advance(0.25)
+    assert np.isclose(clock.machine_time, 0.5)
+    assert np.allclose(clock.position(), [5.0, 0.0, 0.0])
+
+    clock.speed = 1000.0
+    clock.advance(1.0)
+    assert clock.finished
+    assert clock.completed_segments() == 2
+    assert np.allclose(clock.position(), [10.0, 500.0, 0.0])
+
+
+def test_locate_interpolates_within_segment():
+    """Seeking finds the segment by binary search on cumulative time."""
+
+    clock = SimulationClock(_toolpath())
+    clock.seek(3.5)
+
+    segment, fraction = clock.locate()
+    assert segment == 1
+    assert np.isclose(fraction, 0.5)
+    assert np.allclose(clock.position(), [10.0, 250.0, 0.0])
@@ -0,0 +1,60 @@
+import numpy as np
+
+from core.toolpath import MOTION_LINEAR, MOTION_RAPID, Toolpath
+from simulation.cycle_time import MachineLimits, estimate_cycle_time
+
+_NO_JERK_LIMIT = MachineLimits(max_jerk=(1e12, 1e12, 1e12))
+
+
+def _linear_path(targets: np.ndarray, feed: float) -> Toolpath:
+    count = len(targets)
+    return Toolpath.from_moves(
+        np.zeros(3),
+        targets,
+        np.full(count, feed),
+        np.full(count, MOTION_LINEAR, dtype=np.uint8),
+        np.arange(count),
+    )
+
+
+def test_trapezoid_matches_closed_form():
+    """A single move accelerates, cruises and decelerates at the axis limit."""
+
+    toolpath = _linear_path(np.array([[100.0, 0.0, 0.0]]), feed=6000.0)
+
+    estimate = estimate_cycle_time(toolpath, _NO_JERK_LIMIT)
+
+    # 100 mm/s cruise, 1000 mm/s^2: 0.1 s ramps covering 10 mm, 90 mm cruise.
+    assert np.isclose(estimate.total_time, 0.1 + 0.9 + 0.1)
+
+
+def test_look_ahead_carries_speed_through_collinear_segments():
+    """Splitting a straight move does not add stops at the junctions."""
+
+    targets = np.column_stack([np.linspace(1.0, 100.0, 100), np.zeros(100), np.zeros(100)])
+    estimate = estimate_cycle_time(_linear_path(targets, 6000.0), _NO_JERK_LIMIT)
+
+    assert np.isclose(estimate.total_time, 1.1)
+    assert np.isclose(estimate.junction_speeds[50], 100.0)
+
+
+def test_corners_rapids_and_jerk_slow_the_program():
+    """Reversals stop the tool, rapids use axis rates, jerk adds ramp time."""
+
+    back_and_forth = _linear_path(np.array([[50.0, 0, 0], [0.0, 0, 0]]), 6000.0)
+    reversal = estimate_cycle_time(back_and_forth, _NO_JERK_LIMIT)
+    assert np.isclose(reversal.junction_speeds[1], 0.0)
+    assert np.isclose(reversal.total_time, 2 * (0.1 + 0.4 + 0.1))
+
+    rapid = Toolpath.from_moves(
+        np.zeros(3),
+        np.array([[0.0, 0.0, -400.0]]),
+        np.zeros(1),
+        np.array([MOTION_RAPID], dtype=np.uint8),
+        np.zeros(1),
+    )
+    limits = MachineLimits(max_velocity=(20000.0, 20000.0, 6000.0), max_jerk=(1e12,) * 3)
+    assert np.isclose(estimate_cycle_time(rapid, limits).total_time, 0.1 + 3.9 + 0.1)
+
+    with_jerk = estimate_cycle_time(_linear_path(np.array([[100.0, 0, 0]]), 6000.0))
+    assert with_jerk.total_time > 1.1
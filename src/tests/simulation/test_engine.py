@@ -0,0 +1,50 @@
+from simulation.engine import (
+    EVENT_MACHINE_STATE,
+    EVENT_MATERIAL_REMOVED,
+    EVENT_STARTED,
+    EVENT_STOPPED,
+    SimulationEngine,
+)
+from simulation.machine import DEFAULT_WORKPIECE
+
+_SLOT = "G21 G90\nG0 X-40 Y0 Z5\nG1 Z-2 F500\nG1 X40 F2000\nG0 Z5\n"
+
+
+def test_engine_runs_a_program_to_completion_through_callbacks():
+    """Stepping a started engine reports progress, cuts the stock and stops at the end."""
+
+    engine = SimulationEngine()
+    events = []
+    for name in (EVENT_STARTED, EVENT_STOPPED, EVENT_MATERIAL_REMOVED):
+        engine.subscribe(name, lambda *args, name=name: events.append((name, args)))
+    states = []
+    engine.subscribe(EVENT_MACHINE_STATE, states.append)
+    engine.create_workpiece({**DEFAULT_WORKPIECE, "resolution": 0.5})
+    engine.load_gcode_text(_SLOT)
+
+    engine.start(speed=10.0)
+    for _ in range(1000):
+        if not engine.running:
+            break
+        engine.step(0.1)
+
+    names = [name for name, _ in events]
+    assert not engine.running
+    assert names.index(EVENT_STARTED) < names.index(EVENT_STOPPED)
+    assert engine.cut_segments() == 4 and engine.stock().removed_volume > 1000.0
+    finished = next(state for state in states if state.completed_segments == 4)
+    assert finished.total_segments == 4 and finished.remaining_time == 0.0
+    assert abs(finished.position("X") - 40.0) < 1e-9 and abs(finished.position("Z") - 5.0) < 1e-9
+    assert states[-1].completed_segments == 0 and states[-1].line == 1
+
+
+def test_engine_reports_errors_instead_of_raising():
+    """Starting without a program emits an error and leaves the engine idle."""
+
+    engine = SimulationEngine()
+    errors = []
+    engine.subscribe("error_occurred", lambda title, message: errors.append(title))
+
+    engine.start()
+
+    assert errors == ["Simulation"] and not engine.running
@@ -1,8 +1,10 @@
 """Main window for the CNC Machine 3D Simulator Pro UI."""
 
+import time
 from pathlib import Path
+from typing import Optional
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
     QDockWidget,
     QFileDialog,
@@ -15,6 +17,10 @@ from PyQt5.QtWidgets import (
 )
 
 from controller.machine_controller import AxisConfig, MachineController
+from diagnostics import profiling
+from diagnostics.metrics import MetricsRecorder
+from gcode.reader import replace_file
+from simulation.engine import MachineSnapshot
 
 from .menu_bar import build_menu_bar
 from .status_bar import StatusBarWidgets, build_status_bar
@@ -28,6 +34,11 @@ from .tabs.workpiece_tab import WorkpieceTab
 from .widgets.gl_widget import GLWidget
 
 
+LOAD_PROGRESS_STEPS = 1000
+METRICS_INTERVAL_MS = 500
+MEGABYTE = 1024 * 1024
+
+
 class MainWindow(QMainWindow):
     """Primary application window."""
 
@@ -51,8 +62,16 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self.notifications_list)
 
         self.controller = MachineController()
+        self.metrics = MetricsRecorder()
+        self._profiler: Optional[profiling.Profiler] = None
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(METRICS_INTERVAL_MS)
+        self._metrics_timer.timeout.connect(self._sample_metrics)
+        self._metrics_timer.start()
         self._connect_controller()
         self._connect_ui_actions()
+        self._apply_tool_params()
+        self._apply_workpiece()
 
     def _build_viewport(self) -> QWidget:
         self.gl_widget = GLWidget()
@@ -94,10 +113,17 @@ class MainWindow(QMainWindow):
         return dock
 
     def _connect_controller(self) -> None:
-        self.controller.simulation_progress.connect(self._update_simulation_progress)
         self.controller.machine_state_changed.connect(self._update_machine_state)
         self.controller.error_occurred.connect(self._show_error)
         self.controller.gcode_loaded.connect(self._on_gcode_loaded)
+        self.controller.cycle_time_estimated.connect(self._on_cycle_time_estimated)
+        self.controller.material_removed.connect(self.simulation_tab.set_removed_volume)
+        self.controller.material_removed.connect(lambda _volume: self.gl_widget.update())
+        self.controller.workpiece_updated.connect(self._on_workpiece_updated)
+        self.controller.gcode_load_progress.connect(self._on_gcode_load_progress)
+        self.controller.gcode_file_loaded.connect(self._on_gcode_file_loaded)
+        self.controller.gcode_load_cancelled.connect(self._on_gcode_load_cancelled)
+        self.controller.gcode_load_finished.connect(self._finish_gcode_load)
 
     def _connect_ui_actions(self) -> None:
         machine_tab = self._machine_tab()
@@ -113,13 +139,26 @@ class MainWindow(QMainWindow):
         workpiece_tab = self._workpiece_tab()
         workpiece_tab.reset_button.clicked.connect(self._apply_workpiece)
 
+        self.simulation_tab.cycle_time_button.clicked.connect(self.controller.analyze_cycle_time)
+        self.simulation_tab.show_toolpath_checkbox.toggled.connect(
+            self.gl_widget.set_toolpath_visible
+        )
+
+        self.settings_tab.fps_limit.valueChanged.connect(self.gl_widget.set_fps_limit)
+        self.settings_tab.show_fps.toggled.connect(self.status_widgets.right.setVisible)
+        self.gl_widget.set_fps_limit(self.settings_tab.fps_limit.value())
+
         gcode_tab = self._gcode_tab()
         gcode_tab.load_button.clicked.connect(self._load_gcode_file)
         gcode_tab.save_button.clicked.connect(self._save_gcode_file)
         gcode_tab.validate_button.clicked.connect(self._apply_gcode_text)
+        gcode_tab.cancel_button.clicked.connect(self.controller.cancel_gcode_load)
         gcode_tab.start_button.clicked.connect(self._start_simulation)
         gcode_tab.pause_button.clicked.connect(self.controller.pause_simulation)
         gcode_tab.stop_button.clicked.connect(self.controller.stop_simulation)
+        gcode_tab.speed_slider.valueChanged.connect(
+            lambda _value: self.controller.set_simulation_speed(gcode_tab.speed_factor())
+        )
 
         self.menu_actions["open_project"].triggered.connect(self._load_gcode_file)
         self.menu_actions["save_project"].triggered.connect(self._save_gcode_file)
@@ -128,6 +167,10 @@ class MainWindow(QMainWindow):
         self.menu_actions["exit"].triggered.connect(self.close)
         self.menu_actions["play_pause"].triggered.connect(self._toggle_play_pause)
         self.menu_actions["stop_sim"].triggered.connect(self.controller.stop_simulation)
+        self.menu_actions["show_workpiece"].toggled.connect(self.gl_widget.set_stock_visible)
+        self.menu_actions["export_metrics"].triggered.connect(self._export_metrics)
+        self.menu_actions["record_profile"].toggled.connect(self._set_profiling)
+        self.menu_actions["export_profile"].triggered.connect(self._export_profile)
 
         self.tool_actions["open_project"].triggered.connect(self._load_gcode_file)
         self.tool_actions["save_project"].triggered.connect(self._save_gcode_file)
@@ -136,6 +179,12 @@ class MainWindow(QMainWindow):
         self.tool_actions["pause"].triggered.connect(self.controller.pause_simulation)
         self.tool_actions["stop"].triggered.connect(self.controller.stop_simulation)
 
+    def closeEvent(self, event) -> None:
+        self._metrics_timer.stop()
+        self._gcode_tab().viewer.shutdown()
+        self.controller.shutdown()
+        super().closeEvent(event)
+
     def _machine_tab(self) -> MachineTab:
         return self.machine_tab
 
@@ -184,21 +233,51 @@ class MainWindow(QMainWindow):
             self, "Open G-code", "", "G-code Files (*.nc *.tap *.gcode *.txt)"
         )
         if file_path:
+            self._gcode_tab().cancel_button.setEnabled(True)
             self.controller.load_gcode_file(Path(file_path))
-            self._gcode_tab().set_gcode_text(self.controller.current_gcode())
-            self._show_info("G-code Loaded", f"Loaded file: {file_path}")
+
+    def _on_gcode_load_progress(self, stage: str, done: int, total: int) -> None:
+        progress = self.status_widgets.progress
+        progress.setFormat(f"{stage}: %p%")
+        progress.setMaximum(LOAD_PROGRESS_STEPS)
+        progress.setValue(LOAD_PROGRESS_STEPS * done // max(total, 1))
+
+    def _on_gcode_file_loaded(self, file_path: str) -> None:
+        self._show_info("G-code Loaded", f"Loaded file: {file_path}")
+
+    def _on_gcode_load_cancelled(self) -> None:
+        self.notifications_widget.addItem("Info: G-code loading cancelled")
+
+    def _finish_gcode_load(self) -> None:
+        self._gcode_tab().cancel_button.setEnabled(False)
+        self.status_widgets.progress.setFormat("Simulation: %p%")
+        self.status_widgets.progress.setValue(0)
 
     def _save_gcode_file(self) -> None:
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save G-code", "", "G-code Files (*.nc *.tap *.gcode *.txt)"
         )
-        if file_path:
-            Path(file_path).write_text(self._gcode_tab().gcode_text(), encoding="utf-8")
-            self._show_info("G-code Saved", f"Saved file: {file_path}")
+        if not file_path:
+            return
+        path = Path(file_path)
+        gcode_tab = self._gcode_tab()
+        source = self.controller.gcode_source()
+        try:
+            if gcode_tab.is_editing():
+                replace_file(path, [gcode_tab.gcode_text().encode("utf-8")])
+            else:
+                source.save(path)
+        except OSError as exc:
+            self._show_error("Save G-code", str(exc))
+            return
+        if gcode_tab.is_editing() and source.is_file(path):
+            # The engine and viewer still map the replaced file; index the saved one.
+            self.controller.load_gcode_file(path)
+        self._show_info("G-code Saved", f"Saved file: {file_path}")
 
     def _start_simulation(self) -> None:
         gcode_tab = self._gcode_tab()
-        self.controller.start_simulation(gcode_tab.speed_slider.value())
+        self.controller.start_simulation(gcode_tab.speed_factor())
         self._show_info("Simulation", "Simulation started.")
 
     def _toggle_play_pause(self) -> None:
@@ -208,31 +287,94 @@ class MainWindow(QMainWindow):
         else:
             self._start_simulation()
 
-    def _update_simulation_progress(self, current: int, total: int) -> None:
-        self._gcode_tab().set_progress(current, total)
+    def _update_simulation_progress(self, state: MachineSnapshot) -> None:
+        current, total = state.completed_segments, state.total_segments
+        gcode_tab = self._gcode_tab()
+        gcode_tab.set_progress(current, total)
+        gcode_tab.set_current_line(state.line)
+        self.gl_widget.set_executed_segments(current)
         self.status_widgets.progress.setMaximum(max(total, 1))
         self.status_widgets.progress.setValue(current)
+        self.simulation_tab.set_progress(current, total, state.remaining_time)
+
+    def _sample_metrics(self) -> None:
+        sample = self.metrics.sample(
+            time.perf_counter(), self.gl_widget.frame_times, self.controller.engine.step_count
+        )
+        if not self.settings_tab.show_fps.isChecked():
+            return
+        memory = f"{sample.rss_bytes / MEGABYTE:.0f} MB" if sample.rss_bytes >= 0 else "--"
+        self.status_widgets.right.setText(
+            f"FPS: {sample.fps:.0f} | Frame p50/p95/p99: {sample.frame_p50_ms:.1f}/"
+            f"{sample.frame_p95_ms:.1f}/{sample.frame_p99_ms:.1f} ms | "
+            f"Steps: {sample.step_rate:.0f}/s | RSS: {memory}"
+        )
+
+    def _export_metrics(self) -> None:
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "metrics.csv", "CSV Files (*.csv);;JSON Files (*.json)"
+        )
+        if not file_path:
+            return
+        try:
+            self.metrics.export(Path(file_path))
+        except (OSError, ValueError) as exc:
+            self._show_error("Export Metrics", str(exc))
+            return
+        self._show_info("Metrics Exported", f"Saved {len(self.metrics.samples)} samples")
+
+    def _set_profiling(self, enabled: bool) -> None:
+        if enabled:
+            self._profiler = profiling.enable()
+        else:
+            profiling.disable()
 
-    def _update_machine_state(self, positions: dict) -> None:
-        axis_values = "  ".join(
-            f"{axis}: {value:.1f}" for axis, value in sorted(positions.items())
+    def _export_profile(self) -> None:
+        profiler = profiling.current() or self._profiler
+        if profiler is None:
+            self._show_info("Export Profile", "Enable Tools > Record Profile first.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Profile Trace", "trace.json", "Chrome Trace (*.json)"
         )
+        if not file_path:
+            return
+        try:
+            profiler.export_chrome_trace(Path(file_path))
+        except OSError as exc:
+            self._show_error("Export Profile", str(exc))
+            return
+        self._show_info("Profile Exported", f"Saved {profiler.span_count()} spans")
+
+    def _update_machine_state(self, state: MachineSnapshot) -> None:
+        """Apply one coalesced frame of machine state with a single repaint."""
+
+        axis_values = "  ".join(f"{axis}: {value:.1f}" for axis, value in sorted(state.items()))
         self.status_widgets.center.setText(axis_values)
         machine_tab = self._machine_tab()
-        for axis, value in positions.items():
+        for axis, value in state.items():
             slider = machine_tab.axis_sliders.get(axis)
             label = machine_tab.axis_labels.get(axis)
-            if slider:
+            if slider and slider.value() != int(value):
                 slider.blockSignals(True)
                 slider.setValue(int(value))
                 slider.blockSignals(False)
             if label:
                 label.setText(f"{value:.1f}")
-            self.gl_widget.set_axis_position(axis, float(value))
+        self.gl_widget.set_axis_positions(dict(state.items()))
+        self._update_simulation_progress(state)
 
     def _on_gcode_loaded(self, count: int) -> None:
+        self._gcode_tab().set_source(self.controller.gcode_source())
+        self.gl_widget.set_toolpath(self.controller.toolpath_preview())
         self.notifications_widget.addItem(f"Info: Loaded {count} G-code commands")
 
+    def _on_workpiece_updated(self) -> None:
+        self.gl_widget.set_stock(self.controller.stock())
+
+    def _on_cycle_time_estimated(self, seconds: float) -> None:
+        self.simulation_tab.set_cycle_time(seconds, self.controller.remaining_time())
+
     def _show_error(self, title: str, message: str) -> None:
         self.notifications_widget.addItem(f"Error: {title} - {message}")
         QMessageBox.warning(self, title, message)
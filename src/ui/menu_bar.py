@@ -79,9 +79,13 @@ def build_menu_bar(window: QMainWindow) -> dict[str, QAction]:
 
     view_menu = menu_bar.addMenu("View")
     view_menu.addAction(_action(window, "Wireframe", "Toggle wireframe mode", checkable=True))
-    view_menu.addAction(
-        _action(window, "Show/Hide Workpiece", "Toggle workpiece visibility", checkable=True)
+    show_workpiece = _register_action(
+        actions,
+        "show_workpiece",
+        _action(window, "Show/Hide Workpiece", "Toggle workpiece visibility", checkable=True),
     )
+    show_workpiece.setChecked(True)
+    view_menu.addAction(show_workpiece)
     view_menu.addAction(
         _action(window, "Show/Hide Toolpath", "Toggle toolpath visibility", checkable=True)
     )
@@ -111,6 +115,28 @@ def build_menu_bar(window: QMainWindow) -> dict[str, QAction]:
     tools_menu.addAction(_action(window, "G-code Validator", "Validate G-code"))
     tools_menu.addAction(_action(window, "Collision Checker", "Check for collisions"))
     tools_menu.addAction(_action(window, "Post-processor", "Open post-processor"))
+    tools_menu.addSeparator()
+    tools_menu.addAction(
+        _register_action(
+            actions,
+            "export_metrics",
+            _action(window, "Export Metrics...", "Save frame, step and memory metrics"),
+        )
+    )
+    tools_menu.addAction(
+        _register_action(
+            actions,
+            "record_profile",
+            _action(window, "Record Profile", "Time pipeline stages", checkable=True),
+        )
+    )
+    tools_menu.addAction(
+        _register_action(
+            actions,
+            "export_profile",
+            _action(window, "Export Profile Trace...", "Save a Chrome trace of recorded stages"),
+        )
+    )
 
     help_menu = menu_bar.addMenu("Help")
     help_menu.addAction(_action(window, "Documentation", "Open documentation", "F1"))
@@ -31,7 +31,7 @@ def build_status_bar(window: QMainWindow) -> StatusBarWidgets:
     progress.setMaximumWidth(200)
     status_bar.addPermanentWidget(progress, 1)
 
-    right = QLabel("FPS: 60 | Memory: 245 MB | ⚡ | 14:30")
+    right = QLabel("FPS: -- | Frame p50/p95/p99: -- ms | Steps: --/s | RSS: --")
     status_bar.addPermanentWidget(right, 1)
 
     return StatusBarWidgets(left=left, center=center, right=right, progress=progress)
@@ -1,6 +1,7 @@
 """G-code control tab."""
 
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
 from PyQt5.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
@@ -8,20 +9,40 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QPushButton,
     QSlider,
+    QStackedWidget,
     QVBoxLayout,
     QWidget,
 )
 
+from gcode.reader import GCodeFile
+
 from ..widgets.gcode_editor import GCodeEditor
+from ..widgets.gcode_view import GCodeView
+
+SPEED_SLIDER_UNITY = 50
+SPEED_SLIDER_DECADE = 50
+EDITABLE_BYTES = 4 * 1024 * 1024
+
+
+def speed_factor_from_slider(value: int) -> float:
+    """Map the speed slider position to a playback factor (0.1x to 1000x)."""
+
+    return 10.0 ** ((value - SPEED_SLIDER_UNITY) / SPEED_SLIDER_DECADE)
 
 
 def _editor_group() -> tuple[
     QGroupBox,
+    QLabel,
     QLineEdit,
     QPushButton,
+    QStackedWidget,
+    GCodeView,
+    GCodeEditor,
+    QPushButton,
+    QPushButton,
+    QPushButton,
     QPushButton,
     QPushButton,
-    GCodeEditor,
 ]:
     group = QGroupBox("Editor")
     layout = QVBoxLayout()
@@ -33,31 +54,59 @@ def _editor_group() -> tuple[
     search = QLineEdit()
     search.setPlaceholderText("Search in G-code...")
     search_row.addWidget(search)
-    search_row.addWidget(QPushButton("Find Next"))
+    find_button = QPushButton("Find Next")
+    search_row.addWidget(find_button)
     layout.addLayout(search_row)
 
+    stack = QStackedWidget()
+    viewer = GCodeView()
     editor = GCodeEditor()
-    layout.addWidget(editor)
+    stack.addWidget(viewer)
+    stack.addWidget(editor)
+    stack.setCurrentWidget(editor)
+    layout.addWidget(stack)
 
     button_row = QHBoxLayout()
+    edit_button = QPushButton("Edit")
+    edit_button.setCheckable(True)
+    edit_button.setChecked(True)
     load_button = QPushButton("Load File")
     save_button = QPushButton("Save")
     validate_button = QPushButton("Validate")
+    cancel_button = QPushButton("Cancel Load")
+    cancel_button.setEnabled(False)
+    button_row.addWidget(edit_button)
     button_row.addWidget(load_button)
     button_row.addWidget(save_button)
     button_row.addWidget(validate_button)
+    button_row.addWidget(cancel_button)
     layout.addLayout(button_row)
 
     group.setLayout(layout)
-    return group, search, load_button, save_button, validate_button, editor
+    return (
+        group,
+        info,
+        search,
+        find_button,
+        stack,
+        viewer,
+        editor,
+        edit_button,
+        load_button,
+        save_button,
+        validate_button,
+        cancel_button,
+    )
 
 
 def _simulation_group() -> tuple[
     QGroupBox,
+    QLabel,
     QSlider,
     QPushButton,
     QPushButton,
     QPushButton,
+    QLabel,
     QSlider,
 ]:
     group = QGroupBox("Simulation Control")
@@ -69,6 +118,7 @@ def _simulation_group() -> tuple[
     speed_slider = QSlider(Qt.Horizontal)
     speed_slider.setMinimum(1)
     speed_slider.setMaximum(200)
+    speed_slider.setValue(SPEED_SLIDER_UNITY)
     speed_row.addWidget(speed_slider)
     layout.addLayout(speed_row)
 
@@ -82,7 +132,8 @@ def _simulation_group() -> tuple[
     layout.addLayout(button_row)
 
     progress_row = QHBoxLayout()
-    progress_row.addWidget(QLabel("Current line: 0/0"))
+    line_label = QLabel("Current line: 0/0")
+    progress_row.addWidget(line_label)
     progress_slider = QSlider(Qt.Horizontal)
     progress_slider.setMinimum(0)
     progress_slider.setMaximum(0)
@@ -95,7 +146,16 @@ def _simulation_group() -> tuple[
     layout.addLayout(step_row)
 
     group.setLayout(layout)
-    return group, speed_slider, start_button, pause_button, stop_button, progress_slider
+    return (
+        group,
+        speed_label,
+        speed_slider,
+        start_button,
+        pause_button,
+        stop_button,
+        line_label,
+        progress_slider,
+    )
 
 
 class GCodeTab(QWidget):
@@ -105,18 +165,26 @@ class GCodeTab(QWidget):
         super().__init__()
         (
             self.editor_group,
+            self.info_label,
             self.search_input,
+            self.find_button,
+            self.editor_stack,
+            self.viewer,
+            self.editor,
+            self.edit_button,
             self.load_button,
             self.save_button,
             self.validate_button,
-            self.editor,
+            self.cancel_button,
         ) = _editor_group()
         (
             self.simulation_group,
+            self.speed_label,
             self.speed_slider,
             self.start_button,
             self.pause_button,
             self.stop_button,
+            self.line_label,
             self.progress_slider,
         ) = _simulation_group()
 
@@ -125,12 +193,77 @@ class GCodeTab(QWidget):
         layout.addWidget(self.simulation_group)
         layout.addStretch()
         self.setLayout(layout)
+        self.speed_slider.valueChanged.connect(self._update_speed_label)
+        self.edit_button.toggled.connect(self.set_editing)
+        self.find_button.clicked.connect(self._find_next)
+        self.search_input.returnPressed.connect(self._find_next)
+        self.viewer.search_finished.connect(self._on_search_finished)
+        self._editor_stale = False
+
+    def speed_factor(self) -> float:
+        return speed_factor_from_slider(self.speed_slider.value())
+
+    def _update_speed_label(self) -> None:
+        factor = self.speed_factor()
+        precision = 1 if factor < 100 else 0
+        self.speed_label.setText(f"Speed: {factor:.{precision}f}x")
 
     def gcode_text(self) -> str:
         return self.editor.toPlainText()
 
     def set_gcode_text(self, text: str) -> None:
         self.editor.setPlainText(text)
+        self._editor_stale = False
+        self.set_editing(True)
+
+    def set_source(self, source: GCodeFile) -> None:
+        """Show a compiled program in the line-indexed viewer."""
+
+        self.viewer.set_source(source)
+        self._editor_stale = True
+        self.set_editing(False)
+        self.edit_button.setEnabled(source.size <= EDITABLE_BYTES)
+        self.line_label.setText(f"Current line: 0/{len(source)}")
+
+    def is_editing(self) -> bool:
+        return self.editor_stack.currentWidget() is self.editor
+
+    def set_editing(self, editing: bool) -> None:
+        if editing and self._editor_stale:
+            self.editor.setPlainText(self.viewer.source().text())
+            self._editor_stale = False
+        self.editor_stack.setCurrentWidget(self.editor if editing else self.viewer)
+        self.validate_button.setEnabled(editing)
+        if self.edit_button.isChecked() != editing:
+            self.edit_button.setChecked(editing)
+
+    def set_current_line(self, line: int) -> None:
+        self.line_label.setText(f"Current line: {line + 1}/{len(self.viewer.source())}")
+        self.viewer.set_current_line(line)
+
+    def _find_next(self) -> None:
+        text = self.search_input.text()
+        if not text:
+            return
+        if self.is_editing():
+            found = self.editor.find(text) or self._find_from_top(text)
+            self._on_search_finished(self.editor.textCursor().blockNumber() if found else -1)
+        else:
+            self.info_label.setText(f"Searching for '{text}'...")
+            self.viewer.find_next(text)
+
+    def _find_from_top(self, text: str) -> bool:
+        cursor = self.editor.textCursor()
+        cursor.movePosition(QTextCursor.Start)
+        self.editor.setTextCursor(cursor)
+        return self.editor.find(text)
+
+    def _on_search_finished(self, line: int) -> None:
+        text = self.search_input.text()
+        if line < 0:
+            self.info_label.setText(f"'{text}' not found")
+        else:
+            self.info_label.setText(f"'{text}' found on line {line + 1}")
 
     def set_progress(self, current: int, total: int) -> None:
         self.progress_slider.setMaximum(max(total, 1))
@@ -12,7 +12,7 @@ from PyQt5.QtWidgets import (
 )
 
 
-def _graphics_group() -> QGroupBox:
+def _graphics_group() -> tuple[QGroupBox, QSpinBox, QCheckBox]:
     group = QGroupBox("Graphics")
     form = QFormLayout()
     quality = QComboBox()
@@ -32,7 +32,7 @@ def _graphics_group() -> QGroupBox:
     show_fps.setChecked(True)
     form.addRow("Show FPS", show_fps)
     group.setLayout(form)
-    return group
+    return group, fps_limit, show_fps
 
 
 def _controls_group() -> QGroupBox:
@@ -80,7 +80,8 @@ class SettingsTab(QWidget):
     def __init__(self) -> None:
         super().__init__()
         layout = QVBoxLayout()
-        layout.addWidget(_graphics_group())
+        graphics, self.fps_limit, self.show_fps = _graphics_group()
+        layout.addWidget(graphics)
         layout.addWidget(_controls_group())
         layout.addWidget(_system_group())
         layout.addStretch()
@@ -12,19 +12,40 @@ from PyQt5.QtWidgets import (
 )
 
 
-def _stats_group() -> QGroupBox:
+def format_duration(seconds: float) -> str:
+    """Format seconds as HH:MM:SS."""
+
+    minutes, secs = divmod(int(round(max(seconds, 0.0))), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def format_volume(cubic_mm: float) -> str:
+    """Format a volume in mm³ as cm³."""
+
+    return f"{cubic_mm / 1000.0:.1f} cm³"
+
+
+def _stats_group() -> tuple[QGroupBox, dict[str, QLabel]]:
     group = QGroupBox("Statistics")
     form = QFormLayout()
-    form.addRow("Total time", QLabel("00:12:34"))
-    form.addRow("Processed commands", QLabel("120/450 (26%)"))
-    form.addRow("Removed material", QLabel("125 cm³"))
-    form.addRow("Max X load", QLabel("85%"))
-    form.addRow("Estimated remaining", QLabel("00:32:18"))
+    labels = {
+        "total_time": QLabel(format_duration(0.0)),
+        "processed": QLabel("0/0 (0%)"),
+        "removed": QLabel(format_volume(0.0)),
+        "max_load": QLabel("85%"),
+        "remaining": QLabel(format_duration(0.0)),
+    }
+    form.addRow("Total time", labels["total_time"])
+    form.addRow("Processed commands", labels["processed"])
+    form.addRow("Removed material", labels["removed"])
+    form.addRow("Max X load", labels["max_load"])
+    form.addRow("Estimated remaining", labels["remaining"])
     group.setLayout(form)
-    return group
+    return group, labels
 
 
-def _visual_group() -> QGroupBox:
+def _visual_group() -> tuple[QGroupBox, QCheckBox]:
     group = QGroupBox("Visualization")
     layout = QVBoxLayout()
     show_toolpath = QCheckBox("Show toolpath")
@@ -36,17 +57,18 @@ def _visual_group() -> QGroupBox:
     layout.addWidget(QCheckBox("Show force vectors"))
     layout.addWidget(QCheckBox("Heatmap loads"))
     group.setLayout(layout)
-    return group
+    return group, show_toolpath
 
 
-def _analysis_group() -> QGroupBox:
+def _analysis_group() -> tuple[QGroupBox, QPushButton]:
     group = QGroupBox("Analysis")
     layout = QHBoxLayout()
     layout.addWidget(QPushButton("Collision Check"))
-    layout.addWidget(QPushButton("Cycle Time Analysis"))
+    cycle_time_button = QPushButton("Cycle Time Analysis")
+    layout.addWidget(cycle_time_button)
     layout.addWidget(QPushButton("Report Generator"))
     group.setLayout(layout)
-    return group
+    return group, cycle_time_button
 
 
 class SimulationTab(QWidget):
@@ -54,9 +76,25 @@ class SimulationTab(QWidget):
 
     def __init__(self) -> None:
         super().__init__()
+        self.stats_group, self.stats_labels = _stats_group()
+        self.visual_group, self.show_toolpath_checkbox = _visual_group()
+        self.analysis_group, self.cycle_time_button = _analysis_group()
+
         layout = QVBoxLayout()
-        layout.addWidget(_stats_group())
-        layout.addWidget(_visual_group())
-        layout.addWidget(_analysis_group())
+        layout.addWidget(self.stats_group)
+        layout.addWidget(self.visual_group)
+        layout.addWidget(self.analysis_group)
         layout.addStretch()
         self.setLayout(layout)
+
+    def set_cycle_time(self, total_seconds: float, remaining_seconds: float) -> None:
+        self.stats_labels["total_time"].setText(format_duration(total_seconds))
+        self.stats_labels["remaining"].setText(format_duration(remaining_seconds))
+
+    def set_progress(self, current: int, total: int, remaining_seconds: float) -> None:
+        percent = 100 * current // total if total else 0
+        self.stats_labels["processed"].setText(f"{current}/{total} ({percent}%)")
+        self.stats_labels["remaining"].setText(format_duration(remaining_seconds))
+
+    def set_removed_volume(self, cubic_mm: float) -> None:
+        self.stats_labels["removed"].setText(format_volume(cubic_mm))
@@ -14,12 +14,16 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from material.workpiece import STOCK_MODELS
+
 
 def _dimensions_group() -> tuple[
     QGroupBox,
     dict[str, QDoubleSpinBox],
     QComboBox,
     QComboBox,
+    QDoubleSpinBox,
+    QComboBox,
 ]:
     group = QGroupBox("Dimensions & Material")
     form = QFormLayout()
@@ -43,8 +47,19 @@ def _dimensions_group() -> tuple[
     zero_point.addItems(["Top Center", "Top Left", "Bottom Center"])
     form.addRow("Zero Point", zero_point)
 
+    resolution = QDoubleSpinBox()
+    resolution.setRange(0.05, 10.0)
+    resolution.setSingleStep(0.05)
+    resolution.setValue(0.5)
+    resolution.setSuffix(" mm")
+    form.addRow("Simulation Resolution", resolution)
+
+    stock_model = QComboBox()
+    stock_model.addItems(list(STOCK_MODELS))
+    form.addRow("Stock Model", stock_model)
+
     group.setLayout(form)
-    return group, fields, material, zero_point
+    return group, fields, material, zero_point, resolution, stock_model
 
 
 def _position_group() -> tuple[QGroupBox, dict[str, QSlider]]:
@@ -85,9 +100,14 @@ class WorkpieceTab(QWidget):
 
     def __init__(self) -> None:
         super().__init__()
-        self.dimensions_group, self.dimension_fields, self.material_combo, self.zero_combo = (
-            _dimensions_group()
-        )
+        (
+            self.dimensions_group,
+            self.dimension_fields,
+            self.material_combo,
+            self.zero_combo,
+            self.resolution,
+            self.stock_model_combo,
+        ) = _dimensions_group()
         self.position_group, self.position_sliders = _position_group()
         self.import_group, self.import_button, self.export_button, self.reset_button = (
             _import_group()
@@ -107,5 +127,7 @@ class WorkpieceTab(QWidget):
             "depth": self.dimension_fields["Depth"].value(),
             "material": self.material_combo.currentText(),
             "zero_point": self.zero_combo.currentText(),
+            "resolution": self.resolution.value(),
+            "model": self.stock_model_combo.currentText(),
             "position": {axis: slider.value() for axis, slider in self.position_sliders.items()},
         }
@@ -0,0 +1,311 @@
+"""Virtualized read-only G-code view backed by a line index."""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRect, Qt, QThread, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import QAbstractScrollArea
+
+from gcode.reader import GCodeFile
+
+HIGHLIGHT_CACHE_LINES = 4096
+GUTTER_PADDING = 8
+TAB_WIDTH = 4
+
+_BACKGROUND = QColor("#1b1c22")
+_GUTTER = QColor("#24262e")
+_GUTTER_TEXT = QColor("#6b6f7e")
+_CURRENT_LINE = QColor("#3a3320")
+_SELECTED_LINE = QColor("#2a2c34")
+
+_TEXT = "#f0f0f0"
+_WORD_COLORS = {
+    "G": "#7aa2f7",
+    "M": "#bb9af7",
+    "N": "#6b6f7e",
+    "F": "#e0af68",
+    "S": "#e0af68",
+    "T": "#9ece6a",
+    "H": "#9ece6a",
+    "D": "#9ece6a",
+}
+_COMMENT = "#6b6f7e"
+
+_HIGHLIGHT_PATTERN = re.compile(
+    r"(\([^)]*\)?|;.*)|([A-Za-z])[ \t]*[+-]?(?:\d+\.?\d*|\.\d+)"
+)
+
+Span = Tuple[int, int, QColor]
+
+
+def _highlight(text: str, colors: Dict[str, QColor]) -> List[Span]:
+    """Split a line into ``(start, end, color)`` runs covering the whole text."""
+
+    spans: List[Span] = []
+    position = 0
+    for match in _HIGHLIGHT_PATTERN.finditer(text):
+        if match.start() > position:
+            spans.append((position, match.start(), colors[_TEXT]))
+        if match.group(1) is not None:
+            color = colors[_COMMENT]
+        else:
+            color = colors[_WORD_COLORS.get(match.group(2).upper(), _TEXT)]
+        spans.append((match.start(), match.end(), color))
+        position = match.end()
+    if position < len(text):
+        spans.append((position, len(text), colors[_TEXT]))
+    return spans
+
+
+class _SearchWorker(QObject):
+    """Runs ``GCodeFile.find`` off the UI thread."""
+
+    found = pyqtSignal(object)
+
+    def __init__(self, source: GCodeFile, text: str, start: int) -> None:
+        super().__init__()
+        self._source = source
+        self._text = text
+        self._start = start
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @pyqtSlot()
+    def run(self) -> None:
+        try:
+            offset = self._source.find(self._text, self._start, self._cancel.is_set)
+        except ValueError:
+            offset = None
+        self.found.emit(offset)
+
+
+class GCodeView(QAbstractScrollArea):
+    """Read-only program view that only materializes the visible lines.
+
+    Scrolling, jumping to a line and highlighting the executing line cost
+    the same for ten lines or ten million: the scroll position is a line
+    number and every paint decodes just the rows on screen. Highlighted
+    lines are kept in a small LRU cache keyed by line number.
+
+    Example:
+        view = GCodeView()
+        view.set_source(GCodeFile.open(path))
+        view.goto_line(120000)
+    """
+
+    search_finished = pyqtSignal(int)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFont(QFont("Courier New", 10))
+        self.setFocusPolicy(Qt.StrongFocus)
+        self._source = GCodeFile.from_text("")
+        self._current_line = -1
+        self._selected_line = -1
+        self._max_columns = 0
+        self._cache: OrderedDict[int, Tuple[str, List[Span]]] = OrderedDict()
+        self._colors = {
+            name: QColor(name) for name in {_TEXT, _COMMENT, *_WORD_COLORS.values()}
+        }
+        self._search_text = ""
+        self._search_offset = 0
+        self._search_worker: Optional[_SearchWorker] = None
+        self._search_threads: Dict[QThread, _SearchWorker] = {}
+        self._update_scrollbars()
+
+    def source(self) -> GCodeFile:
+        return self._source
+
+    def set_source(self, source: GCodeFile) -> None:
+        self.cancel_search()
+        self._source = source
+        self._cache.clear()
+        self._max_columns = 0
+        self._current_line = -1
+        self._selected_line = -1
+        self._search_text = ""
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def current_line(self) -> int:
+        return self._current_line
+
+    def set_current_line(self, line: int) -> None:
+        """Highlight the executing line and keep it on screen."""
+
+        if line == self._current_line:
+            return
+        self._current_line = line
+        if not self._is_visible(line):
+            self._center_on(line)
+        self.viewport().update()
+
+    def selected_line(self) -> int:
+        return self._selected_line
+
+    def goto_line(self, line: int) -> None:
+        """Select ``line`` and scroll it to the middle of the view."""
+
+        if not len(self._source):
+            return
+        self._selected_line = min(max(line, 0), len(self._source) - 1)
+        self._center_on(self._selected_line)
+        self.viewport().update()
+
+    def find_next(self, text: str) -> None:
+        """Search for ``text`` after the last match on a background thread.
+
+        ``search_finished`` is emitted with the matching line, or -1.
+        """
+
+        if text != self._search_text:
+            self._search_text = text
+            line = max(self._selected_line, 0)
+            self._search_offset = self._source.line_span(line)[0] if len(self._source) else 0
+        self.cancel_search()
+        thread = QThread()
+        worker = _SearchWorker(self._source, text, self._search_offset)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.found.connect(thread.quit)
+        worker.found.connect(self._on_search_found)
+        thread.finished.connect(self._release_search_thread)
+        self._search_threads[thread] = worker
+        self._search_worker = worker
+        thread.start()
+
+    def cancel_search(self) -> None:
+        if self._search_worker is not None:
+            self._search_worker.cancel()
+            self._search_worker = None
+
+    def shutdown(self) -> None:
+        """Stop background searches before the widget is destroyed."""
+
+        self.cancel_search()
+        for thread in list(self._search_threads):
+            thread.quit()
+            thread.wait()
+        self._search_threads.clear()
+
+    def _on_search_found(self, offset: Optional[int]) -> None:
+        if self.sender() is not self._search_worker:
+            return
+        self._search_worker = None
+        if offset is None:
+            self.search_finished.emit(-1)
+            return
+        self._search_offset = offset + 1
+        line = self._source.line_at_offset(offset)
+        self.goto_line(line)
+        self.search_finished.emit(line)
+
+    def _release_search_thread(self) -> None:
+        thread = self.sender()
+        worker = self._search_threads.pop(thread, None)
+        if worker is not None:
+            worker.deleteLater()
+            thread.deleteLater()
+
+    def _line_height(self) -> int:
+        return self.fontMetrics().height()
+
+    def _char_width(self) -> int:
+        return self.fontMetrics().horizontalAdvance("0")
+
+    def _visible_rows(self) -> int:
+        return max(self.viewport().height() // self._line_height(), 1)
+
+    def _gutter_width(self) -> int:
+        digits = len(str(max(len(self._source), 1)))
+        return self._char_width() * digits + 2 * GUTTER_PADDING
+
+    def _is_visible(self, line: int) -> bool:
+        first = self.verticalScrollBar().value()
+        return first <= line < first + self._visible_rows()
+
+    def _center_on(self, line: int) -> None:
+        self.verticalScrollBar().setValue(line - self._visible_rows() // 2)
+
+    def _update_scrollbars(self) -> None:
+        rows = self._visible_rows()
+        vertical = self.verticalScrollBar()
+        vertical.setRange(0, max(len(self._source) - rows, 0))
+        vertical.setPageStep(rows)
+        vertical.setSingleStep(1)
+        text_width = self.viewport().width() - self._gutter_width() - GUTTER_PADDING
+        columns = max(text_width // self._char_width(), 1)
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, max(self._max_columns - columns, 0))
+        horizontal.setPageStep(columns)
+
+    def _highlighted(self, line: int) -> Tuple[str, List[Span]]:
+        cached = self._cache.get(line)
+        if cached is not None:
+            self._cache.move_to_end(line)
+            return cached
+        text = self._source.line(line).expandtabs(TAB_WIDTH)
+        cached = (text, _highlight(text, self._colors))
+        self._cache[line] = cached
+        if len(self._cache) > HIGHLIGHT_CACHE_LINES:
+            self._cache.popitem(last=False)
+        if len(text) > self._max_columns:
+            self._max_columns = len(text)
+            self._update_scrollbars()
+        return cached
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        self.viewport().update()
+
+    def mousePressEvent(self, event) -> None:
+        line = self.verticalScrollBar().value() + event.pos().y() // self._line_height()
+        if line < len(self._source):
+            self._selected_line = line
+            self.viewport().update()
+        super().mousePressEvent(event)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        viewport = self.viewport().rect()
+        height = self._line_height()
+        char_width = self._char_width()
+        ascent = self.fontMetrics().ascent()
+        gutter = self._gutter_width()
+        text_left = gutter + GUTTER_PADDING - self.horizontalScrollBar().value() * char_width
+
+        painter.fillRect(viewport, _BACKGROUND)
+        painter.fillRect(0, 0, gutter, viewport.height(), _GUTTER)
+        first = self.verticalScrollBar().value()
+        last = min(first + self._visible_rows() + 1, len(self._source))
+        for line in range(first, last):
+            top = (line - first) * height
+            if line == self._current_line:
+                painter.fillRect(gutter, top, viewport.width() - gutter, height, _CURRENT_LINE)
+            elif line == self._selected_line:
+                painter.fillRect(gutter, top, viewport.width() - gutter, height, _SELECTED_LINE)
+            painter.setPen(_GUTTER_TEXT)
+            painter.drawText(
+                QRect(0, top, gutter - GUTTER_PADDING, height),
+                Qt.AlignRight | Qt.AlignVCenter,
+                str(line + 1),
+            )
+            text, spans = self._highlighted(line)
+            painter.setClipRect(gutter, top, viewport.width() - gutter, height)
+            for start, end, color in spans:
+                painter.setPen(color)
+                painter.drawText(text_left + start * char_width, top + ascent, text[start:end])
+            painter.setClipping(False)
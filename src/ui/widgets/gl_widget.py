@@ -2,43 +2,111 @@
 
 from __future__ import annotations
 
-from math import cos, radians, sin
+import ctypes
+import time
+from math import cos, radians, sin, tan
+from typing import Dict, Mapping, Optional, Tuple
 
-from PyQt5.QtCore import QPoint, Qt
+import numpy as np
+from PyQt5.QtCore import QPoint, Qt, QTimer
 from PyQt5.QtWidgets import QOpenGLWidget
 
 from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_COLOR_ARRAY,
     GL_COLOR_BUFFER_BIT,
+    GL_COLOR_MATERIAL,
     GL_DEPTH_BUFFER_BIT,
     GL_DEPTH_TEST,
-    GL_LINES,
+    GL_DYNAMIC_DRAW,
+    GL_FLAT,
+    GL_FLOAT,
     GL_LIGHT0,
     GL_LIGHTING,
+    GL_LIGHT_MODEL_AMBIENT,
+    GL_LINES,
+    GL_LINE_STRIP,
     GL_MODELVIEW,
+    GL_NORMAL_ARRAY,
+    GL_NORMALIZE,
     GL_POSITION,
     GL_PROJECTION,
-    GL_QUADS,
-    glBegin,
+    GL_SMOOTH,
+    GL_STATIC_DRAW,
+    GL_TRIANGLES,
+    GL_UNSIGNED_BYTE,
+    GL_VERTEX_ARRAY,
+    glBindBuffer,
+    glBufferData,
     glClear,
     glClearColor,
     glColor3f,
+    glColorPointer,
+    glDeleteBuffers,
+    glDisable,
+    glDisableClientState,
+    glDrawArrays,
     glEnable,
-    glEnd,
+    glEnableClientState,
+    glGenBuffers,
+    glLightModelfv,
     glLightfv,
     glLoadIdentity,
     glMatrixMode,
+    glNormalPointer,
     glPopMatrix,
     glPushMatrix,
-    glRotatef,
-    glScalef,
+    glShadeModel,
     glTranslatef,
-    glVertex3f,
+    glVertexPointer,
 )
 from OpenGL.GLU import gluLookAt, gluPerspective
 
+from core.toolpath_lod import PATH_COLOR_OFFSET, PATH_VERTEX_STRIDE, ToolpathLod
+from diagnostics.metrics import FrameLimiter, FrameTimes
+from diagnostics.profiling import SPAN_MESH, SPAN_PAINT, profiled
+from material.stock import StockModel
+from render.geometry import (
+    COLOR_OFFSET,
+    GANTRY_MILL,
+    NORMAL_OFFSET,
+    VERTEX_STRIDE,
+    build_machine_mesh,
+    grid_lines,
+    group_offsets,
+)
+from render.stock_mesh import (
+    STOCK_COLOR,
+    STOCK_NORMAL_OFFSET,
+    STOCK_VERTEX_STRIDE,
+    StockMesher,
+    TileKey,
+)
+
+FIELD_OF_VIEW = 45.0
+EXECUTED_PATH_COLOR = (0.45, 0.47, 0.52)
+STOCK_MESH_BUDGET_MS = 4.0
+
 
 class GLWidget(QOpenGLWidget):
-    """Basic OpenGL viewport with camera controls and axis motion."""
+    """OpenGL viewport with camera controls and axis motion.
+
+    Machine and grid geometry are uploaded once into vertex buffers; a
+    frame only sets one translation per motion group and issues one draw
+    call per group, independent of how many parts the machine has.
+
+    The toolpath is uploaded once per program with all LOD levels. Each
+    frame picks the level matching the current zoom and splits it into
+    executed and remaining line strips by draw range only.
+
+    The stock is drawn from one vertex buffer per tile. Only tiles touched
+    by cuts are re-meshed, for at most ``STOCK_MESH_BUDGET_MS`` per frame;
+    the rest is deferred to the following frames.
+
+    Every frame is timed into ``frame_times``. Repaint requests arriving
+    sooner than the FPS limit allows are deferred to the next permitted
+    frame instead of dropped.
+    """
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
@@ -49,21 +117,63 @@ class GLWidget(QOpenGLWidget):
         self._pan_x = 0.0
         self._pan_y = -120.0
         self._axis_positions = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self._machine_mesh = build_machine_mesh(GANTRY_MILL)
+        self._grid = grid_lines()
+        self._machine_buffer = 0
+        self._grid_buffer = 0
+        self._toolpath = ToolpathLod.empty()
+        self._toolpath_buffer = 0
+        self._toolpath_dirty = False
+        self._toolpath_visible = True
+        self._executed_segments = 0
+        self._stock_mesher: Optional[StockMesher] = None
+        self._stock_chunks: Dict[TileKey, Tuple[int, int]] = {}
+        self._stock_visible = True
+        self._frame_times = FrameTimes()
+        self._frame_limiter = FrameLimiter()
+        self._limit_timer = QTimer(self)
+        self._limit_timer.setSingleShot(True)
+        self._limit_timer.timeout.connect(super().update)
 
     def initializeGL(self) -> None:
         glClearColor(0.08, 0.09, 0.12, 1.0)
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
+        glEnable(GL_COLOR_MATERIAL)
+        glEnable(GL_NORMALIZE)
+        glLightModelfv(GL_LIGHT_MODEL_AMBIENT, (0.45, 0.45, 0.45, 1.0))
+        self._machine_buffer = self._upload(self._machine_mesh.vertices)
+        self._grid_buffer = self._upload(self._grid)
+        self.context().aboutToBeDestroyed.connect(self._release_buffers)
 
     def resizeGL(self, width: int, height: int) -> None:
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
         aspect = width / max(height, 1)
-        gluPerspective(45.0, aspect, 0.1, 5000.0)
+        gluPerspective(FIELD_OF_VIEW, aspect, 0.1, 5000.0)
         glMatrixMode(GL_MODELVIEW)
 
+    @property
+    def frame_times(self) -> FrameTimes:
+        return self._frame_times
+
+    def set_fps_limit(self, fps: float) -> None:
+        """Cap the repaint rate; 0 removes the cap."""
+
+        self._frame_limiter.max_fps = fps
+
+    def update(self) -> None:
+        delay = self._frame_limiter.delay(time.perf_counter())
+        if delay <= 0.0:
+            super().update()
+        elif not self._limit_timer.isActive():
+            self._limit_timer.start(int(delay * 1000.0) + 1)
+
+    @profiled(SPAN_PAINT)
     def paintGL(self) -> None:
+        started = time.perf_counter()
+        self._frame_limiter.mark(started)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
@@ -84,13 +194,58 @@ class GLWidget(QOpenGLWidget):
         glLightfv(GL_LIGHT0, GL_POSITION, (0.0, 0.0, 1000.0, 1.0))
 
         self._draw_grid()
+        self._update_stock_chunks()
+        self._draw_stock()
+        self._draw_toolpath()
         self._draw_machine()
+        self._frame_times.record(started, time.perf_counter())
 
     def set_axis_position(self, axis: str, value: float) -> None:
-        if axis in self._axis_positions:
-            self._axis_positions[axis] = value
+        self.set_axis_positions({axis: value})
+
+    def set_axis_positions(self, positions: Mapping[str, float]) -> None:
+        """Move several axes at once, repainting once if any of them moved."""
+
+        changed = False
+        for axis, value in positions.items():
+            if axis in self._axis_positions and self._axis_positions[axis] != value:
+                self._axis_positions[axis] = value
+                changed = True
+        if changed:
             self.update()
 
+    def set_toolpath(self, toolpath: ToolpathLod) -> None:
+        """Replace the displayed path; the buffer is uploaded on the next frame."""
+
+        self._toolpath = toolpath
+        self._toolpath_dirty = True
+        self._executed_segments = 0
+        self.update()
+
+    def set_executed_segments(self, segments: int) -> None:
+        if segments != self._executed_segments:
+            self._executed_segments = segments
+            if self._toolpath_visible:
+                self.update()
+
+    def set_toolpath_visible(self, visible: bool) -> None:
+        self._toolpath_visible = visible
+        self.update()
+
+    def set_stock(self, stock: Optional[StockModel]) -> None:
+        """Replace the displayed stock; its tiles are meshed over the next frames."""
+
+        self._delete_stock_chunks()
+        self._stock_mesher = StockMesher(stock) if stock is not None else None
+        self.update()
+
+    def set_stock_visible(self, visible: bool) -> None:
+        self._stock_visible = visible
+        self.update()
+
+    def pending_stock_tiles(self) -> int:
+        return self._stock_mesher.pending if self._stock_mesher is not None else 0
+
     def _camera_position(self) -> tuple[float, float, float]:
         yaw_rad = radians(self._yaw)
         pitch_rad = radians(self._pitch)
@@ -99,100 +254,147 @@ class GLWidget(QOpenGLWidget):
         z = self._distance * sin(pitch_rad)
         return x, y, z
 
+    def _upload(self, vertices: np.ndarray) -> int:
+        buffer = int(glGenBuffers(1))
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return buffer
+
+    def _release_buffers(self) -> None:
+        owned = (self._machine_buffer, self._grid_buffer, self._toolpath_buffer)
+        buffers = [buffer for buffer in owned if buffer]
+        buffers += [buffer for buffer, _ in self._stock_chunks.values()]
+        if not buffers:
+            return
+        self.makeCurrent()
+        glDeleteBuffers(len(buffers), buffers)
+        self.doneCurrent()
+        self._machine_buffer = 0
+        self._grid_buffer = 0
+        self._toolpath_buffer = 0
+        self._toolpath_dirty = True
+        if self._stock_mesher is not None:
+            self._stock_mesher.invalidate(list(self._stock_chunks))
+        self._stock_chunks.clear()
+
+    def _delete_stock_chunks(self) -> None:
+        buffers = [buffer for buffer, _ in self._stock_chunks.values()]
+        self._stock_chunks.clear()
+        if buffers and self.context() is not None:
+            self.makeCurrent()
+            glDeleteBuffers(len(buffers), buffers)
+            self.doneCurrent()
+
+    def _world_per_pixel(self) -> float:
+        height = max(self.height(), 1)
+        return 2.0 * self._distance * tan(radians(FIELD_OF_VIEW / 2.0)) / height
+
     def _draw_grid(self) -> None:
+        glDisable(GL_LIGHTING)
         glColor3f(0.2, 0.22, 0.26)
-        glBegin(GL_LINES)
-        for i in range(-500, 501, 50):
-            glVertex3f(i, -500, 0)
-            glVertex3f(i, 500, 0)
-            glVertex3f(-500, i, 0)
-            glVertex3f(500, i, 0)
-        glEnd()
-
-    def _draw_box(self, width: float, depth: float, height: float) -> None:
-        w = width / 2
-        d = depth / 2
-        h = height
-        glBegin(GL_QUADS)
-        glVertex3f(-w, -d, 0)
-        glVertex3f(w, -d, 0)
-        glVertex3f(w, d, 0)
-        glVertex3f(-w, d, 0)
-
-        glVertex3f(-w, -d, h)
-        glVertex3f(w, -d, h)
-        glVertex3f(w, d, h)
-        glVertex3f(-w, d, h)
-
-        glVertex3f(-w, -d, 0)
-        glVertex3f(w, -d, 0)
-        glVertex3f(w, -d, h)
-        glVertex3f(-w, -d, h)
-
-        glVertex3f(-w, d, 0)
-        glVertex3f(w, d, 0)
-        glVertex3f(w, d, h)
-        glVertex3f(-w, d, h)
-
-        glVertex3f(-w, -d, 0)
-        glVertex3f(-w, d, 0)
-        glVertex3f(-w, d, h)
-        glVertex3f(-w, -d, h)
-
-        glVertex3f(w, -d, 0)
-        glVertex3f(w, d, 0)
-        glVertex3f(w, d, h)
-        glVertex3f(w, -d, h)
-        glEnd()
+        glBindBuffer(GL_ARRAY_BUFFER, self._grid_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glDrawArrays(GL_LINES, 0, len(self._grid))
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glEnable(GL_LIGHTING)
+
+    @profiled(SPAN_MESH)
+    def _update_stock_chunks(self) -> None:
+        if self._stock_mesher is None:
+            return
+        for key, vertices in self._stock_mesher.update(STOCK_MESH_BUDGET_MS / 1000.0):
+            buffer, _ = self._stock_chunks.pop(key, (0, 0))
+            if not len(vertices):
+                if buffer:
+                    glDeleteBuffers(1, [buffer])
+                continue
+            if not buffer:
+                buffer = int(glGenBuffers(1))
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_DYNAMIC_DRAW)
+            self._stock_chunks[key] = (buffer, len(vertices))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        if self._stock_mesher.pending:
+            self.update()
+
+    def _draw_stock(self) -> None:
+        if not self._stock_visible or not self._stock_chunks:
+            return
+        glColor3f(*STOCK_COLOR)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        for buffer, count in self._stock_chunks.values():
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glVertexPointer(3, GL_FLOAT, STOCK_VERTEX_STRIDE, None)
+            glNormalPointer(GL_FLOAT, STOCK_VERTEX_STRIDE, ctypes.c_void_p(STOCK_NORMAL_OFFSET))
+            glDrawArrays(GL_TRIANGLES, 0, count)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _draw_toolpath(self) -> None:
+        if self._toolpath_dirty:
+            if not self._toolpath_buffer:
+                self._toolpath_buffer = int(glGenBuffers(1))
+            vertices = self._toolpath.vertices
+            glBindBuffer(GL_ARRAY_BUFFER, self._toolpath_buffer)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self._toolpath_dirty = False
+        lod = self._toolpath
+        if not self._toolpath_visible or not len(lod.vertices):
+            return
+        level = lod.level_for(self._world_per_pixel())
+        first = int(lod.level_first[level])
+        count = int(lod.level_count[level])
+        executed = min(lod.executed_vertices(level, self._executed_segments), count)
+
+        glDisable(GL_LIGHTING)
+        glShadeModel(GL_FLAT)
+        glBindBuffer(GL_ARRAY_BUFFER, self._toolpath_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, PATH_VERTEX_STRIDE, None)
+        if executed > 1:
+            glColor3f(*EXECUTED_PATH_COLOR)
+            glDrawArrays(GL_LINE_STRIP, first, executed)
+        remaining = max(executed - 1, 0)
+        if count - remaining > 1:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(
+                4, GL_UNSIGNED_BYTE, PATH_VERTEX_STRIDE, ctypes.c_void_p(PATH_COLOR_OFFSET)
+            )
+            glDrawArrays(GL_LINE_STRIP, first + remaining, count - remaining)
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glShadeModel(GL_SMOOTH)
+        glEnable(GL_LIGHTING)
 
     def _draw_machine(self) -> None:
-        x = self._axis_positions["X"]
-        y = self._axis_positions["Y"]
-        z = self._axis_positions["Z"]
-
-        glColor3f(0.3, 0.32, 0.36)
-        self._draw_box(800, 500, 60)
-
-        glPushMatrix()
-        glTranslatef(0, y, 0)
-
-        glPushMatrix()
-        glTranslatef(-300, 0, 60)
-        glPushMatrix()
-        glTranslatef(0, y, 0)
-
-        glPushMatrix()
-        glTranslatef(-300, 0, 60)
-        glColor3f(0.35, 0.36, 0.4)
-        self._draw_box(120, 120, 300)
-        glPopMatrix()
-
-        glPushMatrix()
-        glTranslatef(300, 0, 60)
-        glColor3f(0.35, 0.36, 0.4)
-        self._draw_box(120, 120, 300)
-        glPopMatrix()
-
-        glPushMatrix()
-        glTranslatef(0, 0, 340)
-        glColor3f(0.4, 0.42, 0.46)
-        self._draw_box(720, 140, 80)
-        glPopMatrix()
-
-        glPushMatrix()
-        glTranslatef(x, 0, 380)
-        glColor3f(0.25, 0.5, 0.7)
-        self._draw_box(200, 160, 80)
-
-        glTranslatef(0, 0, 80)
-        glColor3f(0.25, 0.6, 0.6)
-        self._draw_box(180, 140, 60)
-
-        glTranslatef(0, 0, -z)
-        glColor3f(0.8, 0.4, 0.3)
-        self._draw_box(60, 60, 180)
-        glPopMatrix()
-        glPopMatrix()
+        offsets = group_offsets(
+            self._axis_positions["X"], self._axis_positions["Y"], self._axis_positions["Z"]
+        )
+        glBindBuffer(GL_ARRAY_BUFFER, self._machine_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, VERTEX_STRIDE, None)
+        glNormalPointer(GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(NORMAL_OFFSET))
+        glColorPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(COLOR_OFFSET))
+        for group, (first, count) in self._machine_mesh.ranges.items():
+            if not count:
+                continue
+            glPushMatrix()
+            glTranslatef(*offsets[group])
+            glDrawArrays(GL_TRIANGLES, first, count)
+            glPopMatrix()
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     def mousePressEvent(self, event) -> None:
         self._last_pos = event.pos()